@@ -1,4 +1,4 @@
-!/usr/bin/env python3
+#!/usr/bin/env python3
 """
 Animal Photo Sorter Script
 ==========================
@@ -13,6 +13,10 @@ Features:
 - Handles errors gracefully
 - Provides detailed sorting report
 - Configurable move/copy operation
+- Checkpointed progress journal so interrupted runs can be resumed
+- File copies/moves run on a bounded I/O thread pool alongside classification
+- Two-phase plan/apply mode: classify once, place files later without the model
+- CLIP reads thumbnails from the shared content-addressed store (thumbnail_cache.py)
 - No paid APIs required
 
 Author: AI Assistant
@@ -26,19 +30,32 @@ import json
 from pathlib import Path
 from typing import List, Dict, Tuple, Optional
 import logging
+import queue
+import threading
+import zlib
 from datetime import datetime
 
+from thumbnail_cache import ThumbnailStore, file_digest
+
 # Third-party imports (install via pip)
+# Failures are reported when a classifier is created, so 'apply' works without them
 try:
-    from PIL import Image
+    from PIL import Image, ImageOps
     import torch
     from transformers import CLIPProcessor, CLIPModel
     import numpy as np
+    ML_IMPORT_ERROR = None
 except ImportError as e:
-    print(f"Missing required packages. Please install them using:")
-    print("pip install torch torchvision transformers pillow numpy")
-    print(f"Error: {e}")
-    exit(1)
+    ML_IMPORT_ERROR = e
+
+
+def require_ml_packages():
+    """Exit with installation instructions if the classification packages are missing."""
+    if ML_IMPORT_ERROR is not None:
+        print(f"Missing required packages. Please install them using:")
+        print("pip install torch torchvision transformers pillow numpy")
+        print(f"Error: {ML_IMPORT_ERROR}")
+        exit(1)
 
 # =============================================================================
 # CONFIGURATION SECTION - MODIFY THESE SETTINGS AS NEEDED
@@ -56,6 +73,33 @@ MOVE_FILES = False  # Set to True if you want to move instead of copy
 # Confidence threshold for classification (0.0 to 1.0)
 CONFIDENCE_THRESHOLD = 0.15
 
+# CLIP checkpoint used for classification
+CLIP_MODEL_NAME = "openai/clip-vit-base-patch32"
+
+# Cached single-view image embeddings, keyed by file content hash
+EMBEDDING_CACHE_FILE = "sorted_animals/.clip_embeddings.npz"
+
+# Images per CLIP forward pass when classifying in batches
+CLASSIFY_BATCH_SIZE = 16
+
+# Side length of the crops used for test-time augmentation, as a fraction of the image
+TTA_CROP_FRACTION = 0.8
+
+# Progress journal used to resume interrupted runs (see --resume)
+CHECKPOINT_FILE = "sorted_animals/.sort_journal.jsonl"
+
+# Number of journal records between forced syncs to disk
+CHECKPOINT_INTERVAL = 25
+
+# I/O threads that copy/move files while classification continues
+PLACEMENT_WORKERS = 4
+
+# Maximum queued file operations before classification waits (backpressure)
+PLACEMENT_QUEUE_SIZE = 64
+
+# Default placement plan written by 'plan' and executed by 'apply'
+PLAN_FILE = "sorted_animals_plan.jsonl"
+
 # Animal categories and their corresponding folder names
 ANIMAL_CATEGORIES = {
     # Fish species - specific identification
@@ -223,15 +267,79 @@ def setup_logging() -> logging.Logger:
 # IMAGE CLASSIFICATION CLASS
 # =============================================================================
 
+class EmbeddingCache:
+    """
+    On-disk cache of normalized CLIP image embeddings keyed by file content hash.
+    
+    Keys survive renames and moves between sorted folders, so re-classifying
+    (e.g. with new labels) only needs the cheap text/label step for known images.
+    """
+    
+    def __init__(self, cache_path: str, model_name: str, logger: logging.Logger):
+        """Load the cache, discarding it if it was built with another model."""
+        self.cache_path = Path(cache_path)
+        self.model_name = model_name
+        self.logger = logger
+        self.entries: Dict[str, "np.ndarray"] = {}
+        self._dirty = False
+        
+        if self.cache_path.exists():
+            try:
+                with np.load(self.cache_path, allow_pickle=False) as data:
+                    if str(data["model"]) == model_name:
+                        self.entries = dict(zip(data["keys"].tolist(), data["embeddings"]))
+                self.logger.info(f"Loaded {len(self.entries)} cached embeddings from {self.cache_path}")
+            except Exception as e:
+                self.logger.warning(f"Ignoring unreadable embedding cache {self.cache_path}: {e}")
+    
+    @staticmethod
+    def key_for(image_path: str) -> str:
+        """Content hash of an image file."""
+        return file_digest(image_path)
+    
+    def get(self, key: str) -> Optional["np.ndarray"]:
+        return self.entries.get(key)
+    
+    def put(self, key: str, embedding: "np.ndarray"):
+        self.entries[key] = embedding.astype(np.float32)
+        self._dirty = True
+    
+    def save(self):
+        """Write the cache atomically if anything was added."""
+        if not self._dirty or not self.entries:
+            return
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_path.with_name(self.cache_path.name + ".tmp")
+        keys = list(self.entries)
+        with open(tmp_path, "wb") as f:
+            np.savez(f, model=np.array(self.model_name), keys=np.array(keys),
+                     embeddings=np.stack([self.entries[k] for k in keys]))
+        os.replace(tmp_path, self.cache_path)
+        self._dirty = False
+
+
 class AnimalClassifier:
     """Handles image classification using CLIP model."""
     
-    def __init__(self, logger: logging.Logger):
-        """Initialize the classifier with CLIP model."""
+    def __init__(self, logger: logging.Logger, embedding_cache: Optional[EmbeddingCache] = None,
+                 thumbnails: Optional[ThumbnailStore] = None):
+        """
+        Initialize the classifier with CLIP model.
+        
+        Args:
+            logger: Logger instance
+            embedding_cache: Optional cache of image embeddings shared across runs
+            thumbnails: Optional shared thumbnail store; CLIP then sees cached
+                thumbnails instead of decoding every full-size original
+        """
+        require_ml_packages()
         self.logger = logger
         self.model = None
         self.processor = None
+        self.embedding_cache = embedding_cache
+        self.thumbnails = thumbnails
         self.device = "cuda" if torch.cuda.is_available() else "cpu"
+        self._text_features = None
         
         self.logger.info(f"Using device: {self.device}")
         self._load_model()
@@ -240,10 +348,9 @@ class AnimalClassifier:
         """Load the CLIP model and processor."""
         try:
             self.logger.info("Loading CLIP model...")
-            model_name = "openai/clip-vit-base-patch32"
             
-            self.model = CLIPModel.from_pretrained(model_name)
-            self.processor = CLIPProcessor.from_pretrained(model_name)
+            self.model = CLIPModel.from_pretrained(CLIP_MODEL_NAME)
+            self.processor = CLIPProcessor.from_pretrained(CLIP_MODEL_NAME)
             
             self.model.to(self.device)
             self.model.eval()
@@ -254,6 +361,49 @@ class AnimalClassifier:
             self.logger.error(f"Failed to load CLIP model: {e}")
             raise
     
+    @staticmethod
+    def _projected(output) -> "torch.Tensor":
+        """Projected embeddings from get_*_features (a tensor, or a pooled output on newer transformers)."""
+        return output if torch.is_tensor(output) else output.pooler_output
+    
+    def _label_features(self) -> "torch.Tensor":
+        """Normalized text embeddings of CLASSIFICATION_LABELS, computed once."""
+        if self._text_features is None:
+            inputs = self.processor(text=CLASSIFICATION_LABELS, return_tensors="pt", padding=True)
+            inputs = {k: v.to(self.device) for k, v in inputs.items()}
+            with torch.no_grad():
+                features = self._projected(self.model.get_text_features(**inputs))
+            self._text_features = features / features.norm(dim=-1, keepdim=True)
+        return self._text_features
+    
+    def _embed_images(self, images: List["Image.Image"]) -> "torch.Tensor":
+        """Run a list of images through CLIP as one batch; returns normalized embeddings."""
+        pixel_values = self.processor(images=images, return_tensors="pt")["pixel_values"].to(self.device)
+        with torch.no_grad():
+            features = self._projected(self.model.get_image_features(pixel_values=pixel_values))
+        return features / features.norm(dim=-1, keepdim=True)
+    
+    def _label_probs(self, image_features: "torch.Tensor") -> "torch.Tensor":
+        """Softmax over labels, equivalent to CLIPModel's logits_per_image."""
+        with torch.no_grad():
+            logits = self.model.logit_scale.exp() * image_features @ self._label_features().T
+            return logits.softmax(dim=-1)
+    
+    def _prediction(self, image_path: str, probs: "torch.Tensor") -> Tuple[str, float]:
+        """Turn one row of label probabilities into (animal_type, confidence)."""
+        confidence, predicted_idx = torch.max(probs, 0)
+        predicted_label = CLASSIFICATION_LABELS[predicted_idx.item()]
+        confidence_score = confidence.item()
+        
+        # Extract animal type from label
+        animal_type = self._extract_animal_type(predicted_label)
+        
+        self.logger.debug(f"Image: {image_path}")
+        self.logger.debug(f"Predicted: {predicted_label} (confidence: {confidence_score:.3f})")
+        self.logger.debug(f"Animal type: {animal_type}")
+        
+        return animal_type, confidence_score
+    
     def classify_image(self, image_path: str) -> Tuple[str, float]:
         """
         Classify an image and return the predicted animal type and confidence.
@@ -264,44 +414,131 @@ class AnimalClassifier:
         Returns:
             Tuple of (predicted_label, confidence_score)
         """
-        try:
-            # Load and preprocess image
-            image = Image.open(image_path).convert("RGB")
-            
-            # Prepare inputs
-            inputs = self.processor(
-                text=CLASSIFICATION_LABELS,
-                images=image,
-                return_tensors="pt",
-                padding=True
-            )
-            
-            # Move inputs to device
-            inputs = {k: v.to(self.device) for k, v in inputs.items()}
-            
-            # Get predictions
-            with torch.no_grad():
-                outputs = self.model(**inputs)
-                logits_per_image = outputs.logits_per_image
-                probs = logits_per_image.softmax(dim=1)
-            
-            # Get the best prediction
-            confidence, predicted_idx = torch.max(probs, 1)
-            predicted_label = CLASSIFICATION_LABELS[predicted_idx.item()]
-            confidence_score = confidence.item()
-            
-            # Extract animal type from label
-            animal_type = self._extract_animal_type(predicted_label)
-            
-            self.logger.debug(f"Image: {image_path}")
-            self.logger.debug(f"Predicted: {predicted_label} (confidence: {confidence_score:.3f})")
-            self.logger.debug(f"Animal type: {animal_type}")
+        return self.classify_batch([image_path])[0]
+    
+    def classify_batch(self, image_paths: List[str]) -> List[Tuple[str, float]]:
+        """
+        Classify several images, reusing cached embeddings and batching the rest.
+        
+        Args:
+            image_paths: Paths to the image files
             
-            return animal_type, confidence_score
+        Returns:
+            List of (predicted_label, confidence_score), in input order
+        """
+        results: List[Tuple[str, float]] = [("unknown", 0.0)] * len(image_paths)
+        features = self.embed_batch(image_paths)
+        
+        if features:
+            order = sorted(features)
+            probs = self._label_probs(torch.stack([features[i] for i in order]))
+            for row, i in enumerate(order):
+                results[i] = self._prediction(image_paths[i], probs[row])
+        
+        return results
+    
+    def embed_batch(self, image_paths: List[str]) -> Dict[int, "torch.Tensor"]:
+        """
+        Compute normalized image embeddings, reusing cached ones and batching the rest.
+        
+        Args:
+            image_paths: Paths to the image files
             
+        Returns:
+            Mapping of input index to embedding; unreadable images are left out
+        """
+        features: Dict[int, "torch.Tensor"] = {}
+        missing: List[Tuple[int, Optional[str]]] = []
+        
+        for i, image_path in enumerate(image_paths):
+            key = None
+            try:
+                if self.embedding_cache is not None:
+                    key = EmbeddingCache.key_for(image_path)
+                    cached = self.embedding_cache.get(key)
+                    if cached is not None:
+                        features[i] = torch.from_numpy(cached).to(self.device)
+                        continue
+            except Exception as e:
+                self.logger.error(f"Error reading image {image_path}: {e}")
+                continue
+            missing.append((i, key))
+        
+        for start in range(0, len(missing), CLASSIFY_BATCH_SIZE):
+            chunk = missing[start:start + CLASSIFY_BATCH_SIZE]
+            images, loaded = [], []
+            # Embedding cache keys are content hashes, which the thumbnail store reuses
+            digests = [key for _, key in chunk] if all(key for _, key in chunk) else None
+            for (i, key), image in zip(chunk, self._open_images([image_paths[i] for i, _ in chunk], digests)):
+                if image is not None:
+                    images.append(image)
+                    loaded.append((i, key))
+            if not images:
+                continue
+            try:
+                embedded = self._embed_images(images)
+            except Exception as e:
+                self.logger.error(f"Error classifying batch starting at {image_paths[loaded[0][0]]}: {e}")
+                continue
+            for row, (i, key) in enumerate(loaded):
+                features[i] = embedded[row]
+                if key is not None:
+                    self.embedding_cache.put(key, embedded[row].cpu().numpy())
+        
+        return features
+    
+    def _open_images(self, image_paths: List[str], digests: Optional[List[str]] = None) -> List[Optional["Image.Image"]]:
+        """RGB images for CLIP (thumbnails when a store is set); None for unreadable files."""
+        if self.thumbnails is not None:
+            thumbs = self.thumbnails.paths(image_paths, digests)
+        else:
+            thumbs = [None] * len(image_paths)
+        images: List[Optional["Image.Image"]] = []
+        for image_path, thumb in zip(image_paths, thumbs):
+            try:
+                images.append(Image.open(thumb or image_path).convert("RGB"))
+            except Exception as e:
+                self.logger.error(f"Error classifying image {image_path}: {e}")
+                images.append(None)
+        return images
+    
+    def _tta_views(self, image: "Image.Image") -> List["Image.Image"]:
+        """Original, mirror, center crop (and its mirror) and two corner crops."""
+        width, height = image.size
+        crop_w, crop_h = int(width * TTA_CROP_FRACTION), int(height * TTA_CROP_FRACTION)
+        left, top = (width - crop_w) // 2, (height - crop_h) // 2
+        center = image.crop((left, top, left + crop_w, top + crop_h))
+        return [
+            image,
+            ImageOps.mirror(image),
+            center,
+            ImageOps.mirror(center),
+            image.crop((0, 0, crop_w, crop_h)),
+            image.crop((width - crop_w, height - crop_h, width, height)),
+        ]
+    
+    def classify_with_tta(self, image_path: str) -> Tuple[str, float, int]:
+        """
+        Classify an image with test-time augmentation.
+        
+        All flipped/cropped views go through CLIP as a single batch and their
+        label probabilities are averaged. Meant for images whose single-view
+        confidence fell below the threshold.
+        
+        Returns:
+            Tuple of (predicted_label, confidence_score, views_evaluated)
+        """
+        try:
+            image = self._open_images([image_path])[0]
+            if image is None:
+                return "unknown", 0.0, 0
+            views = self._tta_views(image)
+            probs = self._label_probs(self._embed_images(views)).mean(dim=0)
+            animal_type, confidence = self._prediction(image_path, probs)
+            return animal_type, confidence, len(views)
         except Exception as e:
-            self.logger.error(f"Error classifying image {image_path}: {e}")
-            return "unknown", 0.0
+            self.logger.error(f"Error classifying image {image_path} with augmentation: {e}")
+            return "unknown", 0.0, 0
     
     def _extract_animal_type(self, label: str) -> str:
         """Extract animal type from the classification label."""
@@ -344,6 +581,12 @@ class FileManager:
             "errors": 0,
             "folder_counts": {}
         }
+        # Placement workers update stats concurrently with the main thread
+        self._stats_lock = threading.Lock()
+        
+        # Destination names handed out but possibly not yet written by a worker
+        self._reserved = set()
+        self._reserve_lock = threading.Lock()
     
     def get_image_files(self) -> List[Path]:
         """Get all image files from the source folder and all subdirectories."""
@@ -371,16 +614,20 @@ class FileManager:
             self.logger.error(f"Error reading source folder {self.source_folder}: {e}")
             return []
     
-    def create_destination_folder(self, animal_type: str) -> Path:
-        """Create destination folder for the animal type."""
-        # Map animal type to folder name
+    @staticmethod
+    def folder_name_for(animal_type: str) -> str:
+        """Map an animal type to its destination folder name."""
         folder_name = ANIMAL_CATEGORIES.get(animal_type, "Unknown")
         
         # Special handling for unknown or low-confidence classifications
         if animal_type == "unknown" or folder_name == "Unknown":
             folder_name = "Unknown"
         
-        folder_path = self.destination_folder / folder_name
+        return folder_name
+    
+    def create_destination_folder(self, animal_type: str) -> Path:
+        """Create destination folder for the animal type."""
+        folder_path = self.destination_folder / self.folder_name_for(animal_type)
         
         try:
             folder_path.mkdir(parents=True, exist_ok=True)
@@ -393,21 +640,43 @@ class FileManager:
             unknown_folder.mkdir(parents=True, exist_ok=True)
             return unknown_folder
     
-    def move_or_copy_file(self, source_file: Path, destination_folder: Path) -> bool:
-        """Move or copy file to destination folder."""
-        try:
-            destination_file = destination_folder / source_file.name
-            
-            # Handle duplicate filenames
-            counter = 1
-            original_stem = destination_file.stem
-            original_suffix = destination_file.suffix
-            
-            while destination_file.exists():
+    def resolve_destination_file(self, source_file: Path, destination_folder: Path,
+                                 file_name: Optional[str] = None) -> Path:
+        """
+        Pick and reserve a free destination path, appending _1, _2, ... on name collisions.
+        
+        Reserved names count as taken even before their file exists, so names stay
+        deterministic (submission order) when placement happens asynchronously.
+        
+        Args:
+            source_file: File being placed
+            destination_folder: Folder to place it in
+            file_name: Preferred name, defaults to the source file name
+        """
+        destination_file = destination_folder / (file_name or source_file.name)
+        
+        # Handle duplicate filenames
+        counter = 1
+        original_stem = destination_file.stem
+        original_suffix = destination_file.suffix
+        
+        with self._reserve_lock:
+            while destination_file in self._reserved or destination_file.exists():
                 new_name = f"{original_stem}_{counter}{original_suffix}"
                 destination_file = destination_folder / new_name
                 counter += 1
-            
+            self._reserved.add(destination_file)
+        
+        return destination_file
+    
+    def reserve(self, destination_file: Path):
+        """Mark a destination handed out by an earlier (interrupted) run as taken."""
+        with self._reserve_lock:
+            self._reserved.add(destination_file)
+    
+    def place_file(self, source_file: Path, destination_file: Path) -> bool:
+        """Move or copy file to an already resolved destination path."""
+        try:
             if self.move_files:
                 shutil.move(str(source_file), str(destination_file))
                 operation = "moved"
@@ -415,25 +684,60 @@ class FileManager:
                 shutil.copy2(str(source_file), str(destination_file))
                 operation = "copied"
             
-            self.logger.info(f"Successfully {operation}: {source_file.name} → {destination_folder.name}/")
+            self.logger.info(f"Successfully {operation}: {source_file.name} → {destination_file.parent.name}/")
             return True
             
+        except Exception as e:
+            self.logger.error(f"Error moving/copying {source_file} to {destination_file.parent}: {e}")
+            return False
+    
+    def is_placed(self, source_file: Path, destination_file: Path) -> bool:
+        """
+        Check whether a previous run already completed placing source at destination.
+        
+        Only meaningful for a destination that run reserved for this source: a
+        copy must match in size and mtime (copy2 preserves it), a move must
+        have removed the source.
+        """
+        if not destination_file.exists():
+            return False
+        if self.move_files:
+            return not source_file.exists()
+        try:
+            src = source_file.stat()
+            dst = destination_file.stat()
+        except OSError:
+            return False
+        # Allow for filesystems that store mtimes with coarser resolution
+        return dst.st_size == src.st_size and abs(dst.st_mtime_ns - src.st_mtime_ns) < 1_000_000_000
+    
+    def move_or_copy_file(self, source_file: Path, destination_folder: Path) -> bool:
+        """Move or copy file to destination folder."""
+        try:
+            destination_file = self.resolve_destination_file(source_file, destination_folder)
         except Exception as e:
             self.logger.error(f"Error moving/copying {source_file} to {destination_folder}: {e}")
             return False
+        return self.place_file(source_file, destination_file)
     
     def update_stats(self, folder_name: str, success: bool):
         """Update sorting statistics."""
-        self.stats["total_processed"] += 1
-        
-        if success:
-            self.stats["successful_sorts"] += 1
-            if folder_name in self.stats["folder_counts"]:
-                self.stats["folder_counts"][folder_name] += 1
+        with self._stats_lock:
+            self.stats["total_processed"] += 1
+            
+            if success:
+                self.stats["successful_sorts"] += 1
+                if folder_name in self.stats["folder_counts"]:
+                    self.stats["folder_counts"][folder_name] += 1
+                else:
+                    self.stats["folder_counts"][folder_name] = 1
             else:
-                self.stats["folder_counts"][folder_name] = 1
-        else:
-            self.stats["errors"] += 1
+                self.stats["errors"] += 1
+    
+    def increment_stat(self, key: str):
+        """Increment a single counter in the statistics."""
+        with self._stats_lock:
+            self.stats[key] += 1
     
     def print_summary_report(self):
         """Print a detailed summary report."""
@@ -465,14 +769,250 @@ class FileManager:
         self.logger.info(f"Successfully sorted: {self.stats['successful_sorts']}")
         self.logger.info(f"Folder distribution: {self.stats['folder_counts']}")
 
+# =============================================================================
+# ASYNCHRONOUS PLACEMENT STAGE
+# =============================================================================
+
+class PlacementStage:
+    """
+    Bounded pool of I/O threads that copies/moves files while classification continues.
+    
+    Each destination folder is always served by the same worker, so operations
+    into one folder run in submission order. Worker queues are bounded; submit()
+    blocks once they are full, which keeps classification from racing ahead of the disk.
+    """
+    
+    def __init__(self, file_manager: FileManager, on_placed, workers: int = PLACEMENT_WORKERS,
+                 queue_size: int = PLACEMENT_QUEUE_SIZE):
+        """
+        Start the worker threads.
+        
+        Args:
+            file_manager: FileManager performing the actual file operations
+            on_placed: Callback (source_file, destination_file, success) run on the worker thread
+            workers: Number of I/O threads
+            queue_size: Total number of queued operations across all workers
+        """
+        self.file_manager = file_manager
+        self.on_placed = on_placed
+        self.logger = file_manager.logger
+        workers = max(1, workers)
+        per_worker = max(1, queue_size // workers)
+        self._queues = [queue.Queue(maxsize=per_worker) for _ in range(workers)]
+        self._threads = [
+            threading.Thread(target=self._worker, args=(q,), name=f"placement-{i}", daemon=True)
+            for i, q in enumerate(self._queues)
+        ]
+        for thread in self._threads:
+            thread.start()
+    
+    def submit(self, source_file: Path, destination_file: Path):
+        """Queue a file operation, blocking while the target worker's queue is full."""
+        # crc32 rather than hash() so folder-to-worker assignment is stable across runs
+        shard = zlib.crc32(str(destination_file.parent).encode("utf-8")) % len(self._queues)
+        self._queues[shard].put((source_file, destination_file))
+    
+    def _worker(self, work: "queue.Queue"):
+        while True:
+            item = work.get()
+            try:
+                if item is None:
+                    return
+                source_file, destination_file = item
+                success = self.file_manager.place_file(source_file, destination_file)
+                self.on_placed(source_file, destination_file, success)
+            except Exception as e:
+                self.logger.error(f"Placement worker error: {e}")
+            finally:
+                work.task_done()
+    
+    def close(self, cancel: bool = False):
+        """
+        Stop the workers once their queues are drained.
+        
+        Args:
+            cancel: Drop operations that have not started yet instead of running them
+        """
+        for work in self._queues:
+            if cancel:
+                try:
+                    while True:
+                        work.get_nowait()
+                        work.task_done()
+                except queue.Empty:
+                    pass
+            work.put(None)
+        for thread in self._threads:
+            thread.join()
+
+# =============================================================================
+# CHECKPOINT JOURNAL CLASS
+# =============================================================================
+
+class SortJournal:
+    """
+    Append-only JSON Lines journal of sorting progress.
+    
+    Every image produces a "classified" record (with its resolved destination)
+    before the file operation and a "placed" record after it, so a resumed run
+    never reclassifies an image and never copies it a second time. Records are
+    flushed immediately and synced to disk every CHECKPOINT_INTERVAL records.
+    """
+    
+    def __init__(self, journal_path: str, logger: logging.Logger):
+        """Initialize the journal."""
+        self.journal_path = Path(journal_path)
+        self.logger = logger
+        self.completed = set()      # source paths that need no further work
+        self.in_flight = {}         # source path -> classified record awaiting placement
+        self._handle = None
+        self._unsynced = 0
+        # Placement workers record completions from their own threads
+        self._lock = threading.Lock()
+    
+    def _run_config(self) -> Dict:
+        return {
+            "source": SOURCE_FOLDER,
+            "destination": DESTINATION_FOLDER,
+            "move": MOVE_FILES,
+            "threshold": CONFIDENCE_THRESHOLD,
+        }
+    
+    def exists(self) -> bool:
+        return self.journal_path.exists()
+    
+    def start(self):
+        """Begin a fresh journal, discarding any previous one."""
+        self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+        self._handle = open(self.journal_path, "w", encoding="utf-8")
+        self._append({"op": "start", "config": self._run_config()}, sync=True)
+    
+    def resume(self, file_manager: "FileManager") -> bool:
+        """
+        Replay the journal into file_manager.stats and reopen it for appending.
+        
+        Every journaled destination, placed or still in flight, is reserved in
+        file_manager so newly classified images cannot be given the same name.
+        
+        Returns:
+            False if the journal is missing or was written with a different configuration
+        """
+        if not self.exists():
+            self.logger.error(f"No checkpoint journal found at {self.journal_path}")
+            return False
+        
+        with open(self.journal_path, "r", encoding="utf-8") as f:
+            for line_no, line in enumerate(f, 1):
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn final line from a hard crash is expected; anything else is noise
+                    self.logger.warning(f"Skipping unreadable journal line {line_no}")
+                    continue
+                op = record.get("op")
+                if op == "start":
+                    if record.get("config") != self._run_config():
+                        self.logger.error("Checkpoint journal was written with a different configuration")
+                        return False
+                elif op == "classified":
+                    self.in_flight[record["source"]] = record
+                    file_manager.reserve(Path(record["destination"]))
+                    if record.get("low_confidence"):
+                        file_manager.increment_stat("failed_classifications")
+                elif op == "placed":
+                    self.in_flight.pop(record["source"], None)
+                    self.completed.add(record["source"])
+                    file_manager.update_stats(record["folder"], record["success"])
+                elif op == "error":
+                    self.in_flight.pop(record["source"], None)
+                    self.completed.add(record["source"])
+                    file_manager.increment_stat("errors")
+        
+        self.logger.info(
+            f"Resuming from {self.journal_path}: {len(self.completed)} done, "
+            f"{len(self.in_flight)} in flight"
+        )
+        self._handle = open(self.journal_path, "a", encoding="utf-8")
+        return True
+    
+    def _append(self, record: Dict, sync: bool = False):
+        with self._lock:
+            self._write(record, sync)
+    
+    def _write(self, record: Dict, sync: bool):
+        self._handle.write(json.dumps(record) + "\n")
+        self._handle.flush()
+        self._unsynced += 1
+        if sync or self._unsynced >= CHECKPOINT_INTERVAL:
+            os.fsync(self._handle.fileno())
+            self._unsynced = 0
+    
+    def record_classified(self, source_file: Path, animal_type: str, confidence: float,
+                          low_confidence: bool, destination_file: Path):
+        record = {
+            "op": "classified",
+            "source": str(source_file),
+            "animal_type": animal_type,
+            "confidence": confidence,
+            "low_confidence": low_confidence,
+            "destination": str(destination_file),
+        }
+        with self._lock:
+            self.in_flight[record["source"]] = record
+            self._write(record, False)
+    
+    def record_placed(self, source_file: Path, folder_name: str, success: bool):
+        with self._lock:
+            self.in_flight.pop(str(source_file), None)
+            self.completed.add(str(source_file))
+            self._write({"op": "placed", "source": str(source_file), "folder": folder_name, "success": success}, False)
+    
+    def record_error(self, source_file: Path, error: str):
+        with self._lock:
+            self.in_flight.pop(str(source_file), None)
+            self.completed.add(str(source_file))
+            self._write({"op": "error", "source": str(source_file), "error": error}, False)
+    
+    def close(self):
+        """Sync and close the journal so it can be resumed later."""
+        with self._lock:
+            self._close()
+    
+    def _close(self):
+        if self._handle:
+            self._handle.flush()
+            os.fsync(self._handle.fileno())
+            self._handle.close()
+            self._handle = None
+    
+    def finish(self):
+        """Close and remove the journal after a completed run."""
+        with self._lock:
+            self._close()
+        try:
+            self.journal_path.unlink()
+        except FileNotFoundError:
+            pass
+
 # =============================================================================
 # MAIN SORTING FUNCTION
 # =============================================================================
 
-def sort_animal_photos():
-    """Main function to sort animal photos."""
+def sort_animal_photos(resume: bool = False):
+    """
+    Main function to sort animal photos.
+    
+    Args:
+        resume: Continue an interrupted run from CHECKPOINT_FILE instead of starting over
+    """
+    require_ml_packages()
+    
     # Setup logging
     logger = setup_logging()
+    journal = None
+    placement = None
+    embedding_cache = None
+    thumbnails = None
     
     try:
         print("Animal Photo Sorter - Starting...")
@@ -490,13 +1030,22 @@ def sort_animal_photos():
             print("Please create the folder and add your images, or update the SOURCE_FOLDER variable.")
             return
         
-        # Initialize components
-        logger.info("Initializing classifier...")
-        classifier = AnimalClassifier(logger)
-        
         logger.info("Initializing file manager...")
         file_manager = FileManager(SOURCE_FOLDER, DESTINATION_FOLDER, MOVE_FILES, logger)
         
+        # Open the progress journal before loading the model so a bad resume fails fast
+        journal = SortJournal(CHECKPOINT_FILE, logger)
+        if resume:
+            if not journal.resume(file_manager):
+                print(f"ERROR: Cannot resume from '{CHECKPOINT_FILE}'. Run without --resume to start over.")
+                journal = None
+                return
+        else:
+            if journal.exists():
+                logger.warning(f"Discarding previous checkpoint journal {CHECKPOINT_FILE}")
+                print(f"Note: an unfinished run was found; use --resume to continue it instead of starting over.")
+            journal.start()
+        
         # Get image files
         image_files = file_manager.get_image_files()
         if not image_files:
@@ -504,52 +1053,383 @@ def sort_animal_photos():
             print("No image files found to process.")
             return
         
-        print(f"Found {len(image_files)} images to process...")
+        # In-flight images from a resumed run may already have been moved away
+        for source in journal.in_flight:
+            if Path(source) not in image_files:
+                image_files.append(Path(source))
+        
+        pending_files = [f for f in image_files if str(f) not in journal.completed]
+        classifier = None
+        if any(str(f) not in journal.in_flight for f in pending_files):
+            logger.info("Initializing classifier...")
+            embedding_cache = EmbeddingCache(EMBEDDING_CACHE_FILE, CLIP_MODEL_NAME, logger)
+            thumbnails = ThumbnailStore()
+            classifier = AnimalClassifier(logger, embedding_cache, thumbnails)
+        
+        print(f"Found {len(image_files)} images, {len(pending_files)} left to process...")
         print()
         
+        def on_placed(source_file: Path, destination_file: Path, success: bool):
+            # Runs on a placement worker thread
+            folder_name = destination_file.parent.name
+            file_manager.update_stats(folder_name, success)
+            journal.record_placed(source_file, folder_name, success)
+            if not success:
+                print(f"  → ERROR: Failed to sort {source_file.name}")
+        
+        # File operations run in the background while the next image is classified
+        placement = PlacementStage(file_manager, on_placed)
+        
         # Process each image
-        for i, image_file in enumerate(image_files, 1):
-            print(f"Processing {i}/{len(image_files)}: {image_file.name}")
+        for i, image_file in enumerate(pending_files, 1):
+            print(f"Processing {i}/{len(pending_files)}: {image_file.name}")
             
             try:
-                # Classify the image
-                animal_type, confidence = classifier.classify_image(str(image_file))
-                
-                # Determine destination folder
-                if confidence < CONFIDENCE_THRESHOLD:
-                    animal_type = "unknown"
-                    file_manager.stats["failed_classifications"] += 1
-                    logger.info(f"Low confidence ({confidence:.3f}) for {image_file.name}, moving to Unknown")
-                
-                # Create destination folder and move/copy file
-                destination_folder = file_manager.create_destination_folder(animal_type)
-                folder_name = destination_folder.name
+                in_flight = journal.in_flight.get(str(image_file))
+                if in_flight:
+                    # Classified before the interruption: reuse the result and destination
+                    confidence = in_flight["confidence"]
+                    destination_file = Path(in_flight["destination"])
+                    destination_file.parent.mkdir(parents=True, exist_ok=True)
+                else:
+                    # Classify the image
+                    animal_type, confidence = classifier.classify_image(str(image_file))
+                    
+                    # Determine destination folder
+                    low_confidence = confidence < CONFIDENCE_THRESHOLD
+                    if low_confidence:
+                        animal_type = "unknown"
+                        file_manager.increment_stat("failed_classifications")
+                        logger.info(f"Low confidence ({confidence:.3f}) for {image_file.name}, moving to Unknown")
+                    
+                    # Create destination folder and reserve a file name before touching the disk
+                    destination_folder = file_manager.create_destination_folder(animal_type)
+                    destination_file = file_manager.resolve_destination_file(image_file, destination_folder)
+                    journal.record_classified(image_file, animal_type, confidence, low_confidence, destination_file)
                 
-                success = file_manager.move_or_copy_file(image_file, destination_folder)
-                file_manager.update_stats(folder_name, success)
+                folder_name = destination_file.parent.name
                 
-                if success:
-                    print(f"  → Sorted to: {folder_name}/ (confidence: {confidence:.3f})")
+                if in_flight and file_manager.is_placed(image_file, destination_file):
+                    logger.info(f"Already placed before interruption: {image_file.name} → {folder_name}/")
+                    on_placed(image_file, destination_file, True)
                 else:
-                    print(f"  → ERROR: Failed to sort {image_file.name}")
+                    placement.submit(image_file, destination_file)
+                
+                print(f"  → Sorting to: {folder_name}/ (confidence: {confidence:.3f})")
                 
             except Exception as e:
                 logger.error(f"Error processing {image_file}: {e}")
                 print(f"  → ERROR: {e}")
-                file_manager.stats["errors"] += 1
+                file_manager.increment_stat("errors")
+                journal.record_error(image_file, str(e))
             
             print()
         
+        # Wait for queued file operations before reporting
+        placement.close()
+        placement = None
+        
+        journal.finish()
+        journal = None
+        
         # Print summary report
         file_manager.print_summary_report()
         
     except KeyboardInterrupt:
         logger.info("Sorting interrupted by user")
         print("\nSorting interrupted by user.")
+        if journal:
+            print("Progress saved. Run 'python animal_photo_sorter.py --resume' to continue.")
         
     except Exception as e:
         logger.error(f"Unexpected error: {e}")
         print(f"ERROR: {e}")
+    
+    finally:
+        if placement:
+            # Operations not yet started stay in flight in the journal for --resume
+            placement.close(cancel=True)
+        if journal:
+            journal.close()
+        if embedding_cache:
+            embedding_cache.save()
+        if thumbnails:
+            thumbnails.close()
+
+# =============================================================================
+# PLAN / APPLY MODE
+# =============================================================================
+
+def _plan_header() -> Dict:
+    return {"plan": 1, "source": SOURCE_FOLDER, "destination": DESTINATION_FOLDER,
+            "threshold": CONFIDENCE_THRESHOLD, "created": datetime.now().isoformat(timespec="seconds")}
+
+
+def _plan_settings_match(header: Dict) -> bool:
+    current = _plan_header()
+    return all(header.get(key) == current[key] for key in ("source", "destination", "threshold"))
+
+
+def read_apply_journal(journal_file: Path, header: Dict) -> Optional[Dict[str, str]]:
+    """
+    Destinations an earlier apply of the same plan handed out, by plan source.
+    
+    Returns:
+        None if there is no journal or it belongs to a different plan
+    """
+    if not journal_file.exists():
+        return None
+    destinations: Dict[str, str] = {}
+    with open(journal_file, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f):
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if line_no == 0:
+                if record.get("plan") != header.get("created"):
+                    return None
+            elif record.get("source") and record.get("destination"):
+                destinations[record["source"]] = record["destination"]
+    return destinations
+
+
+def read_placement_plan(plan_file: str) -> Tuple[Dict, List[Dict]]:
+    """
+    Read a placement plan written by plan_animal_photos().
+    
+    Returns:
+        Tuple of (header, entries); malformed lines are skipped
+    """
+    header: Dict = {}
+    entries: List[Dict] = []
+    with open(plan_file, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if "plan" in record:
+                header = record
+            elif record.get("source") and record.get("category"):
+                entries.append(record)
+    return header, entries
+
+
+def plan_animal_photos(plan_file: str = PLAN_FILE, resume: bool = False):
+    """
+    Classify every image and write a placement plan instead of touching any files.
+    
+    The plan is JSON Lines: a header line, then one line per image with
+    source (relative to SOURCE_FOLDER), category, confidence and destination
+    (relative to DESTINATION_FOLDER). Edit a line's category to re-route an
+    image or delete the line to skip it, then run 'apply'.
+    
+    Args:
+        plan_file: Where to write the plan
+        resume: Keep an existing plan and only classify images not yet in it
+    """
+    require_ml_packages()
+    logger = setup_logging()
+    source_root = Path(SOURCE_FOLDER)
+    if not source_root.exists():
+        logger.error(f"Source folder does not exist: {SOURCE_FOLDER}")
+        print(f"ERROR: Source folder '{SOURCE_FOLDER}' does not exist!")
+        return
+    
+    file_manager = FileManager(SOURCE_FOLDER, DESTINATION_FOLDER, MOVE_FILES, logger)
+    image_files = file_manager.get_image_files()
+    if not image_files:
+        print("No image files found to process.")
+        return
+    
+    planned = set()
+    used_names = set()
+    if resume and Path(plan_file).exists():
+        header, entries = read_placement_plan(plan_file)
+        if not _plan_settings_match(header):
+            logger.error(f"Plan {plan_file} was made with different source/destination/threshold settings")
+            print(f"ERROR: '{plan_file}' was planned with other settings "
+                  f"(source {header.get('source')}, destination {header.get('destination')}, "
+                  f"threshold {header.get('threshold')}). Run 'plan' without --resume to start over.")
+            return
+        for entry in entries:
+            planned.add(entry["source"])
+            used_names.add(entry["destination"].lower())
+        mode = "a"
+        print(f"Resuming plan {plan_file}: {len(planned)} images already planned")
+    else:
+        mode = "w"
+    
+    pending = [f for f in image_files if f.relative_to(source_root).as_posix() not in planned]
+    if not pending:
+        print(f"Plan {plan_file} already covers all {len(image_files)} images.")
+        return
+    
+    embedding_cache = EmbeddingCache(EMBEDDING_CACHE_FILE, CLIP_MODEL_NAME, logger)
+    thumbnails = ThumbnailStore()
+    classifier = AnimalClassifier(logger, embedding_cache, thumbnails)
+    counts: Dict[str, int] = {}
+    low_confidence = 0
+    
+    def write_plan_entry(f, image_file: Path, animal_type: str, confidence: float):
+        nonlocal low_confidence
+        if confidence < CONFIDENCE_THRESHOLD:
+            animal_type = "unknown"
+            low_confidence += 1
+        category = FileManager.folder_name_for(animal_type)
+        
+        # Only names within the plan are deduplicated; 'apply' re-checks the target disk
+        destination = f"{category}/{image_file.name}"
+        counter = 1
+        while destination.lower() in used_names:
+            destination = f"{category}/{image_file.stem}_{counter}{image_file.suffix}"
+            counter += 1
+        used_names.add(destination.lower())
+        
+        entry = {
+            "source": image_file.relative_to(source_root).as_posix(),
+            "category": category,
+            "confidence": round(confidence, 4),
+            "destination": destination,
+        }
+        f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        f.flush()
+        counts[category] = counts.get(category, 0) + 1
+    
+    Path(plan_file).parent.mkdir(parents=True, exist_ok=True)
+    try:
+        with open(plan_file, mode, encoding="utf-8") as f:
+            if mode == "w":
+                f.write(json.dumps(_plan_header(), separators=(",", ":")) + "\n")
+            
+            for start in range(0, len(pending), CLASSIFY_BATCH_SIZE):
+                batch = pending[start:start + CLASSIFY_BATCH_SIZE]
+                print(f"Planning {start + 1}-{start + len(batch)}/{len(pending)}...")
+                results = classifier.classify_batch([str(p) for p in batch])
+                for image_file, (animal_type, confidence) in zip(batch, results):
+                    write_plan_entry(f, image_file, animal_type, confidence)
+    
+    except KeyboardInterrupt:
+        logger.info("Planning interrupted by user")
+        print(f"\nPlanning interrupted. Run 'python animal_photo_sorter.py plan {plan_file} --resume' to continue.")
+        return
+    
+    finally:
+        embedding_cache.save()
+        thumbnails.close()
+    
+    print(f"\nPlan written to {plan_file} ({sum(counts.values())} images, {low_confidence} below threshold)")
+    for category, count in sorted(counts.items()):
+        print(f"  {category}: {count} images")
+    logger.info(f"Plan written to {plan_file}: {counts}")
+
+
+def apply_placement_plan(plan_file: str = PLAN_FILE):
+    """
+    Execute a placement plan with parallel file operations; no model is loaded.
+    
+    The destination actually used for each entry (after any _1, _2, ...
+    suffix for names already taken) is recorded in <plan_file>.applied before
+    the file is placed. Re-running apply reuses those destinations and skips
+    entries already placed there, so an interrupted or repeated apply never
+    places a file twice and never mistakes an unrelated file for its own.
+    """
+    logger = setup_logging()
+    if not Path(plan_file).exists():
+        print(f"ERROR: Plan file '{plan_file}' does not exist! Run 'python animal_photo_sorter.py plan' first.")
+        return
+    
+    header, entries = read_placement_plan(plan_file)
+    if header.get("source") not in (None, SOURCE_FOLDER):
+        logger.info(f"Plan was made against {header['source']}; applying relative to {SOURCE_FOLDER}")
+    
+    source_root = Path(SOURCE_FOLDER)
+    file_manager = FileManager(SOURCE_FOLDER, DESTINATION_FOLDER, MOVE_FILES, logger)
+    already_placed = 0
+    
+    journal_file = Path(f"{plan_file}.applied")
+    applied = read_apply_journal(journal_file, header)
+    if applied is None:
+        applied = {}
+        journal = open(journal_file, "w", encoding="utf-8")
+        journal.write(json.dumps({"plan": header.get("created")}) + "\n")
+    else:
+        journal = open(journal_file, "a", encoding="utf-8")
+        print(f"Continuing from {journal_file}: {len(applied)} placements recorded")
+    # Names handed out earlier stay taken, whether or not their file was written
+    for destination in applied.values():
+        file_manager.reserve(file_manager.destination_folder / destination)
+    unsynced = 0
+    
+    def record_destination(source: str, destination_file: Path):
+        nonlocal unsynced
+        relative = destination_file.relative_to(file_manager.destination_folder).as_posix()
+        journal.write(json.dumps({"source": source, "destination": relative}) + "\n")
+        journal.flush()
+        unsynced += 1
+        if unsynced >= CHECKPOINT_INTERVAL:
+            os.fsync(journal.fileno())
+            unsynced = 0
+    
+    def on_placed(source_file: Path, destination_file: Path, success: bool):
+        # Runs on a placement worker thread
+        file_manager.update_stats(destination_file.parent.name, success)
+        if not success:
+            print(f"  → ERROR: Failed to place {source_file.name}")
+    
+    print(f"Applying {len(entries)} planned placements from {plan_file}...")
+    placement = PlacementStage(file_manager, on_placed)
+    created_folders = set()
+    try:
+        for entry in entries:
+            source_file = source_root / entry["source"]
+            category = entry["category"]
+            file_name = Path(entry.get("destination") or source_file.name).name
+            
+            destination_folder = file_manager.destination_folder / category
+            if category not in created_folders:
+                destination_folder.mkdir(parents=True, exist_ok=True)
+                created_folders.add(category)
+            
+            previous = applied.get(entry["source"])
+            if previous and Path(previous).parent.name == category:
+                # Placed (or started) by an earlier apply: only that exact file counts
+                destination_file = file_manager.destination_folder / previous
+                if file_manager.is_placed(source_file, destination_file):
+                    already_placed += 1
+                    file_manager.update_stats(category, True)
+                    continue
+            else:
+                destination_file = None
+            if not source_file.exists():
+                logger.error(f"Planned source is missing: {source_file}")
+                file_manager.update_stats(category, False)
+                continue
+            
+            if destination_file is None:
+                destination_file = file_manager.resolve_destination_file(source_file, destination_folder, file_name)
+                record_destination(entry["source"], destination_file)
+            placement.submit(source_file, destination_file)
+        
+        placement.close()
+    
+    except KeyboardInterrupt:
+        placement.close(cancel=True)
+        print("\nApply interrupted. Re-run 'apply' to place the remaining files.")
+        return
+    
+    finally:
+        journal.flush()
+        os.fsync(journal.fileno())
+        journal.close()
+    
+    if already_placed:
+        print(f"{already_placed} files were already in place and skipped.")
+    file_manager.print_summary_report()
 
 # =============================================================================
 # UTILITY FUNCTIONS
@@ -604,8 +1484,12 @@ def create_sample_structure():
 if __name__ == "__main__":
     import sys
     
-    if len(sys.argv) > 1:
-        command = sys.argv[1].lower()
+    args = sys.argv[1:]
+    resume = "--resume" in args
+    args = [a for a in args if a != "--resume"]
+    
+    if args:
+        command = args[0].lower()
         
         if command == "install":
             install_dependencies()
@@ -613,10 +1497,17 @@ if __name__ == "__main__":
             test_installation()
         elif command == "setup":
             create_sample_structure()
+        elif command == "plan":
+            plan_animal_photos(args[1] if len(args) > 1 else PLAN_FILE, resume=resume)
+        elif command == "apply":
+            apply_placement_plan(args[1] if len(args) > 1 else PLAN_FILE)
         elif command == "help":
             print(__doc__)
             print("\nUsage:")
             print("  python animal_photo_sorter.py          - Run the sorting process")
+            print("  python animal_photo_sorter.py --resume - Continue an interrupted sorting run")
+            print("  python animal_photo_sorter.py plan [file] [--resume] - Classify only and write a placement plan")
+            print("  python animal_photo_sorter.py apply [file] - Copy/move files according to a plan (no model)")
             print("  python animal_photo_sorter.py install  - Show installation instructions")
             print("  python animal_photo_sorter.py test     - Test if dependencies are installed")
             print("  python animal_photo_sorter.py setup    - Create sample folder structure")
@@ -626,4 +1517,4 @@ if __name__ == "__main__":
             print("Use 'python animal_photo_sorter.py help' for usage information.")
     else:
         # Run the main sorting function
-        sort_animal_photos()
+        sort_animal_photos(resume=resume)
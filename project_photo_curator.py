@@ -13,27 +13,89 @@ Curate and sort woodcarving project photos into a clean, organized structure.
   * 04_Detailing (~70% into process)
   * 05-09 Finished_* (up to N hero shots from final)
   * 10-11 Detail_* (optional: subset from final)
+- curated_schedules.json can give project types their own named phases and fractions (and detail
+  fractions); all positions of a schedule are computed at once and never pick the same image twice
+- Process shots are ordered by EXIF capture time (header bytes only, cached) when every shot has one,
+  else by the trailing number in the file name; phase positions then map onto capture time
+- Content-aware picks (needs Pillow + NumPy): around each nominal position the timeline is split
+  at the biggest visual changes and the sharpest, best exposed, non-duplicate frame is chosen;
+  per-image features are cached in curated_output/.cache and computed from the shared thumbnail
+  store (thumbnail_cache.py). --clip adds CLIP embeddings.
 - Exports into: curated_output/Woodcarvings/<ProjectName>/ with descriptive filenames
-- Creates a _Portfolio_BestOf folder with 1-2 favorites across projects
+- Creates a _Portfolio_BestOf folder with 1-2 favorites per project: with Pillow + NumPy, all finals
+  are scored (sharpness, exposure, contrast, colourfulness) and the top N across the portfolio are
+  taken, skipping near-duplicates; scores are kept in _Portfolio_BestOf/_scores.json
 - Modes: dry-run (default), copy, move, or hardlink (if supported)
+- Directory listings are cached in curated_output/.cache and only re-read for folders that changed
+- Incremental: projects whose sources, filters/overrides and options are unchanged are skipped,
+  and within a changed project only curated files that differ are replaced
+- Web renditions (480/960/1920 px, WEBP and AVIF where Pillow supports it) of every pick go to a
+  web/ folder beside it; they are rendered once per source content and recipe (--no-web to skip)
+- _mapping.json rows carry width/height, dominant colour and a tiny LQIP data URI per pick, so pages
+  can reserve layout and paint a placeholder before the image loads (cached by content hash)
+- --timelapse adds a contact sheet of each project's process shots (in curated order) and, per format
+  given, an animated WEBP or MP4 (via ffmpeg) timelapse in a timelapse/ folder; frames are streamed from
+  cached thumbnails and long projects are sampled down, so memory stays flat
+- Everything curated (folders, picks with their layout data and scores, output files) is also
+  recorded in curated_output/manifest.sqlite, updated per project, for tools to query in one read
+- curated_report.json records per project (and in total) wall time per phase (fingerprint, listing,
+  filtering, selection, export, metadata), bytes copied/linked/moved/skipped and filesystem calls,
+  and lists the slowest projects
+- --watch keeps running after the first pass: changes under public/media/projects or to the overrides/filters
+  files (inotify on Linux, stat polling elsewhere) re-curate just the affected projects once things settle,
+  merge them into the report and rebuild the review gallery
+- curated_extractions.json (virtual projects built from explicit source globs) is parsed incrementally
+  and exported in the background while projects are curated; bad items are listed in the report
 
 This is heuristic-only and safe. It does NOT delete originals.
 
 Usage examples:
   python project_photo_curator.py --dry-run
   python project_photo_curator.py --mode copy --max-finals 5 --bestof-count 2
+  python project_photo_curator.py --mode copy --jobs 4
+  python project_photo_curator.py --mode copy --watch
+  python project_photo_curator.py --mode copy --timelapse webp mp4
 
 """
 
 from __future__ import annotations
 import argparse
+import base64
+import io
 import json
 import os
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
+from typing import Callable, List, Dict, Optional, Tuple, Pattern
+import bisect
+import calendar
 import fnmatch
+import hashlib
+import re
+import select
 import shutil
+import sqlite3
+import struct
+import subprocess
+import sys
 import glob
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
+from contextlib import contextmanager, nullcontext
+
+from thumbnail_cache import UNDECODABLE_ERRORS, ThumbnailStore, file_digest as content_digest
+
+try:  # Optional: content-aware selection and web derivatives need Pillow and NumPy
+    import numpy as np
+    from PIL import Image, ImageOps
+    FEATURES_AVAILABLE = True
+except ImportError:
+    np = None
+    Image = ImageOps = None
+    FEATURES_AVAILABLE = False
 
 # -------- Config defaults --------
 SOURCE_ROOT = Path("public/media/projects")
@@ -42,38 +104,84 @@ BEST_OF_DIRNAME = "_Portfolio_BestOf"
 SUPPORTED_EXTS = {".jpg", ".jpeg", ".png", ".webp", ".JPG", ".JPEG", ".PNG", ".WEBP"}
 OVERRIDES_PATH = Path("curated_overrides.json")
 FILTERS_PATH = Path("curated_filters.json")
+EXTRACTIONS_PATH = Path("curated_extractions.json")
+SCHEDULES_PATH = Path("curated_schedules.json")
+SCOPES = ("process", "final")
+CACHE_ROOT = Path("curated_output/.cache")
+MANIFEST_PATH = Path("curated_output/manifest.sqlite")
+DIR_INDEX_PATH = CACHE_ROOT / "dir_index.json"
+FINGERPRINTS_PATH = CACHE_ROOT / "fingerprints.json"
+FEATURES_PATH = CACHE_ROOT / "features.json"
+CLIP_CACHE_PATH = CACHE_ROOT / "clip_embeddings.npz"
+CAPTURE_TIMES_PATH = CACHE_ROOT / "capture_times.json"
+DERIVATIVES_DIR = CACHE_ROOT / "derivatives"
+DIGESTS_PATH = CACHE_ROOT / "digests.json"
+PLACEHOLDERS_PATH = CACHE_ROOT / "placeholders.json"
+GALLERY_SCRIPT = Path("tools/review_gallery_generator.py")
+
+# Web renditions of every curated pick, written to a web/ folder beside it
+DERIVATIVES_DIRNAME = "web"
+DERIVATIVE_WIDTHS = (480, 960, 1920)
+DERIVATIVE_FORMATS = {"webp": {"quality": 80, "method": 4}, "avif": {"quality": 50}}
+
+# Placeholder previews stored in _mapping.json: longest side in px and encoder quality
+LQIP_SIZE = 16
+LQIP_QUALITY = 40
+
+# --timelapse: contact sheet grid (columns, tile width, most tiles) and timelapse frames
+TIMELAPSE_DIRNAME = "timelapse"
+CONTACT_SHEET_COLUMNS = 8
+CONTACT_SHEET_TILE = 240
+CONTACT_SHEET_GAP = 4
+CONTACT_SHEET_MAX = 96
+CONTACT_SHEET_QUALITY = 85
+TIMELAPSE_FRAMES = 120
+TIMELAPSE_SIZE = (640, 480)
+TIMELAPSE_FPS = 8
+TIMELAPSE_QUALITY = 75
+TIMELAPSE_WINDOW = 8      # frames decoded ahead of the encoder
+TIMELAPSE_BACKGROUND = (24, 24, 24)
+
+# EXIF lives in the first segments of a file; never read further than this for it
+EXIF_READ_BYTES = 128 * 1024
+
+# Nominal positions of the process phases and detail picks along their (sorted) lists;
+# curated_schedules.json can replace them per project type
+PHASE_FRACTIONS = (("RawWood", 0.0), ("RoughShape", 0.18), ("DefiningForms", 0.45), ("Detailing", 0.75))
+DETAIL_FRACTIONS = (0.6, 0.85)
+
+# --watch: seconds of quiet before re-curating, and the stat-polling interval without inotify
+WATCH_DEBOUNCE = 1.0
+WATCH_POLL_INTERVAL = 2.0
+
+# Content-aware selection tuning
+FEATURE_SIZE = 256        # longest side of the grayscale decode used for features
+EXPOSURE_WEIGHT = 1.0     # weight of exposure (0..1) against the sharpness z-score
+TARGET_WEIGHT = 1.0       # penalty for straying across a whole cluster from the nominal position
+DUPLICATE_BITS = 6        # dHash distance at or below which two frames count as near-duplicates
+AESTHETIC_WEIGHT = 0.5    # weight of contrast/colourfulness when ranking best-of candidates
+
+# Portfolio best-of: at most this many picks per project; CLIP cosine distance below which
+# two candidates count as near-duplicates
+BESTOF_PER_PROJECT = 2
+BESTOF_DUPLICATE_DISTANCE = 0.05
+BESTOF_SCORES_NAME = "_scores.json"
+
+# Number of projects listed as slowest in the report's timing summary
+TIMING_SLOWEST = 5
+
+# Bump when selection/naming logic changes so every project is re-curated once
+SELECTION_VERSION = 7
 
 # -------- Helpers --------
 
-def list_images(folder: Path) -> List[Path]:
-    files: List[Path] = []
-    if not folder.exists():
-        return files
-    for p in sorted(folder.glob("*")):
-        if p.is_file() and p.suffix in SUPPORTED_EXTS:
-            files.append(p)
-    return files
-
-
-def pick_by_fraction(items: List[Path], frac: float) -> Optional[Path]:
-    if not items:
-        return None
-    idx = max(0, min(len(items) - 1, int(round(frac * (len(items) - 1)))))
-    return items[idx]
-
-
 def spaced_picks(items: List[Path], count: int) -> List[Path]:
-    if not items:
+    if not items or count <= 0:
         return []
     if count >= len(items):
         return items.copy()
-    out: List[Path] = []
-    for i in range(count):
-        frac = i / max(1, (count - 1)) if count > 1 else 0
-        sel = pick_by_fraction(items, frac)
-        if sel and sel not in out:
-            out.append(sel)
-    return out
+    fractions = [i / (count - 1) for i in range(count)] if count > 1 else [0.0]
+    return [items[i] for i in schedule_indices(len(items), fractions)]
 
 
 def numeric_key_from_name(p: Path) -> int:
@@ -133,73 +241,479 @@ def load_filters() -> Dict[str, Dict[str, List[str]]]:
     return {}
 
 
-def resolve_override(project_name: str, label: str, project_dir: Path) -> Optional[Path]:
+def load_schedules() -> Dict[str, Dict]:
     """
-    Resolve an override pattern to a source file Path.
-    Pattern formats accepted:
-    - "process:*_011.*" (glob, relative to images/process)
-    - "final:*_301.*" (glob, relative to images/final)
-    - "*_011.*" (glob searched in process first, then final)
-    - "eagle_eagle_011.jpg" (filename searched in process then final)
+    Load optional pick schedules per project type:
+      { "types": { typeName: { "phases": { label: fraction, ... }, "details": [fractions] } },
+        "projects": { projectName: typeName } }
+    A type named "default" applies to every project without one. Labels become
+    part of the curated file names; invalid entries are ignored.
     """
-    overrides = load_overrides()
-    proj_map = overrides.get(project_name) or {}
-    pattern = proj_map.get(label)
-    if not pattern:
+    if SCHEDULES_PATH.exists():
+        try:
+            with open(SCHEDULES_PATH, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                types: Dict[str, Dict] = {}
+                for name, cfg in (data.get("types") or {}).items():
+                    if not isinstance(cfg, dict):
+                        continue
+                    phases = [[sanitize_name(str(label)), float(frac)] for label, frac in (cfg.get("phases") or {}).items()
+                              if isinstance(frac, (int, float)) and 0.0 <= frac <= 1.0 and sanitize_name(str(label))]
+                    details = [float(x) for x in cfg.get("details") or [] if isinstance(x, (int, float)) and 0.0 <= x <= 1.0]
+                    types[name] = {"phases": phases or [list(p) for p in PHASE_FRACTIONS],
+                                   "details": details if "details" in cfg else list(DETAIL_FRACTIONS)}
+                projects = {proj: types[t] for proj, t in (data.get("projects") or {}).items() if t in types}
+                if "default" in types:
+                    projects.setdefault("", types["default"])
+                return projects  # { projectName: schedule }, "" for the default
+        except Exception:
+            pass
+    return {}
+
+
+def split_scope(pattern: str) -> Tuple[Optional[str], str]:
+    """Split 'process:*_011.*' into ('process', '*_011.*'); unscoped patterns get scope None."""
+    for scope in SCOPES:
+        if pattern.startswith(scope + ":"):
+            return scope, pattern.split(":", 1)[1]
+    return None, pattern
+
+
+def glob_flags() -> int:
+    """Case-insensitive on Windows, like fnmatch.fnmatch."""
+    return re.IGNORECASE if os.name == "nt" else 0
+
+
+def compile_glob(pattern: str) -> Pattern:
+    """Compile a single filename glob."""
+    return re.compile(fnmatch.translate(pattern), glob_flags())
+
+
+def compile_globs(patterns: List[str]) -> Optional[Pattern]:
+    """Compile several globs into one alternation regex; None when there are no patterns."""
+    if not patterns:
         return None
-    images_dir = project_dir / "images"
-    process_dir = images_dir / "process"
-    final_dir = images_dir / "final"
+    return re.compile("|".join(f"(?:{fnmatch.translate(p)})" for p in patterns), glob_flags())
+
 
-    def find_in(dir_path: Path, pat: str) -> Optional[Path]:
-        for f in dir_path.glob(pat):
-            if f.is_file():
-                return f
+class ScopedPatterns:
+    """
+    Filename globs grouped by the scope ('process'/'final') they apply to.
+
+    Each scope's globs are combined into a single alternation regex, so testing
+    a path costs one regex match however many patterns a project has.
+    """
+
+    def __init__(self, patterns: List[str]):
+        by_scope: Dict[str, List[str]] = {scope: [] for scope in SCOPES}
+        for raw in patterns:
+            scope, pat = split_scope(raw)
+            for s in ([scope] if scope else SCOPES):
+                by_scope[s].append(pat)
+        self.combined: Dict[str, Optional[Pattern]] = {s: compile_globs(pats) for s, pats in by_scope.items()}
+
+    def __bool__(self) -> bool:
+        return any(rx is not None for rx in self.combined.values())
+
+    def matches(self, scope: str, rel_path: str) -> bool:
+        rx = self.combined[scope]
+        return rx is not None and rx.match(rel_path) is not None
+
+
+class ProjectConfig:
+    """Compiled include/exclude filters and label overrides for one project."""
+
+    def __init__(self, filters: Optional[Dict[str, List[str]]] = None, overrides: Optional[Dict[str, str]] = None,
+                 schedule: Optional[Dict] = None):
+        filters = filters or {}
+        # Raw entries, kept for fingerprinting
+        self.raw = {"filters": filters, "overrides": overrides or {}, "schedule": schedule}
+        # (label, fraction) of each process phase, and fractions of the detail picks
+        self.phases: List[Tuple[str, float]] = [tuple(p) for p in schedule["phases"]] if schedule else list(PHASE_FRACTIONS)
+        self.details: List[float] = list(schedule["details"]) if schedule else list(DETAIL_FRACTIONS)
+        self.include = ScopedPatterns(filters.get("include") or [])
+        self.exclude = ScopedPatterns(filters.get("exclude") or [])
+        # label -> (scope or None, compiled glob)
+        self.overrides: Dict[str, Tuple[Optional[str], Pattern]] = {}
+        for label, pattern in (overrides or {}).items():
+            if not pattern:
+                continue
+            scope, pat = split_scope(str(pattern))
+            self.overrides[label] = (scope, compile_glob(pat))
+
+    def apply_filters(self, scope: str, files: List[Path], rel_paths: Optional[List[str]] = None) -> List[Path]:
+        """
+        Drop excluded files, then keep only included ones if any includes are configured.
+
+        rel_paths are the files' '/'-separated paths relative to the scope folder;
+        listings are flat, so they default to the file names.
+        """
+        if rel_paths is None:
+            rel_paths = [p.name for p in files]
+        exclude = self.exclude.combined[scope]
+        include = self.include.combined[scope]
+        if include is None and self.include:
+            # Includes exist, but only for the other scope: nothing here qualifies
+            return []
+        return [
+            p for p, rel in zip(files, rel_paths)
+            if (exclude is None or not exclude.match(rel)) and (include is None or include.match(rel))
+        ]
+
+    def resolve_override(self, label: str, listings: Dict[str, List[Path]]) -> Optional[Path]:
+        """
+        Resolve an override for label against the project's directory listings.
+        Pattern formats accepted:
+        - "process:*_011.*" (glob, relative to images/process)
+        - "final:*_301.*" (glob, relative to images/final)
+        - "*_011.*" (glob searched in process first, then final)
+        - "eagle_eagle_011.jpg" (filename searched in process then final)
+        """
+        entry = self.overrides.get(label)
+        if not entry:
+            return None
+        scope, rx = entry
+        for s in ([scope] if scope else SCOPES):
+            for f in listings.get(s, []):
+                if rx.match(f.name):
+                    return f
         return None
 
-    # Namespaced patterns
-    if pattern.startswith("process:"):
-        pat = pattern.split(":", 1)[1]
-        return find_in(process_dir, pat)
-    if pattern.startswith("final:"):
-        pat = pattern.split(":", 1)[1]
-        return find_in(final_dir, pat)
-
-    # Unscoped: try process first then final
-    p = find_in(process_dir, pattern)
-    if p:
-        return p
-    return find_in(final_dir, pattern)
-
-
-def pattern_applies_to(p: Path, pattern: str, process_dir: Path, final_dir: Path) -> bool:
-    """Return True if file p matches the glob pattern. Pattern may be scoped with 'process:' or 'final:'."""
-    scope = None
-    pat = pattern
-    if pattern.startswith("process:"):
-        scope = "process"
-        pat = pattern.split(":", 1)[1]
-    elif pattern.startswith("final:"):
-        scope = "final"
-        pat = pattern.split(":", 1)[1]
-
-    # Enforce scope
-    if scope == "process" and process_dir not in p.parents:
-        return False
-    if scope == "final" and final_dir not in p.parents:
-        return False
 
-    # Try match against basename
-    if fnmatch.fnmatch(p.name, pat):
-        return True
-    # Also try relative path under images
+class CuratorConfig:
+    """
+    Curator overrides and filters, read and compiled once per run.
+
+    Projects without entries get an empty ProjectConfig, so lookups never touch the disk.
+    """
+
+    def __init__(self, overrides: Dict[str, Dict[str, str]], filters: Dict[str, Dict[str, List[str]]],
+                 schedules: Optional[Dict[str, Dict]] = None):
+        schedules = schedules or {}
+        self.projects: Dict[str, ProjectConfig] = {}
+        for name in (set(overrides) | set(filters) | set(schedules)) - {""}:
+            proj_overrides = overrides.get(name)
+            self.projects[name] = ProjectConfig(
+                filters.get(name),
+                proj_overrides if isinstance(proj_overrides, dict) else None,
+                schedules.get(name, schedules.get("")),
+            )
+        self._empty = ProjectConfig(schedule=schedules.get(""))
+
+    @classmethod
+    def load(cls) -> "CuratorConfig":
+        return cls(load_overrides(), load_filters(), load_schedules())
+
+    def for_project(self, project_name: str) -> ProjectConfig:
+        return self.projects.get(project_name, self._empty)
+
+
+# -------- Run accounting --------
+
+class WorkStats:
+    """
+    Wall time per phase, bytes exported (by how they were written) and
+    filesystem calls for one unit of work: a project, the best-of pass or the
+    extractions. Helpers record through io_call/io_bytes/phase, which count
+    against the stats made active on the current thread with track().
+
+    Work a unit hands to a pool thread or worker process (capture times,
+    features, placeholders, thumbnails, renditions) is not attributed to it;
+    RUN_IO counts that too, for the run as a whole.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+        self.bytes = {"copied": 0, "linked": 0, "moved": 0, "skipped": 0}
+        self.calls: Dict[str, int] = {}
+
+    def as_dict(self) -> Dict:
+        return {"seconds": round(time.perf_counter() - self.started, 4),
+                "phases": {name: round(secs, 4) for name, secs in self.phases.items()},
+                "bytes": dict(self.bytes),
+                "fs_calls": dict(sorted(self.calls.items()))}
+
+
+class IOCounter:
+    """Filesystem calls and bytes of the whole run, recorded from any thread."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.bytes = {"copied": 0, "linked": 0, "moved": 0, "skipped": 0}
+            self.calls: Dict[str, int] = {}
+
+    def call(self, name: str, count: int) -> None:
+        with self._lock:
+            self.calls[name] = self.calls.get(name, 0) + count
+
+    def add_bytes(self, kind: str, count: int) -> None:
+        with self._lock:
+            self.bytes[kind] = self.bytes.get(kind, 0) + count
+
+    def as_dict(self) -> Dict:
+        with self._lock:
+            return {"bytes": dict(self.bytes), "fs_calls": dict(sorted(self.calls.items()))}
+
+
+RUN_IO = IOCounter()
+_active = threading.local()
+
+
+@contextmanager
+def track(stats: WorkStats):
+    """Count everything done on this thread inside the block against stats."""
+    previous = getattr(_active, "stats", None)
+    _active.stats = stats
     try:
-        rel = p.relative_to(process_dir if process_dir in p.parents else final_dir)
-        if fnmatch.fnmatch(str(rel).replace("\\", "/"), pat):
-            return True
-    except Exception:
-        pass
-    return False
+        yield stats
+    finally:
+        _active.stats = previous
+
+
+@contextmanager
+def _timed(stats: WorkStats, name: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats.phases[name] = stats.phases.get(name, 0.0) + time.perf_counter() - start
+
+
+def phase(name: str):
+    """Time the block as phase name of the active stats (a no-op without any)."""
+    stats = getattr(_active, "stats", None)
+    return _timed(stats, name) if stats is not None else nullcontext()
+
+
+def io_call(name: str, count: int = 1) -> None:
+    if not count:
+        return
+    RUN_IO.call(name, count)
+    stats = getattr(_active, "stats", None)
+    if stats is not None:
+        stats.calls[name] = stats.calls.get(name, 0) + count
+
+
+def io_bytes(kind: str, count: int) -> None:
+    RUN_IO.add_bytes(kind, count)
+    stats = getattr(_active, "stats", None)
+    if stats is not None:
+        stats.bytes[kind] = stats.bytes.get(kind, 0) + count
+
+
+def summarize_timing(seconds: float, projects: List[Dict], others: Dict[str, Dict]) -> Dict:
+    """
+    Run-wide phase totals of the per-project timings plus the slowest
+    projects. Bytes and filesystem calls come from RUN_IO, so they include
+    pool threads and worker processes.
+    """
+    phases: Dict[str, float] = {}
+    for t in [p["timing"] for p in projects if "timing" in p] + list(others.values()):
+        for key, value in t["phases"].items():
+            phases[key] = phases.get(key, 0) + value
+    slowest = sorted((p for p in projects if "timing" in p), key=lambda p: p["timing"]["seconds"], reverse=True)
+    return {
+        "seconds": round(seconds, 4),
+        "phases": {name: round(secs, 4) for name, secs in phases.items()},
+        **RUN_IO.as_dict(),
+        **others,
+        "slowest": [{"project": p["project"], "seconds": p["timing"]["seconds"], "phases": p["timing"]["phases"]}
+                    for p in slowest[:TIMING_SLOWEST]],
+    }
+
+
+# -------- Directory index --------
+
+class FileEntry:
+    """One file from a directory listing: name plus the stat info we need."""
+
+    __slots__ = ("folder", "name", "size", "mtime_ns")
+
+    def __init__(self, folder: Path, name: str, size: int, mtime_ns: int):
+        self.folder = folder
+        self.name = name
+        self.size = size
+        self.mtime_ns = mtime_ns
+
+    @property
+    def path(self) -> Path:
+        return self.folder / self.name
+
+    @property
+    def suffix(self) -> str:
+        return os.path.splitext(self.name)[1]
+
+
+class DirectoryIndex:
+    """
+    Flat file listings built with one os.scandir per directory and shared by
+    filters, overrides and picking for the whole run.
+
+    Listings are persisted to DIR_INDEX_PATH together with each directory's
+    mtime; a directory whose mtime is unchanged since the last run is not
+    re-listed. A directory's mtime changes when entries are added, removed or
+    renamed, not when a file is rewritten in place, so the cached names are
+    re-stat'ed (one stat per file, no directory read) to pick up new sizes
+    and mtimes.
+    """
+
+    VERSION = 1
+
+    def __init__(self, cache_path: Optional[Path] = DIR_INDEX_PATH, load: bool = True):
+        self.cache_path = cache_path
+        self._dirs: Dict[str, Dict] = {}
+        self._listings: Dict[str, List[FileEntry]] = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        if load and cache_path and cache_path.exists():
+            try:
+                with open(cache_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("version") == self.VERSION:
+                    self._dirs = data.get("dirs") or {}
+            except Exception:
+                self._dirs = {}
+
+    def entries(self, folder: Path) -> List[FileEntry]:
+        """Files directly inside folder, sorted by name like Path.glob + sorted()."""
+        key = str(folder)
+        with self._lock:
+            if key in self._listings:
+                return self._listings[key]
+            cached = self._dirs.get(key)
+        io_call("stat")
+        try:
+            dir_mtime = os.stat(folder).st_mtime_ns
+        except OSError:
+            with self._lock:
+                self._listings[key] = []
+            return []
+
+        if cached and cached.get("mtime_ns") == dir_mtime:
+            entries = []
+            changed = False
+            for name, size, mtime in cached["files"]:
+                try:
+                    st = os.stat(folder / name)
+                except OSError:
+                    changed = True
+                    continue
+                if st.st_size != size or st.st_mtime_ns != mtime:
+                    changed = True
+                entries.append(FileEntry(folder, name, st.st_size, st.st_mtime_ns))
+            io_call("stat", len(cached["files"]))
+            if changed:
+                with self._lock:
+                    self._dirs[key] = {"mtime_ns": dir_mtime, "files": [[e.name, e.size, e.mtime_ns] for e in entries]}
+                    self._dirty = True
+        else:
+            entries = []
+            io_call("scandir")
+            with os.scandir(folder) as it:
+                for e in it:
+                    if e.is_file():
+                        st = e.stat()
+                        entries.append(FileEntry(folder, e.name, st.st_size, st.st_mtime_ns))
+            io_call("stat", len(entries))
+            entries.sort(key=lambda e: os.path.normcase(e.name))
+            with self._lock:
+                self._dirs[key] = {"mtime_ns": dir_mtime, "files": [[e.name, e.size, e.mtime_ns] for e in entries]}
+                self._dirty = True
+        with self._lock:
+            self._listings[key] = entries
+        return entries
+
+    def files(self, folder: Path) -> List[Path]:
+        return [e.path for e in self.entries(folder)]
+
+    def forget(self, folder: Path) -> None:
+        """Drop folder's listing so it is re-read on next use (e.g. a file was rewritten in place)."""
+        key = str(folder)
+        with self._lock:
+            self._listings.pop(key, None)
+            if self._dirs.pop(key, None) is not None:
+                self._dirty = True
+
+    def save(self) -> None:
+        if not self.cache_path or not self._dirty:
+            return
+        try:
+            with self._lock:
+                data = {"version": self.VERSION, "dirs": dict(self._dirs)}
+            write_json_atomic(self.cache_path, data)
+            self._dirty = False
+        except Exception:
+            pass
+
+
+# -------- Incremental runs --------
+
+def project_fingerprint(project_dir: Path, proj_config: ProjectConfig, index: DirectoryIndex, params: Dict) -> str:
+    """Hash of everything a project's curated output depends on."""
+    images_dir = project_dir / "images"
+    payload = {
+        "version": SELECTION_VERSION,
+        "listing": {scope: [[e.name, e.size, e.mtime_ns] for e in index.entries(images_dir / scope)] for scope in SCOPES},
+        "config": proj_config.raw,
+        "params": params,
+    }
+    return hashlib.sha1(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class FingerprintManifest:
+    """Fingerprint and report entry of every project as of its last real (non dry-run) curation."""
+
+    def __init__(self, path: Optional[Path] = FINGERPRINTS_PATH, load: bool = True):
+        self.path = path
+        self.projects: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        # Without the stored entries a save would throw away every project not curated this run
+        self._loaded = load
+        self._dirty = False
+        if load and path and path.exists():
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if isinstance(data, dict):
+                    self.projects = data
+            except Exception:
+                self.projects = {}
+
+    def unchanged(self, project_name: str, fingerprint: str) -> Optional[Dict]:
+        """The stored report entry if the fingerprint matches and its outputs are all still on disk."""
+        with self._lock:
+            entry = self.projects.get(project_name)
+        if not entry or entry.get("fingerprint") != fingerprint:
+            return None
+        result = entry.get("result") or {}
+        outputs = ([path for _, path in result.get("exported", [])] + list(result.get("web", []))
+                   + list(result.get("timelapse", [])))
+        io_call("stat", len(outputs))
+        if not all(Path(path).exists() for path in outputs):
+            return None
+        return result
+
+    def record(self, project_name: str, fingerprint: str, result: Dict) -> None:
+        with self._lock:
+            self.projects[project_name] = {"fingerprint": fingerprint, "result": result}
+            self._dirty = True
+
+    def save(self) -> None:
+        if not self.path or not self._loaded or not self._dirty:
+            return
+        try:
+            with self._lock:
+                data = dict(self.projects)
+            write_json_atomic(self.path, data)
+            self._dirty = False
+        except Exception:
+            pass
 
 
 def sanitize_name(name: str) -> str:
@@ -209,241 +723,1979 @@ def sanitize_name(name: str) -> str:
 
 
 def ensure_dir(path: Path):
+    io_call("mkdir")
     path.mkdir(parents=True, exist_ok=True)
 
 
-def copy_like(src: Path, dst: Path, mode: str, dry_run: bool) -> None:
+def write_json_atomic(path: Path, data, indent: Optional[int] = None) -> None:
+    """Write JSON to a temp file next to path and rename it over path."""
+    ensure_dir(path.parent)
+    tmp = path.with_name(f".{path.name}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=indent)
+    os.replace(tmp, path)
+    io_call("write")
+    io_call("rename")
+
+
+def copy_like(src: Path, dst: Path, mode: str, dry_run: bool) -> Optional[str]:
+    """Export src to dst; returns how the bytes got there ("copied", "linked" or "moved")."""
     ensure_dir(dst.parent)
     if dry_run:
-        return
+        return None
     if mode == "move":
+        io_call("move")
         shutil.move(str(src), str(dst))
-    elif mode == "link":
+        return "moved"
+    if mode == "link":
+        io_call("link")
         try:
             # Hard link if on same filesystem
             os.link(src, dst)
+            return "linked"
+        except Exception:
+            pass
+    io_call("copy")
+    shutil.copy2(str(src), str(dst))
+    return "copied"
+
+
+def file_digest(path: Path) -> str:
+    io_call("read")
+    return content_digest(path)
+
+
+def same_content(a: Path, a_st: os.stat_result, b: Path, b_st: os.stat_result,
+                 digest: Callable[[Path, os.stat_result], Optional[str]]) -> bool:
+    """Same inode (hard link), or same size and same content hash (None, unreadable, matches nothing)."""
+    if os.path.samestat(a_st, b_st):
+        return True
+    if a_st.st_size != b_st.st_size:
+        return False
+    a_digest = digest(a, a_st)
+    return a_digest is not None and a_digest == digest(b, b_st)
+
+
+def atomic_export(src: Path, dst: Path, mode: str) -> Optional[str]:
+    """Export src under a hidden temp name, then rename it over dst in one step."""
+    tmp = dst.with_name(f".{dst.name}.tmp")
+    io_call("stat")
+    if tmp.exists():
+        io_call("unlink")
+        tmp.unlink()
+    try:
+        how = copy_like(src, tmp, mode, dry_run=False)
+        io_call("rename")
+        os.replace(tmp, dst)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    return how
+
+
+# Keys of the per-folder change counts returned by export_files
+EXPORT_CHANGES = ("kept", "created", "renamed", "deleted", "missing", "failed")
+
+
+def export_files(folder: Path, stale_glob: str, planned: List[Tuple[Path, Path]], mode: str, dry_run: bool,
+                 digests: Optional[ContentDigests] = None) -> Dict[str, int]:
+    """
+    Apply the minimal changes that turn the files matching stale_glob in folder
+    into the planned (source, target) set:
+
+    - targets already holding their source's content are kept
+    - an unplanned file with the right content is renamed into place
+    - anything else is written to a temp file and renamed over the target
+    - unplanned leftovers are deleted last
+
+    Every target is replaced atomically and deletions happen after all writes,
+    so readers never see a partially written file or a half-empty folder.
+    A planned source that is missing, or cannot be exported, is skipped with a
+    warning and whatever its target holds is left as it is.
+
+    Same-sized files are compared by content hash, taken from digests when
+    given; each file is hashed at most once per call.
+
+    Returns counts of kept/created/renamed/deleted/missing/failed files. Bytes
+    written (or skipped because the target already had them) go to the active
+    WorkStats.
+    """
+    changes = dict.fromkeys(EXPORT_CHANGES, 0)
+    if dry_run:
+        return changes
+    ensure_dir(folder)
+    wanted = {dst for _, dst in planned}
+    existing: Dict[Path, os.stat_result] = {}
+    io_call("scandir")
+    for f in folder.glob(stale_glob):
+        io_call("stat")
+        if f.is_file():
+            existing[f] = f.stat()
+    spare = {f: st for f, st in existing.items() if f not in wanted}
+    hashed: Dict[Path, Optional[str]] = {}
+
+    def digest(path: Path, st: os.stat_result) -> Optional[str]:
+        if path not in hashed:
+            hashed[path] = digests.digest(path, st) if digests is not None else source_digest(path)
+        return hashed[path]
+
+    for src, dst in planned:
+        io_call("stat")
+        try:
+            src_st = src.stat()
+        except OSError:
+            print(f"Warning: source {src} is missing; keeping {dst.name} as it is")
+            changes["missing"] += 1
+            continue
+        if dst in existing and same_content(src, src_st, dst, existing[dst], digest):
+            changes["kept"] += 1
+            io_bytes("skipped", src_st.st_size)
+            continue
+        reuse = next((f for f, st in spare.items() if same_content(src, src_st, f, st, digest)), None)
+        if reuse is not None:
+            io_call("rename")
+            os.replace(reuse, dst)
+            del spare[reuse]
+            changes["renamed"] += 1
+            io_bytes("skipped", src_st.st_size)
+            continue
+        try:
+            how = atomic_export(src, dst, mode)
+        except OSError as e:
+            print(f"Warning: could not export {src} -> {dst}: {e}")
+            changes["failed"] += 1
+            continue
+        changes["created"] += 1
+        if how:
+            io_bytes(how, src_st.st_size)
+
+    for f in spare:
+        io_call("unlink")
+        try:
+            f.unlink()
+            changes["deleted"] += 1
+        except Exception:
+            pass
+    return changes
+
+
+# -------- Per-image caches --------
+
+class ImageCache:
+    """
+    Values derived from image files, computed in a thread pool for whatever
+    is missing and cached in a JSON file by path, size and mtime (taken from
+    the directory index, so a cached image is neither stat'ed nor read again).
+    One entry is kept per path; a changed file replaces its old entry.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path: Optional[Path], compute: Callable[[Path], object], load: bool = True):
+        self.path = path
+        self.compute = compute
+        self._entries: Dict[str, Dict] = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._pool: Optional[ThreadPoolExecutor] = None
+        if load and path and path.exists():
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("version") == self.VERSION:
+                    self._entries = data.get("images") or {}
+            except Exception:
+                self._entries = {}
+
+    def values(self, entries: List[FileEntry]) -> List:
+        """Value for each entry, in order; compute decides what unreadable files give."""
+        out: List = [None] * len(entries)
+        missing: List[int] = []
+        with self._lock:
+            for i, e in enumerate(entries):
+                cached = self._entries.get(str(e.path))
+                if cached and cached.get("size") == e.size and cached.get("mtime_ns") == e.mtime_ns:
+                    out[i] = cached.get("value")
+                else:
+                    missing.append(i)
+            if missing and self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=os.cpu_count() or 4)
+        if missing:
+            computed = list(self._pool.map(self.compute, [entries[i].path for i in missing]))
+            with self._lock:
+                for i, value in zip(missing, computed):
+                    e = entries[i]
+                    out[i] = value
+                    self._entries[str(e.path)] = {"size": e.size, "mtime_ns": e.mtime_ns, "value": value}
+                self._dirty = True
+        return out
+
+    def save(self) -> None:
+        if not self.path or not self._dirty:
+            return
+        try:
+            with self._lock:
+                data = {"version": self.VERSION, "images": dict(self._entries)}
+            write_json_atomic(self.path, data)
+            self._dirty = False
         except Exception:
-            shutil.copy2(str(src), str(dst))
+            pass
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+
+def source_digest(path: Path) -> Optional[str]:
+    try:
+        return file_digest(path)
+    except OSError:
+        return None
+
+
+class ContentDigests(ImageCache):
+    """SHA-1 of file contents, cached in DIGESTS_PATH by path, size and mtime."""
+
+    def __init__(self, path: Optional[Path] = DIGESTS_PATH, load: bool = True):
+        super().__init__(path, source_digest, load)
+
+    def of(self, paths: List[Path]) -> List[Optional[str]]:
+        """Digest of each path (None if unreadable); every file is stat'ed, only changed ones are read."""
+        entries: List[FileEntry] = []
+        for p in paths:
+            try:
+                st = p.stat()
+                entries.append(FileEntry(p.parent, p.name, st.st_size, st.st_mtime_ns))
+            except OSError:
+                entries.append(FileEntry(p.parent, p.name, -1, -1))
+        return self.values(entries)
+
+    def digest(self, path: Path, st: os.stat_result) -> Optional[str]:
+        """Digest of one file already stat'ed by the caller."""
+        return self.values([FileEntry(path.parent, path.name, st.st_size, st.st_mtime_ns)])[0]
+
+
+# -------- Capture times --------
+
+EXIF_DATETIME = re.compile(r"^(\d{4}):(\d{2}):(\d{2}) (\d{2}):(\d{2}):(\d{2})")
+
+
+def exif_block(head: bytes) -> Optional[bytes]:
+    """The TIFF-structured EXIF payload from the first bytes of a JPEG, PNG or WebP file."""
+    if head[:2] == b"\xff\xd8":
+        pos = 2
+        while pos + 4 <= len(head) and head[pos] == 0xFF:
+            marker = head[pos + 1]
+            if marker == 0xFF:  # fill byte
+                pos += 1
+                continue
+            if marker == 0xDA:  # start of scan: pixel data follows, no more metadata
+                break
+            seg_len = int.from_bytes(head[pos + 2:pos + 4], "big")
+            if marker == 0xE1 and head[pos + 4:pos + 10] == b"Exif\x00\x00":
+                return head[pos + 10:pos + 2 + seg_len]
+            pos += 2 + seg_len
+    elif head[:8] == b"\x89PNG\r\n\x1a\n":
+        pos = 8
+        while pos + 8 <= len(head):
+            length = int.from_bytes(head[pos:pos + 4], "big")
+            kind = head[pos + 4:pos + 8]
+            if kind == b"eXIf":
+                return head[pos + 8:pos + 8 + length]
+            if kind == b"IDAT":
+                break
+            pos += 12 + length
+    elif head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        pos = 12
+        while pos + 8 <= len(head):
+            kind = head[pos:pos + 4]
+            length = int.from_bytes(head[pos + 4:pos + 8], "little")
+            if kind == b"EXIF":
+                data = head[pos + 8:pos + 8 + length]
+                return data[6:] if data.startswith(b"Exif\x00\x00") else data
+            pos += 8 + length + (length & 1)
+    return None
+
+
+def exif_capture_time(path: Path) -> Optional[float]:
+    """
+    DateTimeOriginal (or DateTimeDigitized) plus sub-seconds as seconds since
+    the epoch, read from the file header only; None if absent or unreadable.
+    Camera clocks have no zone, so the value is only meaningful for ordering.
+    """
+    io_call("read")
+    try:
+        with open(path, "rb") as f:
+            tiff = exif_block(f.read(EXIF_READ_BYTES))
+        if not tiff or tiff[:2] not in (b"II", b"MM"):
+            return None
+        endian = "<" if tiff[:2] == b"II" else ">"
+
+        def ifd(offset: int) -> Dict[int, Tuple[int, int]]:
+            tags = {}
+            for i in range(struct.unpack_from(endian + "H", tiff, offset)[0]):
+                entry = offset + 2 + 12 * i
+                tag, _, count = struct.unpack_from(endian + "HHI", tiff, entry)
+                tags[tag] = (count, entry + 8)
+            return tags
+
+        def ascii_value(tags: Dict[int, Tuple[int, int]], tag: int) -> str:
+            if tag not in tags:
+                return ""
+            count, at = tags[tag]
+            start = at if count <= 4 else struct.unpack_from(endian + "I", tiff, at)[0]
+            return tiff[start:start + count].split(b"\x00")[0].decode("ascii", "ignore").strip()
+
+        ifd0 = ifd(struct.unpack_from(endian + "I", tiff, 4)[0])
+        if 0x8769 not in ifd0:  # no Exif sub-IFD
+            return None
+        exif = ifd(struct.unpack_from(endian + "I", tiff, ifd0[0x8769][1])[0])
+        for stamp_tag, subsec_tag in ((0x9003, 0x9291), (0x9004, 0x9292)):
+            m = EXIF_DATETIME.match(ascii_value(exif, stamp_tag))
+            if not m or m.group(1) == "0000":
+                continue
+            seconds = calendar.timegm(tuple(int(g) for g in m.groups()) + (0, 0, 0))
+            subsec = ascii_value(exif, subsec_tag)
+            return seconds + (float(f"0.{subsec}") if subsec.isdigit() else 0.0)
+    except (OSError, struct.error, ValueError, OverflowError):
+        return None
+    return None
+
+
+def fraction_index(count: int, frac: float, times: Optional[List[float]] = None) -> int:
+    """Index at frac along a list: by position, or by capture time when ascending times are given."""
+    if times and times[-1] > times[0]:
+        target = times[0] + frac * (times[-1] - times[0])
+        i = bisect.bisect_left(times, target)
+        if i == count or (i > 0 and target - times[i - 1] <= times[i] - target):
+            i -= 1
+        return i
+    return max(0, min(count - 1, int(round(frac * (count - 1)))))
+
+
+# -------- Pick schedules --------
+
+def schedule_indices(count: int, fractions, times: Optional[List[float]] = None, unique: bool = True) -> List[int]:
+    """
+    Index at each fraction along a list of count items, like fraction_index,
+    for a whole schedule at once (vectorized when NumPy is available).
+
+    With unique the indices are distinct whenever there are at least as many
+    items as fractions: in schedule order, a pick that lands on or before the
+    previous one moves just past it, and picks crowding the end move back.
+    Sorting dominates, so hundreds of picks stay cheap.
+    """
+    n = len(fractions)
+    if count <= 0 or n == 0:
+        return []
+    if np is None:
+        idx = [fraction_index(count, f, times) for f in fractions]
+        if unique and 1 < n <= count:
+            order = sorted(range(n), key=lambda k: idx[k])
+            floor = 0
+            for rank, k in enumerate(order):
+                floor = min(max(floor, idx[k] - rank), count - n)
+                idx[k] = floor + rank
+        return idx
+
+    fracs = np.asarray(fractions, dtype=float)
+    if times and times[-1] > times[0]:
+        t = np.asarray(times, dtype=float)
+        target = t[0] + fracs * (t[-1] - t[0])
+        after = np.searchsorted(t, target, side="left")
+        before = np.clip(after - 1, 0, count - 1)
+        nearest_before = (after == count) | ((after > 0) & (target - t[before] <= t[np.clip(after, 0, count - 1)] - target))
+        idx = np.where(nearest_before, before, np.clip(after, 0, count - 1))
     else:
-        shutil.copy2(str(src), str(dst))
+        idx = np.clip(np.rint(fracs * (count - 1)), 0, count - 1).astype(int)
 
+    if unique and 1 < n <= count:
+        order = np.argsort(idx, kind="stable")
+        rank = np.arange(n)
+        floor = np.minimum(np.maximum.accumulate(idx[order] - rank), count - n)
+        idx = np.empty(n, dtype=int)
+        idx[order] = floor + rank
+    return idx.tolist()
 
-# -------- Core logic --------
 
-def curate_project(project_dir: Path, mode: str, max_finals: int, detail_count: int, dry_run: bool) -> Dict:
-    project_name = project_dir.name
-    images_dir = project_dir / "images"
-    process_dir = images_dir / "process"
-    final_dir = images_dir / "final"
+# -------- Image features --------
 
-    process_images = list_images(process_dir)
-    final_images = list_images(final_dir)
-
-    # Apply per-project include/exclude filters if present
-    filters = load_filters()
-    proj_filters = filters.get(project_name) or {}
-    inc_patterns: List[str] = proj_filters.get("include") or []
-    exc_patterns: List[str] = proj_filters.get("exclude") or []
-
-    def apply_filters(files: List[Path]) -> List[Path]:
-        if not files:
-            return files
-        # Exclude first
-        filtered = [p for p in files if not any(pattern_applies_to(p, pat, process_dir, final_dir) for pat in exc_patterns)]
-        # If includes specified, keep only matches
-        if inc_patterns:
-            filtered = [p for p in filtered if any(pattern_applies_to(p, pat, process_dir, final_dir) for pat in inc_patterns)]
-        return filtered
-
-    process_images = apply_filters(process_images)
-    final_images = apply_filters(final_images)
-
-    # Sort process images by trailing numeric to better reflect chronology
-    process_images_sorted = sorted(process_images, key=numeric_key_from_name)
-    final_images_sorted = final_images  # keep natural sort by name
-
-    # Choose representatives
-    # Improved phase picks
-    raw = pick_by_fraction(process_images_sorted, 0.0)
-    rough = pick_by_fraction(process_images_sorted, 0.18)
-    defining = pick_by_fraction(process_images_sorted, 0.45)
-    detailing = pick_by_fraction(process_images_sorted, 0.75)
-
-    # Finished hero shots (spread across the set)
-    hero = spaced_picks(final_images_sorted, max_finals)
-
-    # Detail picks: naive approach, choose from mid/later portion
-    detail1 = pick_by_fraction(final_images_sorted, 0.6)
-    detail2 = pick_by_fraction(final_images_sorted, 0.85)
-    details = []
-    for d in [detail1, detail2]:
-        if d and d not in hero and d not in details:
-            details.append(d)
-    details = details[: max(0, detail_count)]
+def image_features(path: Path) -> Optional[Dict]:
+    """Sharpness, exposure, contrast, colourfulness and a difference hash from one small decode; None if unreadable."""
+    io_call("read")
+    try:
+        with Image.open(path) as im:
+            im.draft("RGB", (FEATURE_SIZE, FEATURE_SIZE))  # JPEG decodes at 1/2..1/8 scale
+            rgb = im.convert("RGB")
+        rgb.thumbnail((FEATURE_SIZE, FEATURE_SIZE))
+        gray = rgb.convert("L")
+        a = np.asarray(gray, dtype=np.float32) / 255.0
+        c = np.asarray(rgb, dtype=np.float32) / 255.0
+        small = np.asarray(gray.resize((9, 8), Image.BILINEAR), dtype=np.int16)
+    except Exception:
+        return None
+    # Variance of the 4-neighbour Laplacian: low for blurry or featureless frames
+    lap = 4 * a[1:-1, 1:-1] - a[:-2, 1:-1] - a[2:, 1:-1] - a[1:-1, :-2] - a[1:-1, 2:]
+    bits = (small[:, 1:] > small[:, :-1]).flatten()
+    dhash = int("".join("1" if b else "0" for b in bits), 2)
+    # Hasler-Suesstrunk colourfulness on the opponent channels
+    rg = c[..., 0] - c[..., 1]
+    yb = 0.5 * (c[..., 0] + c[..., 1]) - c[..., 2]
+    colourfulness = np.hypot(rg.std(), yb.std()) + 0.3 * np.hypot(rg.mean(), yb.mean())
+    return {
+        "sharpness": float(lap.var()) if lap.size else 0.0,
+        "brightness": float(a.mean()),
+        "clipped": float(((a < 0.02) | (a > 0.98)).mean()),
+        "contrast": float(a.std()),
+        "colourfulness": float(colourfulness),
+        "dhash": f"{dhash:016x}",
+    }
 
-    # Output dirs
-    dest_dir = DEST_ROOT / sanitize_name(project_name)
-    best_of_dir = DEST_ROOT / BEST_OF_DIRNAME
 
-    exported: List[Tuple[str, str]] = []  # (label, curated_path)
-    mapping: List[Dict[str, str]] = []    # {label, source, curated}
+class FeatureColumns:
+    """Features of a list of images as arrays; unreadable images are marked invalid."""
 
-    # Export with naming scheme
-    prefix = sanitize_name(project_name)
+    def __init__(self, feats: List[Optional[Dict]]):
+        self.valid = np.array([f is not None for f in feats], dtype=bool)
+
+        def column(key: str, default: float) -> "np.ndarray":
+            return np.array([f[key] if f else default for f in feats], dtype=np.float64)
+
+        self.sharpness = column("sharpness", 0.0)
+        self.contrast = column("contrast", 0.0)
+        self.colourfulness = column("colourfulness", 0.0)
+        self.exposure = (1.0 - np.abs(column("brightness", 0.5) - 0.5) * 2.0) * (1.0 - column("clipped", 1.0))
+        self.hashes = np.array([int(f["dhash"], 16) if f else 0 for f in feats], dtype=np.uint64)
+
+    def robust_z(self, values: "np.ndarray") -> "np.ndarray":
+        """Median/MAD z-score over the valid entries, clipped to +-3, so weights do not depend on scale."""
+        ref = values[self.valid]
+        med = float(np.median(ref)) if ref.size else 0.0
+        mad = float(np.median(np.abs(ref - med))) if ref.size else 0.0
+        return np.clip((values - med) / (1.4826 * mad + 1e-6), -3.0, 3.0)
+
+    def quality(self) -> "np.ndarray":
+        """Technical quality: sharpness (z of log Laplacian variance) plus exposure; -inf if unreadable."""
+        blur_z = self.robust_z(np.log(self.sharpness + 1e-6))
+        return np.where(self.valid, blur_z + EXPOSURE_WEIGHT * self.exposure, -np.inf)
+
+    def appeal(self) -> "np.ndarray":
+        """Quality plus a cheap aesthetic term from contrast and colourfulness."""
+        aesthetic = (self.robust_z(self.contrast) + self.robust_z(self.colourfulness)) / 2.0
+        return self.quality() + AESTHETIC_WEIGHT * aesthetic
+
+
+class FeatureStore(ImageCache):
+    """
+    Per-image selection features (see image_features), cached in FEATURES_PATH.
+
+    With clip=True, CLIP image embeddings are added through the animal
+    sorter's classifier and cached by content hash in CLIP_CACHE_PATH.
+    Given a ThumbnailStore, both read the shared thumbnails instead of
+    decoding originals.
+    """
 
-    # Cleanup any previous curated files for this project to avoid stale/wrong leftovers
-    def cleanup_previous():
+    VERSION = 3
+
+    def __init__(self, path: Optional[Path] = FEATURES_PATH, load: bool = True, clip: bool = False,
+                 thumbnails: Optional[ThumbnailStore] = None):
+        super().__init__(path, self._compute, load)
+        self.thumbnails = thumbnails
+        self.clip = clip
+        self._classifier = None
+        self._clip_lock = threading.Lock()
+
+    def _compute(self, path: Path) -> Optional[Dict]:
+        thumb = self.thumbnails.path(path) if self.thumbnails is not None else None
+        return image_features(thumb or path)
+
+    def features(self, entries: List[FileEntry]) -> List[Optional[Dict]]:
+        """Features for each entry, in order; unreadable images give None."""
+        return self.values(entries)
+
+    def embeddings(self, paths: List[Path]) -> Optional["np.ndarray"]:
+        """Normalized CLIP embeddings (rows of NaN for unreadable images), or None without CLIP."""
+        if not self.clip or not paths:
+            return None
+        # One model for the whole run; inference is serialized across project threads
+        with self._clip_lock:
+            if self._classifier is None:
+                import logging
+                from animal_photo_sorter import AnimalClassifier, EmbeddingCache, CLIP_MODEL_NAME
+                logger = logging.getLogger("project_photo_curator")
+                cache = EmbeddingCache(str(CLIP_CACHE_PATH), CLIP_MODEL_NAME, logger)
+                self._classifier = AnimalClassifier(logger, embedding_cache=cache, thumbnails=self.thumbnails)
+            io_call("read", len(paths))  # hashed for the embedding cache, decoded if not cached
+            embedded = self._classifier.embed_batch([str(p) for p in paths])
+        if not embedded:
+            return None
+        dim = next(iter(embedded.values())).shape[-1]
+        out = np.full((len(paths), dim), np.nan, dtype=np.float32)
+        for i, vec in embedded.items():
+            out[i] = vec.float().cpu().numpy()
+        return out
+
+    def save(self) -> None:
+        if self._classifier is not None and self._classifier.embedding_cache is not None:
+            self._classifier.embedding_cache.save()
+        super().save()
+
+
+# -------- Content-aware selection --------
+
+def hamming(a: "np.ndarray", b) -> "np.ndarray":
+    """Bit distance between an array of 64-bit hashes and another array or a single hash."""
+    xor = np.bitwise_xor(a, b).astype(">u8").view(np.uint8).reshape(-1, 8)
+    return np.unpackbits(xor, axis=1).sum(axis=1)
+
+
+class ContentSelector:
+    """
+    Picks representatives from one ordered image list (a timeline for process
+    shots, name order for finals) using cached features instead of fixed
+    positions alone.
+
+    The list is split into contiguous clusters at the biggest visual changes
+    between neighbouring frames (CLIP distance when available, else dHash bit
+    distance). Each pick is the best frame of its cluster: sharp, well exposed,
+    near the nominal position, and not a near-duplicate of a frame already picked.
+    """
+
+    def __init__(self, items: List[Path], feats: List[Optional[Dict]], embeddings: Optional["np.ndarray"] = None,
+                 times: Optional[List[float]] = None):
+        self.items = items
+        self.times = times
+        n = len(items)
+        columns = FeatureColumns(feats)
+        self.valid = columns.valid
+        self.hashes = columns.hashes
+        # Sharpness is judged relative to the rest of this list
+        self.quality = columns.quality()
+
+        # change[i]: visual distance between frame i and i + 1
+        if n < 2:
+            self.change = np.zeros(0)
+        elif embeddings is not None and not np.isnan(embeddings).all():
+            emb = np.nan_to_num(embeddings)
+            self.change = 1.0 - np.sum(emb[:-1] * emb[1:], axis=1)
+        else:
+            self.change = hamming(self.hashes[:-1], self.hashes[1:]) / 64.0
+        if n >= 2:
+            self.change = np.where(self.valid[:-1] & self.valid[1:], self.change, 0.0)
+
+    @classmethod
+    def build(cls, store: FeatureStore, entries: List[FileEntry],
+              times: Optional[List[float]] = None) -> Optional["ContentSelector"]:
+        """Selector for entries, or None when too few images are readable to beat position picks."""
+        feats = store.features(entries)
+        if sum(f is not None for f in feats) < 2:
+            return None
+        return cls([e.path for e in entries], feats, store.embeddings([e.path for e in entries]), times)
+
+    def _best(self, start: int, end: int, target: int, taken: List[int]) -> Optional[int]:
+        """Best frame in [start, end) not yet taken, avoiding near-duplicates of taken frames if possible."""
+        idx = np.arange(start, end)
+        score = self.quality[start:end] - TARGET_WEIGHT * np.abs(idx - target) / max(1, end - start)
+        free = ~np.isin(idx, taken)
+        if not free.any():
+            return None
+        distinct = free.copy()
+        picked = [t for t in taken if self.valid[t]]
+        if picked:
+            nearest = np.min([hamming(self.hashes[start:end], self.hashes[t]) for t in picked], axis=0)
+            distinct &= ~(self.valid[start:end] & (nearest <= DUPLICATE_BITS))
+        mask = distinct if distinct.any() else free
+        masked = np.where(mask, score, -np.inf)
+        if np.isneginf(masked).all():
+            # Nothing readable left: fall back to the free frame nearest the target
+            return int(idx[mask][np.argmin(np.abs(idx[mask] - target))])
+        return int(idx[int(np.argmax(masked))])
+
+    def phase_picks(self, fractions: List[float], exclude: List[Path] = (), allow_repeat: bool = True) -> List[Optional[Path]]:
+        """
+        One pick per fraction. Each fraction's cluster runs from the largest
+        visual change before its nominal position to the largest one after it.
+        """
+        n = len(self.items)
+        targets = schedule_indices(n, fractions, self.times)
+        anchors = sorted(set(targets))
+        cuts = [a + 1 + int(np.argmax(self.change[a:b])) for a, b in zip(anchors, anchors[1:])]
+        bounds = [0] + cuts + [n]
+        segment = {a: (bounds[k], bounds[k + 1]) for k, a in enumerate(anchors)}
+
+        taken = [i for i, p in enumerate(self.items) if p in exclude]
+        out: List[Optional[Path]] = []
+        for t in targets:
+            pick = self._best(*segment[t], t, taken)
+            if pick is None and allow_repeat:
+                pick = t  # fewer frames than phases: repeat, as position picks do
+            if pick is not None:
+                taken.append(pick)
+            out.append(self.items[pick] if pick is not None else None)
+        return out
+
+    def spread_picks(self, count: int) -> List[Path]:
+        """Up to count picks, one per cluster after cutting at the count - 1 largest changes."""
+        n = len(self.items)
+        if count <= 0:
+            return []
+        if count >= n:
+            return self.items.copy()
+        cuts = sorted(int(c) + 1 for c in np.argsort(-self.change, kind="stable")[:count - 1])
+        bounds = [0] + cuts + [n]
+        taken: List[int] = []
+        for start, end in zip(bounds, bounds[1:]):
+            pick = self._best(start, end, (start + end - 1) // 2, taken)
+            if pick is not None:
+                taken.append(pick)
+        return [self.items[i] for i in sorted(taken)]
+
+
+# -------- Web derivatives --------
+
+def codec_available(fmt: str) -> bool:
+    try:
+        from PIL import features as pil_features
+        return bool(pil_features.check(fmt))
+    except Exception:
+        return False
+
+
+def render_derivatives(src: str, out_base: str, widths: List[int],
+                       formats: Dict[str, Dict]) -> Optional[List[Tuple[int, str, str]]]:
+    """
+    Decode src once (JPEG draft mode at the largest width needed) and write
+    every width x format rendition as <out_base>-<width>w.<format>. Widths are
+    capped at the source width, so nothing is upscaled. Runs in a worker process.
+
+    Returns None if src is not a decodable image; any other failure (reading,
+    writing, memory) is raised.
+    """
+    largest = max(widths)
+    try:
+        with Image.open(src) as im:
+            im.draft("RGB", (largest, largest))
+            im = ImageOps.exif_transpose(im)
+            im = im.convert("RGBA" if "A" in im.getbands() else "RGB")
+    except UNDECODABLE_ERRORS:
+        return None
+    os.makedirs(os.path.dirname(out_base), exist_ok=True)
+    out: List[Tuple[int, str, str]] = []
+    for width in sorted({min(w, im.width) for w in widths}, reverse=True):
+        height = max(1, round(im.height * width / im.width))
+        frame = im if width == im.width else im.resize((width, height), Image.LANCZOS, reducing_gap=3.0)
+        for fmt, options in formats.items():
+            path = f"{out_base}-{width}w.{fmt}"
+            tmp = f"{path}.tmp"
+            frame.save(tmp, format=fmt.upper(), **options)
+            os.replace(tmp, path)
+            out.append((width, fmt, path))
+    return out
+
+
+class DerivativeStage:
+    """
+    Responsive WEBP/AVIF renditions of curated picks for the web.
+
+    Renditions are rendered in a process pool into a content-addressed store
+    (DERIVATIVES_DIR, keyed by source SHA-1 plus a hash of the recipe) and
+    hard-linked into a web/ folder next to the curated files. With the shared
+    digest cache an unchanged pick costs a stat and a lookup; only missing
+    renditions are ever rendered.
+    """
+
+    VERSION = 1
+
+    def __init__(self, digests: ContentDigests, cache_dir: Path = DERIVATIVES_DIR, load: bool = True,
+                 workers: Optional[int] = None):
+        self.cache_dir = cache_dir
+        self.formats = {fmt: opts for fmt, opts in DERIVATIVE_FORMATS.items() if codec_available(fmt)}
+        self.recipe = hashlib.sha1(json.dumps([self.VERSION, DERIVATIVE_WIDTHS, self.formats],
+                                              sort_keys=True).encode("utf-8")).hexdigest()[:12]
+        self.digests = digests
+        self.index_path = cache_dir / "index.json"
+        self._index: Dict[str, List] = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Future] = {}
+        self._workers = workers
+        self._pool: Optional[ProcessPoolExecutor] = None
+        if load and self.index_path.exists():
+            try:
+                with open(self.index_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if isinstance(data, dict):
+                    self._index = data
+            except Exception:
+                self._index = {}
+
+    def renditions(self, sources: List[Path]) -> List[List[Tuple[int, str, Path]]]:
+        """(width, format, cached file) for each source; empty for sources that cannot be decoded."""
+        keys = [f"{d}-{self.recipe}" if d else None for d in self.digests.of(sources)]
+
+        waits: Dict[str, Future] = {}
+        names: Dict[str, str] = {}
+        with self._lock:
+            for src, key in zip(sources, keys):
+                if key is None or key in waits:
+                    continue
+                names[key] = src.name
+                cached = self._index.get(key)
+                if cached is not None and all((self.cache_dir / rel).exists() for _, _, rel in cached):
+                    continue
+                # Another project thread may already be rendering the same source
+                if key not in self._pending:
+                    if self._pool is None:
+                        self._pool = ProcessPoolExecutor(max_workers=self._workers,
+                                                         mp_context=multiprocessing.get_context("spawn"))
+                    self._pending[key] = self._pool.submit(render_derivatives, str(src), str(self.cache_dir / key[:2] / key),
+                                                           list(DERIVATIVE_WIDTHS), self.formats)
+                waits[key] = self._pending[key]
+        for key, future in waits.items():
+            try:
+                result = future.result()
+            except Exception as e:
+                # Disk full, a dead worker, ...: nothing is remembered, so the next run retries
+                print(f"Could not render web renditions of {names[key]} ({e!r}); skipping them this run")
+                with self._lock:
+                    self._pending.pop(key, None)
+                    if isinstance(e, BrokenProcessPool) and self._pool is not None:
+                        # Later calls start a fresh pool instead of failing on submit
+                        self._pool.shutdown(wait=False)
+                        self._pool = None
+                continue
+            # An undecodable (or placeholder) source is remembered with no renditions and not retried
+            rendered = [[w, fmt, os.path.relpath(path, self.cache_dir)] for w, fmt, path in result or []]
+            # The worker read the source once and wrote and renamed each rendition
+            io_call("read")
+            io_call("write", len(rendered))
+            io_call("rename", len(rendered))
+            with self._lock:
+                self._index[key] = rendered
+                self._pending.pop(key, None)
+                self._dirty = True
+
+        with self._lock:
+            return [[(w, fmt, self.cache_dir / rel) for w, fmt, rel in self._index.get(key) or []] if key else []
+                    for key in keys]
+
+    def export(self, folder: Path, stale_glob: str, planned: List[Tuple[Path, Path]], dry_run: bool) -> Tuple[List[str], Dict[str, int]]:
+        """Link the renditions of each (source, curated file) pair into folder/web; returns the web files and changes."""
+        web_dir = folder / DERIVATIVES_DIRNAME
+        web_planned: List[Tuple[Path, Path]] = []
+        if not dry_run:
+            for (_, curated), files in zip(planned, self.renditions([src for src, _ in planned])):
+                for width, fmt, cached in files:
+                    web_planned.append((cached, web_dir / f"{curated.stem}-{width}w.{fmt}"))
+        if not web_planned and not web_dir.exists():
+            return [], dict.fromkeys(EXPORT_CHANGES, 0)
+        changes = export_files(web_dir, stale_glob, web_planned, "link", dry_run, self.digests)
+        return [str(dst) for _, dst in web_planned], changes
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
         try:
-            if dest_dir.exists():
-                for f in dest_dir.glob(f"{prefix}_*.*"):
-                    if f.is_file() and not dry_run:
+            with self._lock:
+                data = dict(self._index)
+            write_json_atomic(self.index_path, data)
+            self._dirty = False
+        except Exception:
+            pass
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+
+# -------- Placeholders --------
+
+def image_placeholder(path: Path) -> Optional[Dict]:
+    """Display size, dominant colour and a tiny LQIP data URI for an image; None if unreadable."""
+    io_call("read")
+    try:
+        with Image.open(path) as im:
+            width, height = im.size
+            if im.getexif().get(0x0112) in (5, 6, 7, 8):  # EXIF orientation turns it on its side
+                width, height = height, width
+            im.draft("RGB", (LQIP_SIZE * 4, LQIP_SIZE * 4))
+            small = ImageOps.exif_transpose(im).convert("RGB")
+        small.thumbnail((LQIP_SIZE, LQIP_SIZE), Image.LANCZOS)
+        palette = small.quantize(colors=5)
+        _, dominant = max(palette.getcolors())
+        r, g, b = palette.getpalette()[dominant * 3:dominant * 3 + 3]
+        fmt = "webp" if codec_available("webp") else "jpeg"
+        buf = io.BytesIO()
+        small.save(buf, format=fmt.upper(), quality=LQIP_QUALITY)
+    except Exception:
+        return None
+    return {
+        "width": width,
+        "height": height,
+        "color": f"#{r:02x}{g:02x}{b:02x}",
+        "lqip": f"data:image/{fmt};base64,{base64.b64encode(buf.getvalue()).decode('ascii')}",
+    }
+
+
+class PlaceholderStore:
+    """
+    Layout and placeholder data for curated images (see image_placeholder),
+    computed in one batched pass per list and cached in PLACEHOLDERS_PATH by
+    content hash, so copies and renames of a photo are never decoded again.
+    """
+
+    def __init__(self, digests: ContentDigests, path: Optional[Path] = PLACEHOLDERS_PATH, load: bool = True):
+        self.digests = digests
+        self.path = path
+        self._entries: Dict[str, Optional[Dict]] = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._pool: Optional[ThreadPoolExecutor] = None
+        if load and path and path.exists():
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if isinstance(data, dict):
+                    self._entries = data
+            except Exception:
+                self._entries = {}
+
+    def lookup(self, sources: List[Path]) -> List[Optional[Dict]]:
+        keys = self.digests.of(sources)
+        with self._lock:
+            missing = {k: src for k, src in zip(keys, sources) if k and k not in self._entries}
+            if missing and self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=os.cpu_count() or 4)
+        if missing:
+            computed = list(self._pool.map(image_placeholder, missing.values()))
+            with self._lock:
+                self._entries.update(zip(missing.keys(), computed))
+                self._dirty = True
+        with self._lock:
+            return [self._entries.get(k) if k else None for k in keys]
+
+    def annotate(self, rows: List[Dict]) -> List[Dict]:
+        """Add width/height/color/lqip to mapping rows whose source can be read."""
+        for row, info in zip(rows, self.lookup([Path(r["source"]) for r in rows])):
+            if info:
+                row.update(info)
+        return rows
+
+    def save(self) -> None:
+        if not self.path or not self._dirty:
+            return
+        try:
+            with self._lock:
+                data = dict(self._entries)
+            write_json_atomic(self.path, data)
+            self._dirty = False
+        except Exception:
+            pass
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+
+# -------- Contact sheets and timelapses --------
+
+def letterbox(thumb: Optional[Path], size: Tuple[int, int]) -> "Image.Image":
+    """thumb scaled to fit size and centred on a dark background (blank if missing or unreadable)."""
+    frame = Image.new("RGB", size, TIMELAPSE_BACKGROUND)
+    if thumb is None:
+        return frame
+    io_call("read")
+    try:
+        with Image.open(thumb) as im:
+            im = im.convert("RGB")
+        im.thumbnail(size, Image.LANCZOS)
+        frame.paste(im, ((size[0] - im.width) // 2, (size[1] - im.height) // 2))
+    except Exception:
+        pass
+    return frame
+
+
+class TimelapseStage:
+    """
+    Contact sheet (and optionally an animated WEBP and/or MP4 timelapse) of
+    each project's process shots in curated order, written to a timelapse/
+    folder beside the curated files.
+
+    Frames flow through a bounded pipeline: thumbnails (from the shared
+    ThumbnailStore) are decoded and letterboxed by a small thread pool with at most
+    TIMELAPSE_WINDOW frames in flight, and handed to the encoders in order.
+    Long projects are sampled down to CONTACT_SHEET_MAX tiles and the frame
+    budget, so memory does not grow with the number of shots. MP4 frames are
+    piped to ffmpeg; animated WEBP goes through Pillow, which holds the
+    (frame-budget-limited) frames until it encodes them, so only one project
+    at a time builds a WEBP timelapse, however many are curated concurrently.
+    """
+
+    VERSION = 1
+
+    def __init__(self, thumbnails: ThumbnailStore, digests: ContentDigests, formats: List[str],
+                 frames: int = TIMELAPSE_FRAMES):
+        self.thumbnails = thumbnails
+        self.digests = digests
+        self.ffmpeg = shutil.which("ffmpeg")
+        if "mp4" in formats and not self.ffmpeg:
+            print("MP4 timelapses need ffmpeg on PATH; skipping them")
+        self.formats = [fmt for fmt in formats if fmt != "mp4" or self.ffmpeg]
+        self.frames = max(2, frames)
+        self.recipe = {"version": self.VERSION, "formats": self.formats, "frames": self.frames,
+                       "size": list(TIMELAPSE_SIZE), "sheet": [CONTACT_SHEET_COLUMNS, CONTACT_SHEET_TILE, CONTACT_SHEET_MAX]}
+        self._pool = ThreadPoolExecutor(max_workers=min(TIMELAPSE_WINDOW, os.cpu_count() or 4))
+        # Up to frames x 640x480 RGB (~110 MB at the default budget) are buffered per WEBP
+        self._webp_slot = threading.Semaphore(1)
+
+    def _sample(self, entries: List[FileEntry], times: Optional[List[float]], limit: int) -> List[FileEntry]:
+        if len(entries) <= limit:
+            return entries
+        return [entries[i] for i in schedule_indices(len(entries), [k / (limit - 1) for k in range(limit)], times)]
+
+    def _readable(self, entries: List[FileEntry], times: Optional[List[float]], limit: int) -> List[Path]:
+        """Thumbnails of up to limit entries spread along the (time) line, skipping undecodable ones."""
+        sample = self._sample(entries, times, limit)
+        thumbs = self.thumbnails.paths([e.path for e in sample], self.digests.values(sample))
+        return [t for t in thumbs if t is not None]
+
+    def _stream(self, thumbs: List[Path], size: Tuple[int, int]):
+        """Letterboxed frames of thumbs in order, with at most TIMELAPSE_WINDOW being prepared at once."""
+        pending: List[Future] = []
+        for thumb in thumbs:
+            if len(pending) >= TIMELAPSE_WINDOW:
+                yield pending.pop(0).result()
+            pending.append(self._pool.submit(letterbox, thumb, size))
+        for future in pending:
+            yield future.result()
+
+    def _contact_sheet(self, tiles: List[Path], out: Path) -> None:
+        tile = (CONTACT_SHEET_TILE, CONTACT_SHEET_TILE * 3 // 4)
+        columns = min(CONTACT_SHEET_COLUMNS, len(tiles))
+        rows = -(-len(tiles) // columns)
+        gap = CONTACT_SHEET_GAP
+        sheet = Image.new("RGB", (columns * (tile[0] + gap) + gap, rows * (tile[1] + gap) + gap), TIMELAPSE_BACKGROUND)
+        for k, frame in enumerate(self._stream(tiles, tile)):
+            row, col = divmod(k, columns)
+            sheet.paste(frame, (gap + col * (tile[0] + gap), gap + row * (tile[1] + gap)))
+        tmp = out.with_name(f".{out.name}.tmp")
+        io_call("write")
+        sheet.save(tmp, format="JPEG", quality=CONTACT_SHEET_QUALITY)
+        io_call("rename")
+        os.replace(tmp, out)
+
+    def _timelapse(self, frames: List[Path], outs: Dict[str, Path]) -> List[Path]:
+        width, height = TIMELAPSE_SIZE
+        encoder = None
+        broken: Optional[OSError] = None
+        tmp_mp4 = outs["mp4"].with_name(f".{outs['mp4'].name}.tmp.mp4") if "mp4" in outs else None
+        # A file rather than a pipe, so a chatty ffmpeg can never block on stderr while we write frames
+        errors = tempfile.TemporaryFile() if tmp_mp4 is not None else None
+        if tmp_mp4 is not None:
+            encoder = subprocess.Popen(
+                [self.ffmpeg, "-y", "-loglevel", "error", "-f", "rawvideo", "-pix_fmt", "rgb24",
+                 "-s", f"{width}x{height}", "-r", str(TIMELAPSE_FPS), "-i", "-",
+                 "-c:v", "libx264", "-pix_fmt", "yuv420p", "-movflags", "+faststart", str(tmp_mp4)],
+                stdin=subprocess.PIPE, stderr=errors)
+        webp_frames: List["Image.Image"] = []
+        written: List[Path] = []
+        # Only one project buffers WEBP frames at a time (see _webp_slot)
+        with self._webp_slot if "webp" in outs else nullcontext():
+            try:
+                for frame in self._stream(frames, TIMELAPSE_SIZE):
+                    if encoder is not None and broken is None:
                         try:
-                            f.unlink()
-                        except Exception:
-                            pass
-            # Best Of cleanup
-            ensure_dir(best_of_dir)
-            for f in best_of_dir.glob(f"{prefix}_Best_*.*"):
-                if f.is_file() and not dry_run:
+                            encoder.stdin.write(frame.tobytes())
+                        except OSError as e:
+                            # ffmpeg exited early (missing encoder, bad argument, full disk): only the MP4 is lost
+                            broken = e
+                    if "webp" in outs:
+                        webp_frames.append(frame)
+            finally:
+                if encoder is not None:
                     try:
-                        f.unlink()
-                    except Exception:
-                        pass
+                        encoder.stdin.close()
+                    except OSError as e:
+                        broken = broken or e
+                    encoder.wait()
+                    io_call("write")  # ffmpeg's
+                    if broken is None and encoder.returncode == 0:
+                        io_call("rename")
+                        os.replace(tmp_mp4, outs["mp4"])
+                        written.append(outs["mp4"])
+                    else:
+                        errors.seek(0)
+                        message = errors.read().decode("utf-8", "replace").strip()
+                        reason = message or broken or f"exit code {encoder.returncode}"
+                        print(f"ffmpeg failed for {outs['mp4'].name} ({reason}); skipping the MP4")
+                        try:
+                            tmp_mp4.unlink()
+                        except OSError:
+                            pass
+                if errors is not None:
+                    errors.close()
+            if webp_frames:
+                out = outs["webp"]
+                tmp = out.with_name(f".{out.name}.tmp")
+                io_call("write")
+                webp_frames[0].save(tmp, format="WEBP", save_all=True, append_images=webp_frames[1:],
+                                    duration=round(1000 / TIMELAPSE_FPS), loop=0, quality=TIMELAPSE_QUALITY, method=4)
+                io_call("rename")
+                os.replace(tmp, out)
+                written.append(out)
+                webp_frames.clear()
+        return written
+
+    def export(self, folder: Path, prefix: str, entries: List[FileEntry], times: Optional[List[float]],
+               dry_run: bool) -> List[str]:
+        """Write the sheet/timelapses for entries (process shots in order) to folder/timelapse; returns their paths."""
+        out_dir = folder / TIMELAPSE_DIRNAME
+        if dry_run:
+            return []
+        tiles = self._readable(entries, times, CONTACT_SHEET_MAX)
+        if len(tiles) < 2:
+            return []
+        ensure_dir(out_dir)
+        sheet = out_dir / f"{prefix}_contact_sheet.jpg"
+        written = [sheet]
+        self._contact_sheet(tiles, sheet)
+        outs = {fmt: out_dir / f"{prefix}_timelapse.{fmt}" for fmt in self.formats}
+        if outs:
+            written += self._timelapse(self._readable(entries, times, self.frames), outs)
+        for stale in out_dir.glob(f"{prefix}_*.*"):
+            if stale not in written:
+                io_call("unlink")
+                stale.unlink()
+        return [str(p) for p in written]
+
+    def close(self) -> None:
+        self._pool.shutdown()
+
+
+# -------- Curation manifest --------
+
+class CurationManifest:
+    """
+    Every curated folder, pick and output file in one SQLite database
+    (MANIFEST_PATH), so tools can query the whole curated set in one read
+    instead of walking curated_output and parsing each _mapping.json.
+
+    A folder's rows are replaced in one transaction whenever it is
+    (re)curated; folders that are skipped as unchanged keep theirs.
+    File paths in the files table are relative to DEST_ROOT.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS folders (
+            name TEXT PRIMARY KEY,        -- curated folder under DEST_ROOT
+            kind TEXT NOT NULL,           -- project | extraction | bestof
+            updated REAL NOT NULL,
+            counts TEXT                   -- JSON
+        );
+        CREATE TABLE IF NOT EXISTS items (
+            folder TEXT NOT NULL,
+            seq INTEGER NOT NULL,
+            label TEXT NOT NULL,
+            origin TEXT,                  -- source project of best-of picks
+            source TEXT NOT NULL,
+            curated TEXT NOT NULL,
+            width INTEGER,
+            height INTEGER,
+            color TEXT,
+            lqip TEXT,
+            score REAL,
+            PRIMARY KEY (folder, seq)
+        );
+        CREATE INDEX IF NOT EXISTS items_by_source ON items (source);
+        CREATE TABLE IF NOT EXISTS files (
+            folder TEXT NOT NULL,
+            path TEXT NOT NULL,
+            PRIMARY KEY (folder, path)
+        );
+    """
+
+    def __init__(self, path: Path = MANIFEST_PATH):
+        ensure_dir(path.parent)
+        self.path = path
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._db:
+            self._db.executescript(self.SCHEMA)
+
+    def has(self, folder: str) -> bool:
+        with self._lock:
+            return self._db.execute("SELECT 1 FROM folders WHERE name = ?", (folder,)).fetchone() is not None
+
+    def update(self, folder: str, kind: str, rows: List[Dict], files: List[str], counts: Optional[Dict] = None) -> None:
+        """Replace everything recorded for folder with rows (mapping-style dicts) and output files."""
+        items = [(folder, seq, r["label"], r.get("project"), r["source"], r["curated"], r.get("width"),
+                  r.get("height"), r.get("color"), r.get("lqip"), r.get("score"))
+                 for seq, r in enumerate(rows, start=1)]
+        paths = sorted({Path(os.path.relpath(f, DEST_ROOT)).as_posix() for f in files})
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM items WHERE folder = ?", (folder,))
+            self._db.execute("DELETE FROM files WHERE folder = ?", (folder,))
+            self._db.execute("INSERT OR REPLACE INTO folders VALUES (?, ?, ?, ?)",
+                             (folder, kind, time.time(), json.dumps(counts or {})))
+            self._db.executemany("INSERT INTO items VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", items)
+            self._db.executemany("INSERT INTO files VALUES (?, ?)", [(folder, p) for p in paths])
+
+    def set_scores(self, scores: Dict[str, float]) -> None:
+        """Attach best-of ranking scores to every item with a scored source."""
+        with self._lock, self._db:
+            self._db.execute("UPDATE items SET score = NULL WHERE score IS NOT NULL")
+            self._db.executemany("UPDATE items SET score = ? WHERE source = ?", [(v, k) for k, v in scores.items()])
+
+    def retain(self, kind: str, folders: List[str]) -> None:
+        """Forget folders of this kind that are no longer produced."""
+        with self._lock, self._db:
+            stale = [name for (name,) in self._db.execute("SELECT name FROM folders WHERE kind = ?", (kind,))
+                     if name not in set(folders)]
+            for name in stale:
+                for table, column in (("folders", "name"), ("items", "folder"), ("files", "folder")):
+                    self._db.execute(f"DELETE FROM {table} WHERE {column} = ?", (name,))
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+# -------- Portfolio best-of --------
+
+def rank_best_of(candidates: Dict[str, List[FileEntry]], features: FeatureStore, count: int,
+                 per_project: int = BESTOF_PER_PROJECT) -> Tuple[Dict[str, List[Path]], Dict[str, float]]:
+    """
+    Score every candidate of the portfolio in one batched pass and take the
+    top count, at most per_project from any project, skipping near-duplicates
+    of earlier picks (CLIP distance when available, else dHash distance).
+
+    Returns the picks per project in rank order and the score of every
+    readable candidate keyed by source path.
+    """
+    owners = [name for name, entries in candidates.items() for _ in entries]
+    entries = [e for project_entries in candidates.values() for e in project_entries]
+    picks: Dict[str, List[Path]] = {}
+    if not entries:
+        return picks, {}
+    columns = FeatureColumns(features.features(entries))
+    score = columns.appeal()
+    scores = {str(e.path): round(float(score[i]), 4) for i, e in enumerate(entries) if columns.valid[i]}
+    embeddings = features.embeddings([e.path for e in entries])
+    if embeddings is not None:
+        has_embedding = ~np.isnan(embeddings).any(axis=1)
+        embeddings = np.nan_to_num(embeddings)
+
+    alive = columns.valid.copy()
+    taken = 0
+    for i in np.argsort(-score, kind="stable"):
+        if taken >= count:
+            break
+        if not alive[i]:
+            continue
+        owned = picks.setdefault(owners[i], [])
+        if len(owned) >= per_project:
+            continue
+        owned.append(entries[i].path)
+        taken += 1
+        # Drop everything that looks like this pick from the remaining candidates
+        if embeddings is not None and has_embedding[i]:
+            alive &= ~((1.0 - embeddings @ embeddings[i] <= BESTOF_DUPLICATE_DISTANCE) & has_embedding)
+        alive &= ~(hamming(columns.hashes, columns.hashes[i]) <= DUPLICATE_BITS)
+    return {name: paths for name, paths in picks.items() if paths}, scores
+
+
+def curated_copies(dest_dir: Path) -> Dict[Path, Path]:
+    """Source -> curated file for each pick in a project folder's _mapping.json ({} without one)."""
+    try:
+        with open(dest_dir / "_mapping.json", "r", encoding="utf-8") as f:
+            return {Path(row["source"]): Path(row["curated"]) for row in json.load(f)}
+    except Exception:
+        return {}
+
+
+def curate_best_of(projects: List[Path], config: CuratorConfig, index: DirectoryIndex,
+                   features: Optional[FeatureStore], max_finals: int, count: Optional[int],
+                   mode: str, dry_run: bool, derivatives: Optional[DerivativeStage] = None,
+                   placeholders: Optional[PlaceholderStore] = None,
+                   catalog: Optional[CurationManifest] = None,
+                   digests: Optional[ContentDigests] = None) -> Dict:
+    """
+    Fill the shared best-of folder from all projects at once. Finals are ranked
+    across the portfolio when features are available; a project none of whose
+    finals can be read keeps the old picks (last and first hero shot).
+    Picks and all candidate scores are written to BESTOF_SCORES_NAME.
+
+    A pick its project already exported is copied (or linked) from that
+    curated file rather than from the original, which --mode move has
+    moved away by now; best-of files are never moved.
+    """
+    best_of_dir = DEST_ROOT / BEST_OF_DIRNAME
+    candidates: Dict[str, List[FileEntry]] = {}
+    for proj in projects:
+        entries = [e for e in index.entries(proj / "images" / "final") if e.suffix in SUPPORTED_EXTS]
+        kept = set(config.for_project(proj.name).apply_filters("final", [e.path for e in entries]))
+        candidates[proj.name] = [e for e in entries if e.path in kept]
+
+    if count is None:
+        count = BESTOF_PER_PROJECT * len(projects)
+    picks, scores = rank_best_of(candidates, features, count) if features is not None else ({}, {})
+
+    planned: List[Tuple[Path, Path]] = []
+    rows: List[Dict] = []
+    for proj in projects:
+        finals = [e.path for e in candidates[proj.name]]
+        if any(str(p) in scores for p in finals):
+            best_picks = picks.get(proj.name, [])
+        else:
+            hero = spaced_picks(finals, max_finals)
+            best_picks = ([hero[-1]] + ([hero[0]] if len(hero) > 2 else [])) if hero else []
+        proj_config = config.for_project(proj.name)
+        listings = {scope: index.files(proj / "images" / scope) for scope in SCOPES}
+        prefix = sanitize_name(proj.name)
+        curated = curated_copies(DEST_ROOT / prefix)
+        for i, bp in enumerate(best_picks, start=1):
+            # Allow override of best-of picks too
+            src = proj_config.resolve_override(f"Best_{i}", listings) or bp
+            out_path = best_of_dir / f"{prefix}_Best_{i}{src.suffix.lower()}"
+            copy = curated.get(src)
+            io_call("stat")
+            planned.append((copy if copy is not None and copy.is_file() else src, out_path))
+            rows.append({"project": proj.name, "label": f"Best_{i}", "source": str(src),
+                         "curated": str(out_path), "score": scores.get(str(src))})
+
+    changes = export_files(best_of_dir, "*_Best_*.*", planned, "copy" if mode == "move" else mode, dry_run, digests)
+    if placeholders is not None:
+        placeholders.annotate(rows)
+    web: List[str] = []
+    if derivatives is not None:
+        web, web_changes = derivatives.export(best_of_dir, "*_Best_*.*", planned, dry_run)
+        for key, n in web_changes.items():
+            changes[key] += n
+    if not dry_run:
+        try:
+            write_json_atomic(best_of_dir / BESTOF_SCORES_NAME, {"picks": rows, "scores": scores}, indent=2)
         except Exception:
             pass
+        if catalog is not None:
+            catalog.update(BEST_OF_DIRNAME, "bestof", rows,
+                           [dst for _, dst in planned] + web + [best_of_dir / BESTOF_SCORES_NAME],
+                           {"bestof": len(rows), "web": len(web)})
+            catalog.set_scores(scores)
+    return {"picks": rows, "web": web, "changes": changes}
+
 
-    cleanup_previous()
-    seq = 1
+# -------- Extractions --------
 
-    def export_pick(p: Optional[Path], label: str):
-        nonlocal seq
-        if not p:
+def iter_json_object(path: Path, chunk_size: int = 64 * 1024):
+    """
+    Yield the (key, value) pairs of a top-level JSON object while reading the
+    file in chunks, so only the value being parsed is held in memory.
+    Raises ValueError on malformed input (after yielding what came before it).
+    """
+    decoder = json.JSONDecoder()
+    with open(path, "r", encoding="utf-8") as f:
+        buf, pos, eof = "", 0, False
+
+        def more() -> bool:
+            nonlocal buf, pos, eof
+            chunk = f.read(chunk_size)
+            if not chunk:
+                eof = True
+                return False
+            buf, pos = buf[pos:] + chunk, 0
+            return True
+
+        def peek() -> str:
+            nonlocal pos
+            while True:
+                while pos < len(buf) and buf[pos] in " \t\r\n":
+                    pos += 1
+                if pos < len(buf):
+                    return buf[pos]
+                if not more():
+                    return ""
+
+        def value():
+            nonlocal pos
+            while True:
+                try:
+                    parsed, end = decoder.raw_decode(buf, pos)
+                except json.JSONDecodeError:
+                    if not more():
+                        raise
+                    continue
+                # A number running into the end of the buffer may continue in the next chunk
+                if end == len(buf) and not eof and more():
+                    continue
+                pos = end
+                return parsed
+
+        if peek() != "{":
+            raise ValueError(f"{path}: expected a JSON object")
+        pos += 1
+        if peek() == "}":
             return
-        out_name = f"{prefix}_{seq:02d}_{label}{p.suffix.lower()}"
-        out_path = dest_dir / out_name
-        copy_like(p, out_path, mode, dry_run)
+        while True:
+            peek()
+            key = value()
+            if not isinstance(key, str) or peek() != ":":
+                raise ValueError(f"{path}: expected a key and ':' near offset {pos}")
+            pos += 1
+            peek()
+            yield key, value()
+            sep = peek()
+            if sep == "}":
+                return
+            if sep != ",":
+                raise ValueError(f"{path}: expected ',' or '}}' near offset {pos}")
+            pos += 1
+
+
+def resolve_source(source: str, index: DirectoryIndex) -> Optional[Path]:
+    """
+    First file (by name) matching a source path whose file name may be a glob,
+    looked up in the directory index; globs in the folder part fall back to glob.glob.
+    """
+    folder, name = os.path.split(source)
+    if glob.has_magic(folder):
+        matches = sorted(m for m in glob.glob(source) if os.path.isfile(m))
+        return Path(matches[0]) if matches else None
+    base = Path(folder) if folder else Path(".")
+    if not glob.has_magic(name):
+        return next((e.path for e in index.entries(base) if e.name == name), None)
+    pattern = compile_glob(name)
+    for e in index.entries(base):
+        # Like glob, wildcards do not match a leading dot
+        if (name.startswith(".") or not e.name.startswith(".")) and pattern.match(e.name):
+            return e.path
+    return None
+
+
+def curate_extraction(new_project: str, items, index: DirectoryIndex, mode: str, dry_run: bool,
+                      derivatives: Optional[DerivativeStage] = None,
+                      placeholders: Optional[PlaceholderStore] = None,
+                      catalog: Optional[CurationManifest] = None,
+                      digests: Optional[ContentDigests] = None) -> Dict:
+    """Export one virtual project from explicit sources; bad items are reported, not fatal."""
+    started = time.perf_counter()
+    result: Dict = {"project": new_project, "items": 0, "exported": 0, "errors": []}
+    dest_dir = DEST_ROOT / sanitize_name(new_project)
+    prefix = sanitize_name(new_project)
+    planned: List[Tuple[Path, Path]] = []
+    mapping: List[Dict[str, str]] = []
+    if not isinstance(items, list):
+        result["errors"].append({"error": "expected a list of {label, source} items"})
+        items = []
+    for item in items:
+        result["items"] += 1
+        try:
+            label = item.get("label") if isinstance(item, dict) else None
+            source = item.get("source") if isinstance(item, dict) else None
+            if not label or not source:
+                raise ValueError("missing label or source")
+            src_path = resolve_source(source, index)
+            if src_path is None:
+                raise FileNotFoundError(f"no file matches {source}")
+        except Exception as e:
+            result["errors"].append({"item": item, "error": str(e)})
+            continue
+        out_path = dest_dir / f"{prefix}_{len(planned) + 1:02d}_{label}{src_path.suffix.lower()}"
+        planned.append((src_path, out_path))
+        mapping.append({"label": label, "source": str(src_path), "curated": str(out_path)})
+    try:
+        result["changes"] = export_files(dest_dir, f"{prefix}_*.*", planned, mode, dry_run, digests)
+        result["exported"] = len(planned)
+        if derivatives is not None:
+            result["web"], web_changes = derivatives.export(dest_dir, f"{prefix}_*.*", planned, dry_run)
+            for key, count in web_changes.items():
+                result["changes"][key] += count
+        if placeholders is not None:
+            placeholders.annotate(mapping)
+        if not dry_run:
+            write_json_atomic(dest_dir / "_mapping.json", mapping, indent=2)
+        if catalog is not None and not dry_run:
+            catalog.update(prefix, "extraction", mapping,
+                           [dst for _, dst in planned] + result.get("web", []) + [dest_dir / "_mapping.json"],
+                           {"items": result["items"], "exported": result["exported"]})
+    except Exception as e:
+        result["errors"].append({"error": f"export failed: {e}"})
+    result["seconds"] = round(time.perf_counter() - started, 3)
+    return result
+
+
+def run_extractions(path: Path, index: DirectoryIndex, mode: str, dry_run: bool,
+                    deferred: Optional[set] = None, projects_done: Optional[threading.Event] = None,
+                    derivatives: Optional[DerivativeStage] = None,
+                    placeholders: Optional[PlaceholderStore] = None,
+                    catalog: Optional[CurationManifest] = None,
+                    digests: Optional[ContentDigests] = None) -> List[Dict]:
+    """
+    Curate every virtual project in the extractions file as it is parsed.
+    Names in deferred share a folder with a real project; those wait for
+    projects_done so the extraction still has the last word, as before.
+    """
+    results: List[Dict] = []
+    try:
+        for new_project, items in iter_json_object(path):
+            if deferred and sanitize_name(new_project) in deferred and projects_done is not None:
+                projects_done.wait()
+            results.append(curate_extraction(new_project, items, index, mode, dry_run, derivatives, placeholders,
+                                             catalog, digests))
+    except Exception as e:
+        results.append({"error": f"reading {path} stopped: {e}"})
+    return results
+
+
+# -------- Core logic --------
+
+def curate_project(project_dir: Path, mode: str, max_finals: int, detail_count: int, dry_run: bool,
+                   config: Optional[CuratorConfig] = None, index: Optional[DirectoryIndex] = None,
+                   features: Optional[FeatureStore] = None, chronology: Optional[ImageCache] = None,
+                   derivatives: Optional[DerivativeStage] = None,
+                   placeholders: Optional[PlaceholderStore] = None,
+                   catalog: Optional[CurationManifest] = None,
+                   timelapse: Optional[TimelapseStage] = None,
+                   digests: Optional[ContentDigests] = None) -> Dict:
+    project_name = project_dir.name
+    images_dir = project_dir / "images"
+    process_dir = images_dir / "process"
+    final_dir = images_dir / "final"
+    proj_config = (config or CuratorConfig.load()).for_project(project_name)
+    index = index or DirectoryIndex(cache_path=None)
+
+    # One listing per folder; overrides may point at any file, picks only at images
+    with phase("listing"):
+        listings = {"process": index.files(process_dir), "final": index.files(final_dir)}
+        entry_of = {e.path: e for scope in SCOPES for e in index.entries(images_dir / scope)}
+
+    with phase("filtering"):
+        process_images = [p for p in listings["process"] if p.suffix in SUPPORTED_EXTS]
+        final_images = [p for p in listings["final"] if p.suffix in SUPPORTED_EXTS]
+
+        # Apply per-project include/exclude filters if present
+        process_images = proj_config.apply_filters("process", process_images)
+        final_images = proj_config.apply_filters("final", final_images)
+
+    with phase("selection"):
+        # Order process images by EXIF capture time when every one has it; otherwise
+        # by trailing numeric in the name, which usually reflects chronology too
+        process_images_sorted = sorted(process_images, key=numeric_key_from_name)
+        process_times: Optional[List[float]] = None
+        if chronology is not None and process_images_sorted:
+            times = chronology.values([entry_of[p] for p in process_images_sorted])
+            if all(t is not None for t in times):
+                order = sorted(range(len(times)), key=lambda i: times[i])  # stable: ties keep name order
+                process_images_sorted = [process_images_sorted[i] for i in order]
+                process_times = [times[i] for i in order]
+        final_images_sorted = final_images  # keep natural sort by name
+
+        # Content-aware selection where features can be read, fixed positions otherwise
+        process_selector = final_selector = None
+        if features is not None:
+            process_selector = ContentSelector.build(features, [entry_of[p] for p in process_images_sorted], process_times)
+            final_selector = ContentSelector.build(features, [entry_of[p] for p in final_images_sorted])
+
+        # Choose representatives, one per phase of the project's schedule
+        phase_fractions = [f for _, f in proj_config.phases]
+        if process_selector:
+            phase_picks = process_selector.phase_picks(phase_fractions)
+        elif process_images_sorted:
+            phase_picks = [process_images_sorted[i]
+                           for i in schedule_indices(len(process_images_sorted), phase_fractions, process_times)]
+        else:
+            phase_picks = [None] * len(phase_fractions)
+
+        # Finished hero shots (spread across the set)
+        if final_selector:
+            hero = final_selector.spread_picks(max_finals)
+            candidates = final_selector.phase_picks(proj_config.details, exclude=hero, allow_repeat=False)
+        else:
+            hero = spaced_picks(final_images_sorted, max_finals)
+            # Detail picks: naive approach, choose from mid/later portion
+            candidates = [final_images_sorted[i] for i in schedule_indices(len(final_images_sorted), proj_config.details)]
+        details = []
+        for d in candidates:
+            if d and d not in hero and d not in details:
+                details.append(d)
+        details = details[: max(0, detail_count)]
+
+        # Apply overrides where specified; numbering follows the pick order
+        picks: List[Tuple[str, Path]] = []
+        for (label, _), auto in zip(proj_config.phases, phase_picks):
+            p = proj_config.resolve_override(label, listings) or auto
+            if p:
+                picks.append((label, p))
+        for i, h in enumerate(hero, start=1):
+            picks.append((f"Finished_{i}", proj_config.resolve_override(f"Finished_{i}", listings) or h))
+        for i, d in enumerate(details, start=1):
+            picks.append((f"Detail_{i}", proj_config.resolve_override(f"Detail_{i}", listings) or d))
+
+    # Output dirs
+    dest_dir = DEST_ROOT / sanitize_name(project_name)
+
+    # Export with naming scheme
+    prefix = sanitize_name(project_name)
+
+    exported: List[Tuple[str, str]] = []  # (label, curated_path)
+    mapping: List[Dict[str, str]] = []    # {label, source, curated}
+    planned: List[Tuple[Path, Path]] = []  # (source, curated_path)
+    for seq, (label, p) in enumerate(picks, start=1):
+        out_path = dest_dir / f"{prefix}_{seq:02d}_{label}{p.suffix.lower()}"
+        planned.append((p, out_path))
         exported.append((label, str(out_path)))
         mapping.append({"label": label, "source": str(p), "curated": str(out_path)})
-        seq += 1
-
-    # Apply overrides where specified
-    ov_raw = resolve_override(project_name, "RawWood", project_dir) or raw
-    ov_rough = resolve_override(project_name, "RoughShape", project_dir) or rough
-    ov_defining = resolve_override(project_name, "DefiningForms", project_dir) or defining
-    ov_detailing = resolve_override(project_name, "Detailing", project_dir) or detailing
-
-    export_pick(ov_raw, "RawWood")
-    export_pick(ov_rough, "RoughShape")
-    export_pick(ov_defining, "DefiningForms")
-    export_pick(ov_detailing, "Detailing")
-
-    for i, h in enumerate(hero, start=1):
-        ov_h = resolve_override(project_name, f"Finished_{i}", project_dir) or h
-        export_pick(ov_h, f"Finished_{i}")
-
-    for i, d in enumerate(details, start=1):
-        ov_d = resolve_override(project_name, f"Detail_{i}", project_dir) or d
-        export_pick(ov_d, f"Detail_{i}")
-
-    # BestOf: pick last finished and maybe first
-    best_picks: List[Path] = []
-    if hero:
-        best_picks.append(hero[-1])
-        if len(hero) > 2:
-            best_picks.append(hero[0])
-    ensure_dir(best_of_dir)
-    bestof_exported: List[str] = []
-    for i, bp in enumerate(best_picks, start=1):
-        # Allow override of best-of picks too
-        ov_bp = resolve_override(project_name, f"Best_{i}", project_dir) or bp
-        out_name = f"{prefix}_Best_{i}{ov_bp.suffix.lower()}"
-        out_path = best_of_dir / out_name
-        copy_like(ov_bp, out_path, mode, dry_run)
-        bestof_exported.append(str(out_path))
-
-    # Write per-project mapping file
-    try:
-        ensure_dir(dest_dir)
-        with open(dest_dir / "_mapping.json", "w", encoding="utf-8") as f:
-            json.dump(mapping, f, indent=2)
-    except Exception:
-        pass
+
+    with phase("export"):
+        # Apply only the differences against what is already on disk
+        # (best-of picks are made across all projects afterwards, see curate_best_of)
+        changes = export_files(dest_dir, f"{prefix}_*.*", planned, mode, dry_run, digests)
+        web: List[str] = []
+        if derivatives is not None:
+            web, web_changes = derivatives.export(dest_dir, f"{prefix}_*.*", planned, dry_run)
+            for key, count in web_changes.items():
+                changes[key] += count
+
+    sequence: List[str] = []
+    if timelapse is not None:
+        with phase("timelapse"):
+            sequence = timelapse.export(dest_dir, prefix, [entry_of[p] for p in process_images_sorted], process_times,
+                                        dry_run)
+
+    counts = {
+        "process": len(process_images),
+        "final": len(final_images),
+        "exported": len(exported),
+    }
+    with phase("metadata"):
+        # Write per-project mapping file (with layout/placeholder data when available)
+        if placeholders is not None:
+            placeholders.annotate(mapping)
+        if not dry_run:
+            try:
+                write_json_atomic(dest_dir / "_mapping.json", mapping, indent=2)
+            except Exception:
+                pass
+
+        if catalog is not None and not dry_run:
+            catalog.update(prefix, "project", mapping,
+                           [dst for _, dst in planned] + web + sequence + [dest_dir / "_mapping.json"], counts)
 
     return {
         "project": project_name,
-        "counts": {
-            "process": len(process_images),
-            "final": len(final_images),
-            "exported": len(exported),
-            "bestof": len(bestof_exported),
-        },
+        "counts": counts,
         "exported": exported,
-        "bestof": bestof_exported,
+        "web": web,
+        "timelapse": sequence,
+        "changes": changes,
+        "selection": {"process": "content" if process_selector else "position",
+                      "final": "content" if final_selector else "position"},
+        "chronology": "exif" if process_times else "filename",
     }
 
 
-def run(mode: str, max_finals: int, detail_count: int, dry_run: bool, only: Optional[List[str]] = None) -> Dict:
+def attach_best_of(projects: List[Dict], bestof: Dict) -> List[Dict]:
+    """Project report entries with their best-of picks and count filled in."""
+    best_of: Dict[str, List[str]] = {}
+    for row in bestof.get("picks", []):
+        best_of.setdefault(row["project"], []).append(row["curated"])
+    return [dict(p, bestof=best_of.get(p["project"], []), counts=dict(p["counts"], bestof=len(best_of.get(p["project"], []))))
+            for p in projects]
+
+
+def run(mode: str, max_finals: int, detail_count: int, dry_run: bool, only: Optional[List[str]] = None,
+        use_cache: bool = True, jobs: int = 1, select: str = "content", clip: bool = False,
+        bestof_count: Optional[int] = None, web: bool = True, rescan: Optional[List[Path]] = None,
+        timelapse: Optional[List[str]] = None, timelapse_frames: int = TIMELAPSE_FRAMES) -> Dict:
+    started = time.perf_counter()
+    RUN_IO.reset()
     ensure_dir(DEST_ROOT)
-    projects = [p for p in SOURCE_ROOT.iterdir() if p.is_dir()]
-    if only:
+    all_projects = sorted((p for p in SOURCE_ROOT.iterdir() if p.is_dir()), key=lambda x: x.name.lower())
+    projects = all_projects
+    if only is not None:
         wanted = set(n.lower() for n in only)
         projects = [p for p in projects if p.name.lower() in wanted]
 
     report = {"root": str(SOURCE_ROOT), "dest": str(DEST_ROOT), "mode": mode, "dry_run": dry_run, "projects": []}
 
-    for proj in sorted(projects, key=lambda x: x.name.lower()):
-        r = curate_project(proj, mode, max_finals, detail_count, dry_run)
-        report["projects"].append(r)
+    # Overrides and filters are parsed and compiled once for all projects
+    config = CuratorConfig.load()
+    index = DirectoryIndex(load=use_cache)
+    for folder in rescan or []:
+        index.forget(folder)
+    manifest = FingerprintManifest(load=use_cache)
+    chronology = ImageCache(CAPTURE_TIMES_PATH, exif_capture_time, load=use_cache)
+    # One decode per original, shared with the sorter and the review gallery
+    thumbnails = ThumbnailStore(io_call=io_call) if FEATURES_AVAILABLE and (select == "content" or timelapse is not None) else None
+    features: Optional[FeatureStore] = None
+    if select == "content":
+        if FEATURES_AVAILABLE:
+            features = FeatureStore(load=use_cache, clip=clip, thumbnails=thumbnails)
+        else:
+            print("Content-aware selection needs Pillow and NumPy; using position picks")
+    digests = ContentDigests(load=use_cache)
+    placeholders = PlaceholderStore(digests, load=use_cache) if FEATURES_AVAILABLE else None
+    derivatives: Optional[DerivativeStage] = None
+    if web and not dry_run:
+        if FEATURES_AVAILABLE:
+            derivatives = DerivativeStage(digests, load=use_cache)
+        else:
+            print("Web derivatives need Pillow; skipping them")
+    sequences: Optional[TimelapseStage] = None
+    if timelapse is not None and not dry_run:
+        if FEATURES_AVAILABLE:
+            sequences = TimelapseStage(thumbnails, digests, timelapse, timelapse_frames)
+        else:
+            print("Contact sheets and timelapses need Pillow; skipping them")
+    params = {"mode": mode, "max_finals": max_finals, "detail_count": detail_count, "dest": str(DEST_ROOT),
+              "select": "content" if features else "position", "clip": bool(features and clip),
+              "web": derivatives.recipe if derivatives else None,
+              "timelapse": sequences.recipe if sequences else None}
+
+    catalog = CurationManifest() if not dry_run else None
+
+    def curate(proj: Path) -> Dict:
+        with track(WorkStats()) as stats:
+            with phase("fingerprint"):
+                fingerprint = project_fingerprint(proj, config.for_project(proj.name), index, params)
+                previous = manifest.unchanged(proj.name, fingerprint) if not dry_run else None
+            if previous is not None and catalog.has(sanitize_name(proj.name)):
+                kept = len(previous.get("exported", []))
+                return dict(previous, unchanged=True, changes=dict(dict.fromkeys(EXPORT_CHANGES, 0), kept=kept),
+                            timing=stats.as_dict())
+            r = curate_project(proj, mode, max_finals, detail_count, dry_run, config, index, features, chronology,
+                               derivatives, placeholders, catalog, sequences, digests)
+        if not dry_run:
+            manifest.record(proj.name, fingerprint, r)
+        return dict(r, timing=stats.as_dict())
+
+    def timed(name: str, fn: Callable, *args):
+        """fn(*args) tracked as a single phase; returns its result and stats."""
+        with track(WorkStats()) as stats, phase(name):
+            result = fn(*args)
+        return result, stats.as_dict()
+
+    # Optional: curated extractions from explicit sources into new projects. They run in the
+    # background while projects are curated; names that collide with a project wait for it.
+    other_timing: Dict[str, Dict] = {}
+    projects_done = threading.Event()
+    background = ThreadPoolExecutor(max_workers=1)
+    extractions = None
+    if EXTRACTIONS_PATH.exists():
+        deferred = {sanitize_name(p.name) for p in all_projects}
+        extractions = background.submit(timed, "extractions", run_extractions, EXTRACTIONS_PATH, index, mode, dry_run,
+                                        deferred, projects_done, derivatives, placeholders, catalog, digests)
+
+    # Projects are independent; results are merged in sorted order either way
+    ordered = sorted(projects, key=lambda x: x.name.lower())
+    try:
+        if jobs > 1 and len(ordered) > 1:
+            with ThreadPoolExecutor(max_workers=jobs) as pool:
+                report["projects"].extend(pool.map(curate, ordered))
+        else:
+            report["projects"].extend(curate(proj) for proj in ordered)
+    finally:
+        projects_done.set()
+        report["extractions"], other_timing["extractions"] = extractions.result() if extractions else ([], None)
+        background.shutdown()
+
+    # Best-of picks compete across the whole portfolio, so they are made once for all projects
+    # (including those not selected with --only, whose finals are only read from cache)
+    report["bestof"], other_timing["bestof"] = timed("bestof", curate_best_of, all_projects, config, index, features,
+                                                     max_finals, bestof_count, mode, dry_run, derivatives, placeholders,
+                                                     catalog, digests)
+    report["projects"] = attach_best_of(report["projects"], report["bestof"])
+
+    if catalog is not None:
+        catalog.retain("project", [sanitize_name(p.name) for p in all_projects])
+        if not any("error" in ex for ex in report["extractions"]):
+            catalog.retain("extraction", [sanitize_name(ex["project"]) for ex in report["extractions"]])
+        catalog.close()
+
+    index.save()
+    manifest.save()
+    chronology.save()
+    chronology.close()
+    if features:
+        features.save()
+        features.close()
+    if derivatives:
+        derivatives.save()
+        derivatives.close()
+    if placeholders:
+        placeholders.save()
+        placeholders.close()
+    if sequences:
+        sequences.close()
+    if thumbnails:
+        thumbnails.close()
+    digests.save()
+    digests.close()
+    report["timing"] = summarize_timing(time.perf_counter() - started, report["projects"],
+                                        {name: t for name, t in other_timing.items() if t})
+    return report
+
 
-    # Optional: curated extractions from explicit sources into new projects
-    extractions_path = Path("curated_extractions.json")
-    if extractions_path.exists():
+def write_report(report: Dict, out_path: Path) -> None:
+    try:
+        with open(out_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {out_path}")
+    except Exception as e:
+        print(f"Failed to write report: {e}")
+
+
+def print_summary(report: Dict) -> None:
+    """Compact summary of a run."""
+    total = len(report.get("projects", []))
+    print(f"Processed projects: {total}")
+    for p in report.get("projects", [])[:10]:  # show first few
+        status = " (unchanged)" if p.get("unchanged") else ""
+        print(f"- {p['project']}: process={p['counts']['process']} final={p['counts']['final']} exported={p['counts']['exported']} bestof={p['counts']['bestof']}{status}")
+    for ex in report.get("extractions", []):
+        if "project" in ex:
+            print(f"- extraction {ex['project']}: exported={ex['exported']}/{ex['items']} errors={len(ex['errors'])} ({ex['seconds']:.2f}s)")
+        else:
+            print(f"- extractions: {ex.get('error')}")
+    timing = report.get("timing")
+    if timing:
+        moved = ", ".join(f"{kind} {size / 1e6:.1f} MB" for kind, size in timing["bytes"].items() if size)
+        print(f"Took {timing['seconds']:.2f}s, {sum(timing['fs_calls'].values())} filesystem calls" + (f"; {moved}" if moved else ""))
+        if timing["slowest"]:
+            print("Slowest: " + ", ".join(f"{p['project']} {p['seconds']:.2f}s" for p in timing["slowest"]))
+
+
+# -------- Watch mode --------
+
+class InotifyWatcher:
+    """
+    Change notifications from Linux inotify (through libc, no extra packages).
+    Source roots are watched recursively, new folders included; for single
+    files their folder is watched and events for other names are dropped.
+    """
+
+    IN_ATTRIB = 0x004
+    IN_CLOSE_WRITE = 0x008
+    IN_MOVED_FROM = 0x040
+    IN_MOVED_TO = 0x080
+    IN_CREATE = 0x100
+    IN_DELETE = 0x200
+    IN_Q_OVERFLOW = 0x4000
+    IN_ISDIR = 0x40000000
+    MASK = IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    EVENT = struct.Struct("iIII")
+
+    def __init__(self, roots: List[Path], files: List[Path]):
+        import ctypes
+        import ctypes.util
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._dirs: Dict[int, Path] = {}
+        self._roots = [r.resolve() for r in roots]
+        self._files = {f.resolve() for f in files}
+        self._file_dirs = {f.parent for f in self._files}
+        for root in self._roots:
+            self._watch_tree(root)
+        for folder in self._file_dirs:
+            self._watch(folder)
+
+    def _watch(self, folder: Path) -> None:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(str(folder)), self.MASK)
+        if wd >= 0:
+            self._dirs[wd] = folder
+
+    def _watch_tree(self, root: Path) -> None:
+        for dirpath, _, _ in os.walk(root):
+            self._watch(Path(dirpath))
+
+    def read(self, timeout: float) -> Optional[List[Path]]:
+        """Paths changed within timeout seconds; None if the kernel queue overflowed (anything may have changed)."""
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return []
         try:
-            with open(extractions_path, "r", encoding="utf-8") as f:
-                ex = json.load(f)
-            if isinstance(ex, dict):
-                for new_project, items in ex.items():
-                    dest_dir = DEST_ROOT / sanitize_name(new_project)
-                    ensure_dir(dest_dir)
-                    prefix = sanitize_name(new_project)
-                    # Clean previous curated for this virtual project
-                    if not dry_run and dest_dir.exists():
-                        for fpath in dest_dir.glob(f"{prefix}_*.*"):
-                            try:
-                                if fpath.is_file():
-                                    fpath.unlink()
-                            except Exception:
-                                pass
-                    seq = 1
-                    mapping: List[Dict[str, str]] = []
-                    for item in items:
-                        label = item.get("label")
-                        source = item.get("source")
-                        if not label or not source:
-                            continue
-                        # Glob match absolute or workspace-relative source
-                        matches: List[str] = []
-                        if os.path.isabs(source):
-                            matches = glob.glob(source)
-                        else:
-                            matches = glob.glob(str(Path(source)))
-                        if not matches:
-                            continue
-                        src_path = Path(matches[0])
-                        out_name = f"{prefix}_{seq:02d}_{label}{src_path.suffix.lower()}"
-                        out_path = dest_dir / out_name
-                        copy_like(src_path, out_path, mode, dry_run)
-                        mapping.append({"label": label, "source": str(src_path), "curated": str(out_path)})
-                        seq += 1
+            data = os.read(self._fd, 256 * 1024)
+        except BlockingIOError:
+            return []
+        changed: List[Path] = []
+        pos = 0
+        while pos + self.EVENT.size <= len(data):
+            wd, mask, _, length = self.EVENT.unpack_from(data, pos)
+            name = data[pos + self.EVENT.size:pos + self.EVENT.size + length].rstrip(b"\0")
+            pos += self.EVENT.size + length
+            if mask & self.IN_Q_OVERFLOW:
+                return None
+            folder = self._dirs.get(wd)
+            if folder is None:
+                continue
+            path = folder / os.fsdecode(name) if name else folder
+            if path not in self._files and not any(folder.is_relative_to(r) for r in self._roots):
+                continue
+            if mask & self.IN_ISDIR and mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                self._watch_tree(path)
+            changed.append(path)
+        return changed
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+class PollingWatcher:
+    """Fallback watcher: compares stat snapshots of every folder and file under the roots."""
+
+    def __init__(self, roots: List[Path], files: List[Path], interval: float = WATCH_POLL_INTERVAL):
+        self.roots = [r.resolve() for r in roots]
+        self.files = [f.resolve() for f in files]
+        self.interval = interval
+        self._snapshot = self._take()
+        self._taken = time.monotonic()
+
+    def _take(self) -> Dict[Path, Tuple[int, int]]:
+        snap: Dict[Path, Tuple[int, int]] = {}
+        for f in self.files:
+            try:
+                st = f.stat()
+                snap[f] = (st.st_size, st.st_mtime_ns)
+            except OSError:
+                pass
+        for root in self.roots:
+            for dirpath, _, filenames in os.walk(root):
+                for name in [""] + filenames:
+                    path = Path(dirpath) / name if name else Path(dirpath)
                     try:
-                        with open(dest_dir / "_mapping.json", "w", encoding="utf-8") as mf:
-                            json.dump(mapping, mf, indent=2)
-                    except Exception:
-                        pass
-        except Exception:
-            pass
+                        st = path.stat()
+                    except OSError:
+                        continue
+                    snap[path] = (st.st_size, st.st_mtime_ns)
+        return snap
+
+    def read(self, timeout: float) -> Optional[List[Path]]:
+        """Changes since the last walk; the tree is walked at most once per interval."""
+        wait = self._taken + self.interval - time.monotonic()
+        if wait > timeout:
+            time.sleep(timeout)
+            return []
+        time.sleep(max(0.0, wait))
+        current = self._take()
+        self._taken = time.monotonic()
+        previous, self._snapshot = self._snapshot, current
+        return [p for p in current.keys() | previous.keys() if current.get(p) != previous.get(p)]
+
+    def close(self) -> None:
+        pass
 
-    return report
+
+def make_watcher(roots: List[Path], files: List[Path], poll: bool = False):
+    if not poll and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(roots, files)
+        except (OSError, AttributeError) as e:
+            print(f"inotify unavailable ({e}); polling every {WATCH_POLL_INTERVAL:g}s instead")
+    return PollingWatcher(roots, files)
+
+
+def affected_projects(changed: List[Path], before: CuratorConfig, after: CuratorConfig) -> set:
+    """Projects whose sources or effective overrides/filters changed."""
+    root = SOURCE_ROOT.resolve()
+    names = set()
+    for path in changed:
+        try:
+            rel = path.relative_to(root)
+        except ValueError:
+            continue
+        if rel.parts:
+            names.add(rel.parts[0])
+    project_names = {p.name for p in SOURCE_ROOT.iterdir() if p.is_dir()} if SOURCE_ROOT.exists() else set()
+    for name in project_names | set(before.projects) | set(after.projects):
+        if before.for_project(name).raw != after.for_project(name).raw:
+            names.add(name)
+    return names
+
+
+def regenerate_gallery() -> None:
+    if not GALLERY_SCRIPT.exists():
+        return
+    result = subprocess.run([sys.executable, str(GALLERY_SCRIPT)], capture_output=True, text=True)
+    print(result.stdout.strip() or result.stderr.strip())
+
+
+def watch(run_args: Dict, report_path: Path, poll: bool = False) -> None:
+    """
+    Curate once, then re-curate only the projects touched by each burst of
+    changes (after WATCH_DEBOUNCE seconds of quiet) and rebuild the review gallery.
+    A pass that fails is reported and watching carries on.
+    """
+    config_files = [OVERRIDES_PATH, FILTERS_PATH, SCHEDULES_PATH, EXTRACTIONS_PATH]
+    report = run(**run_args)
+    write_report(report, report_path)
+    print_summary(report)
+    regenerate_gallery()
+
+    watcher = make_watcher([SOURCE_ROOT], config_files, poll)
+    print(f"Watching {SOURCE_ROOT} and {', '.join(str(f) for f in config_files)} ({type(watcher).__name__}); Ctrl+C to stop")
+    config = CuratorConfig.load()
+    pending: set = set()
+    everything = False
+    last_event = 0.0
+    try:
+        while True:
+            changed = watcher.read(WATCH_DEBOUNCE)
+            if changed is None:
+                everything = True
+                last_event = time.monotonic()
+                continue
+            if changed:
+                pending.update(changed)
+                last_event = time.monotonic()
+                continue
+            if not (pending or everything) or time.monotonic() - last_event < WATCH_DEBOUNCE:
+                continue
+
+            new_config = CuratorConfig.load()
+            names = affected_projects(list(pending), config, new_config)
+            if run_args.get("only") is not None:
+                wanted = {n.lower() for n in run_args["only"]}
+                names = {n for n in names if n.lower() in wanted}
+            config = new_config
+            if everything:
+                only = run_args.get("only")
+            elif names or EXTRACTIONS_PATH.resolve() in pending:
+                only = sorted(names)
+            else:
+                pending.clear()
+                continue
+            pending.clear()
+            everything = False
+
+            print(f"\nChange detected: re-curating {', '.join(only) if only else ('all projects' if only is None else 'extractions')}")
+            rescan = [SOURCE_ROOT / name / "images" / scope for name in (only or []) for scope in SCOPES]
+            try:
+                update = run(**dict(run_args, only=only, rescan=rescan))
+                report = merge_reports(report, update)
+                write_report(report, report_path)
+                print_summary(update)
+                regenerate_gallery()
+            except Exception as e:
+                # A failed pass (say, a file vanishing mid-export) must not end the watch
+                print(f"Re-curation failed ({type(e).__name__}: {e}); still watching, the next change retries")
+    except KeyboardInterrupt:
+        print("\nStopped watching")
+    finally:
+        watcher.close()
+
+
+def merge_reports(report: Dict, update: Dict) -> Dict:
+    """The full report with the projects of a partial run swapped in and portfolio-wide parts replaced."""
+    existing = {p.name for p in SOURCE_ROOT.iterdir() if p.is_dir()} if SOURCE_ROOT.exists() else set()
+    projects = {p["project"]: p for p in report.get("projects", []) if p["project"] in existing}
+    projects.update({p["project"]: p for p in update.get("projects", [])})
+    merged = dict(update, projects=sorted(projects.values(), key=lambda p: p["project"].lower()))
+    merged["projects"] = attach_best_of(merged["projects"], update.get("bestof", {}))
+    return merged
 
 
 def main():
@@ -454,26 +2706,44 @@ def main():
     parser.add_argument("--dry-run", action="store_true", default=False, help="Do not copy/move, just simulate and report")
     parser.add_argument("--only", nargs="*", help="Optional subset of project folder names to process")
     parser.add_argument("--report", type=str, default="curated_report.json", help="Write a JSON report here")
+    parser.add_argument("--no-cache", action="store_true", default=False,
+                        help="Ignore cached listings and fingerprints: re-list every folder and re-curate every project")
+    parser.add_argument("--jobs", type=int, default=1, help="Curate up to N projects concurrently")
+    parser.add_argument("--select", choices=["content", "position"], default="content",
+                        help="Pick by image features (sharpness, exposure, visual changes) or by fixed positions only")
+    parser.add_argument("--bestof-count", type=int, default=None,
+                        help=f"Best-of picks across the whole portfolio (default: {BESTOF_PER_PROJECT} per project)")
+    parser.add_argument("--no-web", action="store_true", default=False,
+                        help="Skip the responsive WEBP/AVIF renditions in each project's web/ folder")
+    parser.add_argument("--clip", action="store_true", default=False,
+                        help="Also use CLIP embeddings to find visual changes (needs torch/transformers)")
+    parser.add_argument("--timelapse", nargs="*", choices=["webp", "mp4"], default=None, metavar="FORMAT",
+                        help="Write a contact sheet of each project's process shots to its timelapse/ folder, "
+                             "plus an animated timelapse per FORMAT given (webp, mp4; mp4 needs ffmpeg)")
+    parser.add_argument("--timelapse-frames", type=int, default=TIMELAPSE_FRAMES,
+                        help="Most frames per timelapse; longer projects are sampled evenly along their timeline")
+    parser.add_argument("--watch", action="store_true", default=False,
+                        help="Keep running: re-curate projects whose photos, overrides or filters change, then rebuild the review gallery")
+    parser.add_argument("--poll", action="store_true", default=False,
+                        help=f"With --watch, poll file stats every {WATCH_POLL_INTERVAL:g}s instead of using inotify")
 
     args = parser.parse_args()
+    if args.watch and args.mode == "move":
+        # Every pass would move whatever it picks out of the sources it watches
+        parser.error("--watch cannot be combined with --mode move; use copy or link")
+
+    run_args = dict(mode=args.mode, max_finals=args.max_finals, detail_count=args.detail_count, dry_run=args.dry_run,
+                    only=args.only or None, use_cache=not args.no_cache, jobs=args.jobs, select=args.select, clip=args.clip,
+                    bestof_count=args.bestof_count, web=not args.no_web, timelapse=args.timelapse,
+                    timelapse_frames=args.timelapse_frames)
+    if args.watch:
+        watch(run_args, Path(args.report), poll=args.poll)
+        return
 
-    report = run(mode=args.mode, max_finals=args.max_finals, detail_count=args.detail_count, dry_run=args.dry_run, only=args.only)
+    report = run(**run_args)
+    write_report(report, Path(args.report))
+    print_summary(report)
 
-    # Save report alongside DEST_ROOT
-    out_path = Path(args.report)
-    try:
-        with open(out_path, "w", encoding="utf-8") as f:
-            json.dump(report, f, indent=2)
-        print(f"Report written to {out_path}")
-    except Exception as e:
-        print(f"Failed to write report: {e}")
-
-    # Print compact summary
-    total = len(report.get("projects", []))
-    print(f"Processed projects: {total}")
-    for p in report.get("projects", [])[:10]:  # show first few
-        print(f"- {p['project']}: process={p['counts']['process']} final={p['counts']['final']} exported={p['counts']['exported']} bestof={p['counts']['bestof']}")
-        
 
 if __name__ == "__main__":
     main()
@@ -5,24 +5,174 @@ Re-classify Unknown Images
 
 This script re-processes images in the "Unknown" folder with updated 
 classification labels to better identify St. Collen statues and other figures.
+
+Images are first classified from their cached single-view CLIP embeddings
+(computed once by the sorter or a previous run). Only images that are still
+below the confidence threshold get test-time augmentation: flipped and cropped
+views batched through CLIP as one tensor, with the predictions averaged.
+
+Re-classified images are renamed in place from sorted_animals/Unknown into
+their category folder, one rename per image. Renames are recorded in batches
+in a write-ahead move log; if a run crashes, the next run rolls the log
+forward, or run with --rollback to undo every move of the interrupted run.
 """
 
+import json
 import os
+import shutil
 import sys
+import time
 from pathlib import Path
+from typing import Dict, List, Tuple
 
 # Import the main script functions
 sys.path.append('.')
-from animal_photo_sorter import AnimalClassifier, FileManager, setup_logging, CONFIDENCE_THRESHOLD
+from animal_photo_sorter import (
+    AnimalClassifier, EmbeddingCache, FileManager, setup_logging,
+    CONFIDENCE_THRESHOLD, CLASSIFY_BATCH_SIZE, CLIP_MODEL_NAME, EMBEDDING_CACHE_FILE,
+)
+from thumbnail_cache import ThumbnailStore
+
+# Base folder the sorter wrote to; Unknown lives underneath it
+SORTED_FOLDER = "sorted_animals"
+
+# Write-ahead log of renames for crash recovery
+MOVE_LOG_FILE = "sorted_animals/.reclassify_moves.jsonl"
+
+# Renames recorded per log sync
+RENAME_BATCH_SIZE = 50
+
+
+class MoveLog:
+    """
+    Write-ahead log of renames out of the Unknown folder.
+    
+    Each batch is written as "intent" records and synced before any file is
+    touched, then closed with a "commit" record once its renames are done, so
+    a batch costs two syncs regardless of its size. A leftover log means the
+    previous run did not finish and must be recovered first.
+    """
+    
+    def __init__(self, log_path: str):
+        self.log_path = Path(log_path)
+        self._handle = None
+        self._batch = 0
+    
+    def exists(self) -> bool:
+        return self.log_path.exists()
+    
+    def _sync(self):
+        self._handle.flush()
+        os.fsync(self._handle.fileno())
+    
+    def begin_batch(self, moves: List[Tuple[Path, Path]]) -> int:
+        """Durably record the intended renames of a batch."""
+        if self._handle is None:
+            self.log_path.parent.mkdir(parents=True, exist_ok=True)
+            self._handle = open(self.log_path, "w", encoding="utf-8")
+        self._batch += 1
+        for src, dst in moves:
+            self._handle.write(json.dumps({"op": "intent", "batch": self._batch, "src": str(src), "dst": str(dst)}) + "\n")
+        self._sync()
+        return self._batch
+    
+    def commit_batch(self, batch: int):
+        self._handle.write(json.dumps({"op": "commit", "batch": batch}) + "\n")
+        self._sync()
+    
+    def finish(self):
+        """Close and delete the log after a completed run."""
+        if self._handle:
+            self._handle.close()
+            self._handle = None
+        if self.log_path.exists():
+            self.log_path.unlink()
+    
+    def _read(self) -> Tuple[List[Dict], set]:
+        intents: List[Dict] = []
+        committed = set()
+        with open(self.log_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # torn last line
+                if record.get("op") == "intent":
+                    intents.append(record)
+                elif record.get("op") == "commit":
+                    committed.add(record["batch"])
+        return intents, committed
+    
+    def recover(self, rollback: bool = False) -> int:
+        """
+        Bring the file system to a consistent state and delete the log.
+        
+        Args:
+            rollback: Move every logged file back into Unknown instead of
+                completing the unfinished batch
+        
+        Returns:
+            Number of files moved during recovery
+        """
+        intents, committed = self._read()
+        moved = 0
+        if rollback:
+            for record in reversed(intents):
+                src, dst = Path(record["src"]), Path(record["dst"])
+                if dst.exists() and not src.exists():
+                    move_file(dst, src)
+                    moved += 1
+        else:
+            for record in intents:
+                if record["batch"] in committed:
+                    continue
+                src, dst = Path(record["src"]), Path(record["dst"])
+                if src.exists() and not dst.exists():
+                    dst.parent.mkdir(parents=True, exist_ok=True)
+                    move_file(src, dst)
+                    moved += 1
+        self.finish()
+        return moved
+
+
+def move_file(src: Path, dst: Path):
+    """Rename src to dst, falling back to copy-and-delete across file systems."""
+    try:
+        os.rename(src, dst)
+    except OSError:
+        shutil.move(str(src), str(dst))
 
-def reclassify_unknown_images():
-    """Re-classify images in the Unknown folder."""
+
+def is_confident(animal_type: str, confidence: float) -> bool:
+    """True if a prediction is good enough to leave the Unknown folder."""
+    return confidence >= CONFIDENCE_THRESHOLD and FileManager.folder_name_for(animal_type) != "Unknown"
+
+def reclassify_unknown_images(rollback: bool = False):
+    """
+    Re-classify images in the Unknown folder.
+    
+    Args:
+        rollback: Only undo the moves of an interrupted run, then stop
+    """
     
     # Setup logging
     logger = setup_logging()
     logger.info("Starting re-classification of Unknown images")
     
-    unknown_folder = Path("sorted_animals/Unknown")
+    # Recover from an interrupted run before looking at the folders
+    move_log = MoveLog(MOVE_LOG_FILE)
+    if move_log.exists():
+        moved = move_log.recover(rollback=rollback)
+        action = "Rolled back" if rollback else "Rolled forward"
+        print(f"{action} interrupted run: {moved} files moved")
+        logger.info(f"{action} move log {MOVE_LOG_FILE}: {moved} files moved")
+        if rollback:
+            return
+    elif rollback:
+        print("No interrupted run to roll back.")
+        return
+    
+    unknown_folder = Path(SORTED_FOLDER) / "Unknown"
     if not unknown_folder.exists():
         print("No Unknown folder found!")
         return
@@ -43,47 +193,80 @@ def reclassify_unknown_images():
     print()
     
     # Initialize classifier
-    classifier = AnimalClassifier(logger)
-    file_manager = FileManager("sorted_animals", "sorted_animals_reclassified", False, logger)
+    embedding_cache = EmbeddingCache(EMBEDDING_CACHE_FILE, CLIP_MODEL_NAME, logger)
+    thumbnails = ThumbnailStore()
+    classifier = AnimalClassifier(logger, embedding_cache, thumbnails)
+    file_manager = FileManager(SORTED_FOLDER, SORTED_FOLDER, True, logger)
+    
+    # Pass 1: single-view classification; cached embeddings only need the label step
+    cached_before = len(embedding_cache.entries)
+    base_start = time.perf_counter()
+    predictions = {}
+    for start in range(0, len(unknown_images), CLASSIFY_BATCH_SIZE):
+        batch = unknown_images[start:start + CLASSIFY_BATCH_SIZE]
+        for image_file, result in zip(batch, classifier.classify_batch([str(p) for p in batch])):
+            predictions[image_file] = result
+    base_seconds = time.perf_counter() - base_start
+    base_encoded = len(embedding_cache.entries) - cached_before
+    embedding_cache.save()
+    
+    # Pass 2: test-time augmentation, only for images still below threshold
+    low_confidence = [p for p in unknown_images if not is_confident(*predictions[p])]
+    print(f"{len(unknown_images) - len(low_confidence)} confident from single view, "
+          f"{len(low_confidence)} need augmentation...")
+    tta_start = time.perf_counter()
+    tta_views = 0
+    rescued_by_tta = set()
+    for i, image_file in enumerate(low_confidence, 1):
+        print(f"Augmenting {i}/{len(low_confidence)}: {image_file.name}")
+        animal_type, confidence, views = classifier.classify_with_tta(str(image_file))
+        tta_views += views
+        if is_confident(animal_type, confidence):
+            predictions[image_file] = (animal_type, confidence)
+            rescued_by_tta.add(image_file)
+    tta_seconds = time.perf_counter() - tta_start
+    thumbnails.close()
+    print()
     
     # Re-process each unknown image
     reclassified_count = 0
+    moved_by_tta = 0
+    batch: List[Tuple[Path, Path]] = []
+    
+    def flush_batch():
+        nonlocal reclassified_count, moved_by_tta
+        if not batch:
+            return
+        batch_id = move_log.begin_batch(batch)
+        for src, dst in batch:
+            try:
+                move_file(src, dst)
+                reclassified_count += 1
+                if src in rescued_by_tta:
+                    moved_by_tta += 1
+            except Exception as e:
+                logger.error(f"Error moving {src} to {dst}: {e}")
+                print(f"  → ERROR: Failed to move {src.name}: {e}")
+        move_log.commit_batch(batch_id)
+        batch.clear()
     
     for i, image_file in enumerate(unknown_images, 1):
         print(f"Re-classifying {i}/{len(unknown_images)}: {image_file.name}")
         
         try:
-            # Classify the image with updated labels
-            animal_type, confidence = classifier.classify_image(str(image_file))
+            animal_type, confidence = predictions[image_file]
             
-            print(f"  → Prediction: {animal_type} (confidence: {confidence:.3f})")
+            via = " via augmentation" if image_file in rescued_by_tta else ""
+            print(f"  → Prediction: {animal_type} (confidence: {confidence:.3f}){via}")
             
             # If confidence is good enough and it's not "unknown", move it
-            if confidence >= CONFIDENCE_THRESHOLD and animal_type != "unknown":
+            if is_confident(animal_type, confidence):
                 destination_folder = file_manager.create_destination_folder(animal_type)
-                success = file_manager.move_or_copy_file(image_file, destination_folder)
-                
-                if success:
-                    print(f"  → Re-classified to: {destination_folder.name}/")
-                    reclassified_count += 1
-                    
-                    # Also move from original Unknown folder to correct folder in sorted_animals
-                    original_dest = Path("sorted_animals") / destination_folder.name
-                    original_dest.mkdir(parents=True, exist_ok=True)
-                    
-                    import shutil
-                    new_file_path = original_dest / image_file.name
-                    counter = 1
-                    while new_file_path.exists():
-                        stem = image_file.stem
-                        suffix = image_file.suffix
-                        new_file_path = original_dest / f"{stem}_{counter}{suffix}"
-                        counter += 1
-                    
-                    shutil.move(str(image_file), str(new_file_path))
-                    print(f"  → Moved to: sorted_animals/{destination_folder.name}/")
-                else:
-                    print(f"  → ERROR: Failed to move {image_file.name}")
+                destination_file = file_manager.resolve_destination_file(image_file, destination_folder)
+                batch.append((image_file, destination_file))
+                print(f"  → Re-classified to: {SORTED_FOLDER}/{destination_folder.name}/{destination_file.name}")
+                if len(batch) >= RENAME_BATCH_SIZE:
+                    flush_batch()
             else:
                 print(f"  → Staying in Unknown (low confidence)")
                 
@@ -92,9 +275,20 @@ def reclassify_unknown_images():
         
         print()
     
+    flush_batch()
+    move_log.finish()
+    
     print(f"\nRe-classification complete!")
     print(f"Successfully re-classified: {reclassified_count} images")
     print(f"Remaining in Unknown: {len(unknown_images) - reclassified_count} images")
+    print()
+    print(f"Single view: {len(unknown_images)} images, {base_encoded} newly encoded "
+          f"({len(unknown_images) - base_encoded} from cache), {base_seconds:.1f}s")
+    print(f"Augmentation: {len(low_confidence)} images, {tta_views} additional CLIP views, {tta_seconds:.1f}s")
+    print(f"Moved out of Unknown: {reclassified_count - moved_by_tta} by single view, "
+          f"{moved_by_tta} by augmentation")
+    logger.info(f"Re-classification: {reclassified_count} moved ({moved_by_tta} via TTA), "
+                f"{tta_views} TTA views in {tta_seconds:.1f}s")
 
 if __name__ == "__main__":
-    reclassify_unknown_images()
+    reclassify_unknown_images(rollback="--rollback" in sys.argv[1:])
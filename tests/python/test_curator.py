@@ -0,0 +1,126 @@
+"""Helpers of project_photo_curator: pick schedules, extraction parsing and incremental export."""
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+import project_photo_curator as curator  # noqa: E402
+
+
+SCHEDULES = [
+    (10, [0.0, 0.15, 0.4, 0.7, 1.0], None),
+    (5, [0.0, 0.1, 0.2, 0.3, 0.4], None),
+    (4, [0.9, 0.95, 1.0], None),
+    (3, [0.5, 0.5, 0.5, 0.5], None),
+    (7, [0.0, 0.15, 0.4, 0.7], [0.0, 1.0, 2.0, 2.5, 3.0, 9.0, 10.0]),
+    (6, [1.0, 0.0, 1.0, 0.0], [5.0, 5.0, 5.0, 5.0, 5.0, 5.0]),
+]
+
+
+@pytest.mark.parametrize("count, fractions, times", SCHEDULES)
+def test_schedule_indices_numpy_matches_fallback(count, fractions, times, monkeypatch):
+    pytest.importorskip("numpy")
+    for unique in (True, False):
+        vectorized = curator.schedule_indices(count, fractions, times, unique)
+        with monkeypatch.context() as m:
+            m.setattr(curator, "np", None)
+            fallback = curator.schedule_indices(count, fractions, times, unique)
+        assert vectorized == fallback
+
+
+@pytest.mark.parametrize("count, fractions, times", SCHEDULES)
+def test_schedule_indices_are_unique_when_items_suffice(count, fractions, times, monkeypatch):
+    monkeypatch.setattr(curator, "np", None)
+    idx = curator.schedule_indices(count, fractions, times)
+    assert len(idx) == len(fractions)
+    assert all(0 <= i < count for i in idx)
+    if len(fractions) <= count:
+        assert len(set(idx)) == len(idx)
+
+
+def test_iter_json_object_value_straddling_chunks(tmp_path):
+    data = {
+        "Owl": [{"source": "public/media/projects/owl/images/final/*.jpg", "label": "Front"}],
+        "Eagle": {"count": 123456789, "nested": {"list": [1, 2.5, "three"]}},
+        "n": 98765,
+    }
+    path = tmp_path / "extractions.json"
+    path.write_text(json.dumps(data), encoding="utf-8")
+    # Chunks much smaller than any value, so every value spans several reads
+    for chunk_size in (1, 7, 16):
+        assert dict(curator.iter_json_object(path, chunk_size=chunk_size)) == data
+
+
+def test_iter_json_object_yields_pairs_before_malformed_input(tmp_path):
+    path = tmp_path / "extractions.json"
+    path.write_text('{"a": [1, 2], "b": {"c": tru', encoding="utf-8")
+    seen = []
+    with pytest.raises(ValueError):
+        for pair in curator.iter_json_object(path, chunk_size=5):
+            seen.append(pair)
+    assert seen == [("a", [1, 2])]
+
+
+def test_export_files_counts(tmp_path):
+    src, out = tmp_path / "src", tmp_path / "out"
+    src.mkdir()
+    out.mkdir()
+    for name in ("a", "b", "c"):
+        (src / f"{name}.jpg").write_bytes(name.encode() * 10)
+    (out / "P_1.jpg").write_bytes(b"a" * 10)     # already right: kept
+    (out / "P_9.jpg").write_bytes(b"b" * 10)     # b under an old name: renamed
+    (out / "P_8.jpg").write_bytes(b"stale")      # unplanned: deleted
+    (out / "P_4.jpg").write_bytes(b"published")  # source gone: left as it is
+    (out / "other.jpg").write_bytes(b"x")        # outside the glob: untouched
+    planned = [
+        (src / "a.jpg", out / "P_1.jpg"),
+        (src / "b.jpg", out / "P_2.jpg"),
+        (src / "c.jpg", out / "P_3.jpg"),
+        (src / "gone.jpg", out / "P_4.jpg"),
+    ]
+
+    changes = curator.export_files(out, "P_*.*", planned, "copy", False)
+
+    assert changes == {"kept": 1, "created": 1, "renamed": 1, "deleted": 1, "missing": 1, "failed": 0}
+    assert sorted(p.name for p in out.iterdir()) == ["P_1.jpg", "P_2.jpg", "P_3.jpg", "P_4.jpg", "other.jpg"]
+    assert (out / "P_2.jpg").read_bytes() == b"b" * 10
+    assert (out / "P_3.jpg").read_bytes() == b"c" * 10
+    assert (out / "P_4.jpg").read_bytes() == b"published"
+
+    digests = curator.ContentDigests(path=None, load=False)
+    try:
+        again = curator.export_files(out, "P_*.*", planned[:3], "copy", False, digests)
+    finally:
+        digests.close()
+    assert again == {"kept": 3, "created": 0, "renamed": 0, "deleted": 1, "missing": 0, "failed": 0}
+
+
+def test_export_files_dry_run_touches_nothing(tmp_path):
+    (tmp_path / "a.jpg").write_bytes(b"a")
+    out = tmp_path / "out"
+    changes = curator.export_files(out, "*.*", [(tmp_path / "a.jpg", out / "P_1.jpg")], "copy", True)
+    assert not any(changes.values())
+    assert not out.exists()
+
+
+def test_resolve_source(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    final = tmp_path / "owl" / "images" / "final"
+    final.mkdir(parents=True)
+    for name in ("b.jpg", "a.jpg", ".hidden.jpg", "c.png"):
+        (final / name).write_bytes(b"x")
+    (tmp_path / "eagle" / "images" / "final").mkdir(parents=True)
+    (tmp_path / "eagle" / "images" / "final" / "z.jpg").write_bytes(b"x")
+    index = curator.DirectoryIndex(cache_path=None)
+
+    assert curator.resolve_source(str(final / "b.jpg"), index) == final / "b.jpg"
+    assert curator.resolve_source(str(final / "*.jpg"), index) == final / "a.jpg"
+    assert curator.resolve_source(str(final / ".h*.jpg"), index) == final / ".hidden.jpg"
+    assert curator.resolve_source(str(final / "*.gif"), index) is None
+    assert curator.resolve_source(str(final / "missing.jpg"), index) is None
+    assert curator.resolve_source("*/images/final/*.jpg", index) == Path("eagle/images/final/z.jpg")
+    assert curator.resolve_source("owl/images/final/c.png", index) == Path("owl/images/final/c.png")
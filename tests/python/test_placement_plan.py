@@ -0,0 +1,54 @@
+"""Re-running animal_photo_sorter's plan 'apply' must not place files twice."""
+import json
+import os
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+import animal_photo_sorter as sorter  # noqa: E402
+
+
+def setup_plan(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    source = tmp_path / "media"
+    dest = tmp_path / "sorted"
+    source.mkdir()
+    (source / "x.jpg").write_bytes(b"photo")
+    monkeypatch.setattr(sorter, "SOURCE_FOLDER", str(source))
+    monkeypatch.setattr(sorter, "DESTINATION_FOLDER", str(dest))
+    monkeypatch.setattr(sorter, "MOVE_FILES", False)
+    plan = tmp_path / "plan.jsonl"
+    plan.write_text(
+        json.dumps(sorter._plan_header()) + "\n"
+        + json.dumps({"source": "x.jpg", "category": "Owls", "confidence": 0.9, "destination": "Owls/x.jpg"}) + "\n",
+        encoding="utf-8",
+    )
+    return source, dest, plan
+
+
+def test_apply_is_idempotent_next_to_unrelated_file(tmp_path, monkeypatch):
+    source, dest, plan = setup_plan(tmp_path, monkeypatch)
+    (dest / "Owls").mkdir(parents=True)
+    (dest / "Owls" / "x.jpg").write_bytes(b"other")
+
+    for _ in range(3):
+        sorter.apply_placement_plan(str(plan))
+
+    assert sorted(p.name for p in (dest / "Owls").iterdir()) == ["x.jpg", "x_1.jpg"]
+    assert (dest / "Owls" / "x.jpg").read_bytes() == b"other"
+    assert (dest / "Owls" / "x_1.jpg").read_bytes() == b"photo"
+
+
+def test_apply_does_not_trust_same_sized_unrelated_file(tmp_path, monkeypatch):
+    source, dest, plan = setup_plan(tmp_path, monkeypatch)
+    (dest / "Owls").mkdir(parents=True)
+    unrelated = dest / "Owls" / "x.jpg"
+    unrelated.write_bytes(b"PHOTO")
+    os.utime(unrelated, ns=(0, 0))
+
+    sorter.apply_placement_plan(str(plan))
+
+    assert (dest / "Owls" / "x.jpg").read_bytes() == b"PHOTO"
+    assert (dest / "Owls" / "x_1.jpg").read_bytes() == b"photo"
@@ -0,0 +1,69 @@
+"""Crash-resume behaviour of animal_photo_sorter's progress journal."""
+import json
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+import animal_photo_sorter as sorter  # noqa: E402
+
+
+class FakeClassifier:
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def classify_image(self, image_path):
+        return "unknown", 0.0
+
+
+class FakeCache:
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def save(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def test_resume_keeps_in_flight_destination_reserved(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    source = tmp_path / "media"
+    dest = tmp_path / "sorted"
+    (source / "a").mkdir(parents=True)
+    (source / "b").mkdir(parents=True)
+    (source / "a" / "x.jpg").write_bytes(b"a-bytes")
+    (source / "b" / "x.jpg").write_bytes(b"b-bytes")
+    journal_path = dest / ".sort_journal.jsonl"
+
+    monkeypatch.setattr(sorter, "SOURCE_FOLDER", str(source))
+    monkeypatch.setattr(sorter, "DESTINATION_FOLDER", str(dest))
+    monkeypatch.setattr(sorter, "CHECKPOINT_FILE", str(journal_path))
+    monkeypatch.setattr(sorter, "EMBEDDING_CACHE_FILE", str(dest / ".clip_embeddings.npz"))
+    monkeypatch.setattr(sorter, "MOVE_FILES", True)
+    monkeypatch.setattr(sorter, "require_ml_packages", lambda: None)
+    monkeypatch.setattr(sorter, "AnimalClassifier", FakeClassifier)
+    monkeypatch.setattr(sorter, "EmbeddingCache", FakeCache)
+    monkeypatch.setattr(sorter, "ThumbnailStore", FakeCache)
+
+    # a/x.jpg was classified and given Unknown/x.jpg, then the run died before placing it
+    config = {"source": str(source), "destination": str(dest), "move": True,
+              "threshold": sorter.CONFIDENCE_THRESHOLD}
+    journal_path.parent.mkdir(parents=True)
+    journal_path.write_text(
+        json.dumps({"op": "start", "config": config}) + "\n"
+        + json.dumps({"op": "classified", "source": str(source / "a" / "x.jpg"), "animal_type": "unknown",
+                      "confidence": 0.0, "low_confidence": True,
+                      "destination": str(dest / "Unknown" / "x.jpg")}) + "\n",
+        encoding="utf-8",
+    )
+
+    sorter.sort_animal_photos(resume=True)
+
+    placed = sorted((dest / "Unknown").glob("*.jpg"))
+    assert [p.name for p in placed] == ["x.jpg", "x_1.jpg"]
+    assert (dest / "Unknown" / "x.jpg").read_bytes() == b"a-bytes"
+    assert (dest / "Unknown" / "x_1.jpg").read_bytes() == b"b-bytes"
+    assert not journal_path.exists()
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Shared Thumbnail Cache
+======================
+
+One content-addressed store of downscaled images for the media tools, so each
+original is decoded once no matter how many tools look at it:
+
+- animal_photo_sorter.py feeds thumbnails to CLIP instead of full-size photos
+- project_photo_curator.py computes its selection features and builds contact
+  sheets/timelapses from them
+- tools/review_gallery_generator.py serves them to the browser instead of originals
+
+Thumbnails live in .cache/thumbnails/<sha1[:2]>/<sha1>-<size>.jpg, keyed by the
+SHA-1 of the source file (so renames and moves between folders keep them) and
+rendered in a process pool. Every use bumps a thumbnail's mtime; when the store
+grows past its size cap the least recently used ones are evicted on close().
+
+Usage:
+  from thumbnail_cache import ThumbnailStore
+  store = ThumbnailStore()
+  thumbs = store.paths(["public/media/projects/eagle/images/final/eagle_301.jpg"])
+  store.close()
+"""
+
+from __future__ import annotations
+import hashlib
+import json
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Union
+
+try:
+    from PIL import Image, ImageOps
+    # Errors that mean "this file is not a usable image", as opposed to I/O or pool trouble
+    UNDECODABLE_ERRORS = (Image.UnidentifiedImageError, Image.DecompressionBombError)
+    PIL_AVAILABLE = True
+except ImportError:
+    Image = ImageOps = None
+    UNDECODABLE_ERRORS = ()
+    PIL_AVAILABLE = False
+
+THUMBNAIL_ROOT = Path(".cache/thumbnails")
+# Longest side in px: enough for CLIP (224), curator features (256), gallery tiles and timelapse frames
+THUMBNAIL_SIZE = 640
+THUMBNAIL_QUALITY = 85
+# Evict least recently used thumbnails once the store is larger than this
+THUMBNAIL_MAX_BYTES = 512 * 1024 * 1024
+
+PathLike = Union[str, Path]
+
+
+def file_digest(path: PathLike) -> str:
+    """SHA-1 of a file's contents: the content key shared by all the media tools' caches."""
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def render_thumbnail(src: str, out: str, size: int, quality: int = THUMBNAIL_QUALITY) -> bool:
+    """
+    Write a JPEG of src fitting size x size (EXIF-rotated, never upscaled) to
+    out; False if src cannot be decoded. Read and write errors are raised.
+    Runs in a worker process.
+    """
+    try:
+        with Image.open(src) as im:
+            im.draft("RGB", (size, size))  # JPEG decodes at 1/2..1/8 scale
+            im = ImageOps.exif_transpose(im).convert("RGB")
+    except UNDECODABLE_ERRORS:
+        return False
+    im.thumbnail((size, size), Image.LANCZOS)
+    os.makedirs(os.path.dirname(out), exist_ok=True)
+    tmp = f"{out}.{os.getpid()}.tmp"
+    try:
+        im.save(tmp, format="JPEG", quality=quality)
+        os.replace(tmp, out)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    return True
+
+
+class ThumbnailStore:
+    """
+    Content-addressed thumbnails with a size-capped LRU.
+
+    Source digests are cached in <root>/index.json by path, size and mtime,
+    so an unchanged source costs one stat; callers that already know a
+    source's SHA-1 can pass it and skip even that. Content that could not be
+    decoded is remembered there too and not retried; other failures (a full
+    disk, a dead worker) only fail the current call.
+
+    io_call, if given, is called as io_call(kind, count) for every stat, read,
+    write and rename, including those of the render workers, so a caller can
+    account for the store's I/O.
+    """
+
+    VERSION = 1
+
+    def __init__(self, root: Path = THUMBNAIL_ROOT, size: int = THUMBNAIL_SIZE,
+                 max_bytes: int = THUMBNAIL_MAX_BYTES, workers: Optional[int] = None,
+                 io_call: Optional[Callable[[str, int], None]] = None):
+        self.root = root
+        self._io = io_call or (lambda kind, count: None)
+        self.size = size
+        self.max_bytes = max_bytes
+        self.available = PIL_AVAILABLE
+        self._workers = workers
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pending: Dict[Path, Future] = {}
+        self._used: set = set()
+        self._lock = threading.Lock()
+        self._index_path = root / "index.json"
+        self._digests: Dict[str, List] = {}
+        self._undecodable: set = set()
+        self._dirty = False
+        if self._index_path.exists():
+            try:
+                with open(self._index_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("version") == self.VERSION:
+                    self._digests = data.get("files") or {}
+                    self._undecodable = set(data.get("undecodable") or [])
+            except Exception:
+                self._digests = {}
+
+    def digest(self, source: PathLike) -> Optional[str]:
+        """SHA-1 of source's contents (cached by path, size and mtime); None if unreadable."""
+        key = str(source)
+        self._io("stat", 1)
+        try:
+            st = os.stat(source)
+        except OSError:
+            return None
+        with self._lock:
+            cached = self._digests.get(key)
+        if cached and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+            return cached[2]
+        self._io("read", 1)
+        try:
+            digest = file_digest(source)
+        except OSError:
+            return None
+        with self._lock:
+            self._digests[key] = [st.st_size, st.st_mtime_ns, digest]
+            self._dirty = True
+        return digest
+
+    def location(self, digest: str) -> Path:
+        return self.root / digest[:2] / f"{digest}-{self.size}.jpg"
+
+    def paths(self, sources: Sequence[PathLike], digests: Optional[Sequence[Optional[str]]] = None) -> List[Optional[Path]]:
+        """
+        Thumbnail of each source, rendering missing ones in parallel; None for
+        sources that cannot be read or decoded (and without Pillow).
+        """
+        if not self.available:
+            return [None] * len(sources)
+        if digests is None:
+            digests = [self.digest(src) for src in sources]
+        thumbs = [self.location(d) if d else None for d in digests]
+
+        waits: Dict[Path, Future] = {}
+        with self._lock:
+            for i, (src, thumb) in enumerate(zip(sources, thumbs)):
+                if thumb is not None and thumb.name in self._undecodable:
+                    thumbs[i] = None
+                    continue
+                if thumb is None or thumb in waits:
+                    continue
+                self._used.add(thumb)
+                self._io("stat", 1)
+                if thumb.exists():
+                    continue
+                # Another thread may already be rendering the same content
+                if thumb not in self._pending:
+                    if self._pool is None:
+                        self._pool = ProcessPoolExecutor(max_workers=self._workers,
+                                                         mp_context=multiprocessing.get_context("spawn"))
+                    self._pending[thumb] = self._pool.submit(render_thumbnail, str(src), str(thumb), self.size)
+                waits[thumb] = self._pending[thumb]
+        failed = set()
+        for thumb, future in waits.items():
+            try:
+                decodable = future.result()
+            except Exception:
+                decodable = None
+            with self._lock:
+                self._pending.pop(thumb, None)
+                # The worker read the source and, unless it was undecodable, wrote and renamed the thumbnail
+                if decodable is not None:
+                    self._io("read", 1)
+                if decodable:
+                    self._io("write", 1)
+                    self._io("rename", 1)
+                    continue
+                failed.add(thumb)
+                if decodable is False:
+                    self._undecodable.add(thumb.name)
+                    self._dirty = True
+                elif isinstance(future.exception(), BrokenProcessPool) and self._pool is not None:
+                    # Later calls start a fresh pool instead of failing on submit
+                    self._pool.shutdown(wait=False)
+                    self._pool = None
+
+        out: List[Optional[Path]] = []
+        for thumb in thumbs:
+            if thumb is None or thumb in failed:
+                out.append(None)
+                continue
+            if thumb not in waits:
+                self._io("utime", 1)
+                try:
+                    os.utime(thumb)  # LRU clock
+                except OSError:
+                    out.append(None)
+                    continue
+            out.append(thumb)
+        return out
+
+    def path(self, source: PathLike, digest: Optional[str] = None) -> Optional[Path]:
+        return self.paths([source], None if digest is None else [digest])[0]
+
+    def open(self, source: PathLike) -> Optional["Image.Image"]:
+        """The thumbnail of source as a loaded RGB image, or None."""
+        thumb = self.path(source)
+        if thumb is None:
+            return None
+        self._io("read", 1)
+        try:
+            with Image.open(thumb) as im:
+                return im.convert("RGB")
+        except Exception:
+            return None
+
+    def evict(self) -> int:
+        """Delete least recently used thumbnails (never ones used by this process) down to max_bytes; returns the count."""
+        files = []
+        total = 0
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                if not name.endswith(".jpg"):
+                    continue
+                path = Path(dirpath) / name
+                try:
+                    st = path.stat()
+                except OSError:
+                    continue
+                files.append((st.st_mtime_ns, st.st_size, path))
+                total += st.st_size
+        removed = 0
+        if total <= self.max_bytes:
+            return removed
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            if path in self._used:
+                continue
+            try:
+                path.unlink()
+                total -= size
+                removed += 1
+            except OSError:
+                pass
+        return removed
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        try:
+            with self._lock:
+                data = {"version": self.VERSION, "files": dict(self._digests),
+                        "undecodable": sorted(self._undecodable)}
+            self.root.mkdir(parents=True, exist_ok=True)
+            tmp = self._index_path.with_name(f".{self._index_path.name}.{os.getpid()}.tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp, self._index_path)
+            self._dirty = False
+        except Exception:
+            pass
+
+    def close(self) -> None:
+        """Save the index, evict over the cap and stop the render pool."""
+        self.save()
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        if self.root.exists():
+            self.evict()
@@ -1,26 +1,223 @@
 #!/usr/bin/env python3
+"""
+Publish curated_output/Woodcarvings to public/portfolio incrementally, rsync-style.
+
+A file is republished only if its size or mtime differs from the published copy
+(or, with --checksum, its contents). The new tree is staged next to the old one:
+unchanged files are hard-linked across (same inode and mtime, so caches keep
+them), changed ones copied in parallel, stale ones left out. The staged tree and
+the published one are then exchanged in a single renameat2(RENAME_EXCHANGE), so
+public/portfolio always exists and is always complete. Where that call is not
+available (not Linux, or a filesystem without it) the old tree is renamed aside
+first; a run interrupted in between is repaired by the next one. What changed is
+written to --changes as site paths for CDN purging; when nothing changed the
+published tree is not touched at all.
+"""
+import argparse
+import errno
+import json
+import os
 import shutil
+import sqlite3
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+from thumbnail_cache import file_digest  # noqa: E402
+
 SRC = ROOT / "curated_output" / "Woodcarvings"
 DEST = ROOT / "public" / "portfolio"
+MANIFEST = ROOT / "curated_output" / "manifest.sqlite"
+CHANGES = ROOT / "curated_output" / "publish_changes.json"
+# Site path of DEST, for the changed-files list
+URL_PREFIX = "/portfolio/"
+
+def manifest_files():
+    """Every curated output file (relative to SRC) from the curator's manifest, or None without one."""
+    if not MANIFEST.exists():
+        return None
+    try:
+        db = sqlite3.connect(f"file:{MANIFEST}?mode=ro", uri=True)
+        try:
+            return [path for (path,) in db.execute("SELECT path FROM files ORDER BY path")]
+        finally:
+            db.close()
+    except sqlite3.Error as e:
+        print(f"Could not read {MANIFEST} ({e}); walking folders instead")
+        return None
+
+def folder_files():
+    """Fallback without a manifest: every file inside SRC's project folders."""
+    files = []
+    for proj_dir in sorted(SRC.iterdir()):
+        if not proj_dir.is_dir():
+            continue
+        for path in sorted(proj_dir.rglob("*")):
+            if path.is_file():
+                files.append(path.relative_to(SRC).as_posix())
+    return files
+
+def published_files():
+    """Every file currently under DEST, relative to it."""
+    if not DEST.is_dir():
+        return set()
+    return {path.relative_to(DEST).as_posix() for path in DEST.rglob("*") if path.is_file()}
+
+def unchanged(rel: str, checksum: bool) -> bool:
+    try:
+        src = (SRC / rel).stat()
+        dst = (DEST / rel).stat()
+    except OSError:
+        return False
+    if src.st_size != dst.st_size:
+        return False
+    if checksum:
+        return file_digest(SRC / rel) == file_digest(DEST / rel)
+    return src.st_mtime_ns == dst.st_mtime_ns
+
+def plan(files, checksum: bool, jobs: int):
+    """
+    Split the source files into (kept, added, updated) and list published files to delete.
+    
+    Listed files missing from SRC are skipped with a warning; a published copy
+    of one is kept as it is.
+    """
+    published = published_files()
+    missing = [rel for rel in files if not (SRC / rel).is_file()]
+    if missing:
+        print(f"Warning: {len(missing)} listed files are missing from {SRC}; skipping them: "
+              + ", ".join(missing[:5]) + (" ..." if len(missing) > 5 else ""))
+        absent = set(missing)
+        files = [rel for rel in files if rel not in absent]
+    existing = [rel for rel in files if rel in published]
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        same = list(pool.map(lambda rel: unchanged(rel, checksum), existing))
+    kept = [rel for rel, ok in zip(existing, same) if ok] + [rel for rel in missing if rel in published]
+    updated = [rel for rel, ok in zip(existing, same) if not ok]
+    added = [rel for rel in files if rel not in published]
+    deleted = sorted(published - set(files) - set(missing))
+    return kept, added, updated, deleted
+
+def place(src: Path, target: Path, link: bool) -> None:
+    target.parent.mkdir(parents=True, exist_ok=True)
+    if link:
+        try:
+            os.link(src, target)
+            return
+        except OSError:
+            pass
+    shutil.copy2(src, target)
+
+def exchange(a: Path, b: Path) -> bool:
+    """Atomically swap two paths with renameat2(RENAME_EXCHANGE); False where that is unsupported."""
+    if not sys.platform.startswith("linux"):
+        return False
+    import ctypes
+    import ctypes.util
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        renameat2 = libc.renameat2  # glibc 2.28+
+    except (OSError, AttributeError):
+        return False
+    renameat2.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_int, ctypes.c_char_p, ctypes.c_uint]
+    at_fdcwd, rename_exchange = -100, 2
+    if renameat2(at_fdcwd, os.fsencode(a), at_fdcwd, os.fsencode(b), rename_exchange) == 0:
+        return True
+    err = ctypes.get_errno()
+    if err in (errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP):
+        return False
+    raise OSError(err, os.strerror(err), str(b))
+
+def old_trees():
+    return sorted(DEST.parent.glob(f".{DEST.name}.old.*"))
+
+def recover() -> None:
+    """Finish a swap interrupted between its two renames and clear leftovers of earlier runs."""
+    for old in old_trees():
+        if not DEST.exists():
+            print(f"Restoring {DEST} from {old.name} (an earlier publish was interrupted)")
+            os.rename(old, DEST)
+        else:
+            shutil.rmtree(old, ignore_errors=True)
+    for staging in DEST.parent.glob(f".{DEST.name}.staging.*"):
+        shutil.rmtree(staging, ignore_errors=True)
+
+def swap(staging: Path) -> None:
+    """Put the staged tree in DEST's place and remove the old one."""
+    if not DEST.exists():
+        os.rename(staging, DEST)
+        return
+    if exchange(staging, DEST):
+        # staging now holds the previous tree
+        shutil.rmtree(staging, ignore_errors=True)
+        return
+    # Two renames: DEST is briefly missing; recover() repairs a crash in between
+    old = DEST.with_name(f".{DEST.name}.old.{os.getpid()}")
+    os.rename(DEST, old)
+    try:
+        os.rename(staging, DEST)
+    except OSError:
+        os.rename(old, DEST)
+        raise
+    shutil.rmtree(old, ignore_errors=True)
+
+def publish(files, checksum: bool, jobs: int, dry_run: bool):
+    kept, added, updated, deleted = plan(files, checksum, jobs)
+    changes = {
+        "added": [URL_PREFIX + rel for rel in added],
+        "updated": [URL_PREFIX + rel for rel in updated],
+        "deleted": [URL_PREFIX + rel for rel in deleted],
+    }
+    if dry_run or not (added or updated or deleted):
+        return kept, changes
+
+    staging = DEST.with_name(f".{DEST.name}.staging.{os.getpid()}")
+    shutil.rmtree(staging, ignore_errors=True)
+    staging.mkdir(parents=True)
+    try:
+        # Unchanged files keep their published inode; everything else is a fresh copy
+        work = [(DEST / rel, staging / rel, True) for rel in kept]
+        work += [(SRC / rel, staging / rel, False) for rel in added + updated]
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            list(pool.map(lambda job: place(*job), work))
+        swap(staging)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    return kept, changes
 
 def main():
+    parser = argparse.ArgumentParser(description="Publish the curated set to public/portfolio, copying only what changed")
+    parser.add_argument("--checksum", action="store_true",
+                        help="Compare same-sized files by SHA-1 instead of mtime")
+    parser.add_argument("--jobs", type=int, default=min(32, (os.cpu_count() or 1) * 4),
+                        help="Parallel comparisons and copies")
+    parser.add_argument("--changes", type=Path, default=CHANGES,
+                        help="Where to write the added/updated/deleted site paths (JSON) for CDN purging")
+    parser.add_argument("--dry-run", action="store_true", help="Only report what would change")
+    args = parser.parse_args()
+
     if not SRC.exists():
         raise SystemExit(f"Source not found: {SRC}")
-    # Clean destination
-    if DEST.exists():
-        shutil.rmtree(DEST)
-    DEST.mkdir(parents=True, exist_ok=True)
+    if not args.dry_run:
+        recover()
+    files = manifest_files()
+    if files is None:
+        files = folder_files()
 
-    # Copy tree preserving structure
-    for proj_dir in SRC.iterdir():
-        if not proj_dir.is_dir():
-            continue
-        target = DEST / proj_dir.name
-        shutil.copytree(proj_dir, target)
-    print(f"Published curated set from {SRC} -> {DEST}")
+    kept, changes = publish(files, args.checksum, max(1, args.jobs), args.dry_run)
+    counts = {kind: len(paths) for kind, paths in changes.items()}
+    verb = "Would publish" if args.dry_run else "Published"
+    print(f"{verb} {SRC} -> {DEST}: {counts['added']} added, {counts['updated']} updated, "
+          f"{counts['deleted']} deleted, {len(kept)} unchanged")
+    if not args.dry_run:
+        args.changes.parent.mkdir(parents=True, exist_ok=True)
+        tmp = args.changes.with_name(f".{args.changes.name}.tmp")
+        tmp.write_text(json.dumps(changes, indent=2), encoding="utf-8")
+        os.replace(tmp, args.changes)
+        print(f"Changed files listed in {args.changes}")
 
 if __name__ == "__main__":
     main()
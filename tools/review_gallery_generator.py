@@ -1,40 +1,119 @@
 #!/usr/bin/env python3
+import hashlib
 import json
+import os
+import re
+import shutil
+import sqlite3
+import sys
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+from thumbnail_cache import ThumbnailStore, THUMBNAIL_ROOT  # noqa: E402
+
 CURATED = ROOT / "curated_output" / "Woodcarvings"
+BEST_OF_SCORES = CURATED / "_Portfolio_BestOf" / "_scores.json"
+MANIFEST = ROOT / "curated_output" / "manifest.sqlite"
 PUBLIC_REVIEW = ROOT / "public" / "curation-review"
 OUT_HTML = PUBLIC_REVIEW / "index.html"
+THUMBS = PUBLIC_REVIEW / "thumbs"
+# Per-project pages fetched by the browser as it scrolls, plus what the last run wrote
+DATA = PUBLIC_REVIEW / "data"
+DATA_INDEX = DATA / "index.json"
+STATE = DATA / "_state.json"
+STATE_VERSION = 1
+PAGE_SIZE = 48
+
+def public_url(source: str):
+    source = source.replace("\\", "/")
+    if not source.startswith("public/"):
+        # Not web-served, skip
+        return None
+    return "/" + source[len("public/"):]
+
+def load_from_manifest():
+    """Every curated folder and pick in one query against the curator's manifest."""
+    db = sqlite3.connect(f"file:{MANIFEST}?mode=ro", uri=True)
+    try:
+        rows = db.execute(
+            "SELECT f.name, f.kind, i.label, i.origin, i.source, i.score"
+            " FROM folders f JOIN items i ON i.folder = f.name"
+            " ORDER BY f.kind != 'bestof', f.name, i.seq"
+        ).fetchall()
+    finally:
+        db.close()
+    projects = {}
+    for folder, kind, label, origin, source, score in rows:
+        url = public_url(source)
+        if not url:
+            continue
+        if kind == "bestof":
+            folder, label = "Portfolio Best-of", f"{origin} {label}"
+        projects.setdefault(folder, []).append({"label": label, "url": url, "score": score})
+    return [{"name": name, "items": items} for name, items in projects.items()]
 
-PROJECTS = []
-
-for proj_dir in sorted(CURATED.iterdir() if CURATED.exists() else []):
-    if not proj_dir.is_dir():
-        continue
-    if proj_dir.name.startswith("_"):
-        # skip Best Of
-        continue
-    mapping_file = proj_dir / "_mapping.json"
-    if not mapping_file.exists():
-        continue
+def load_from_folders():
+    """Fallback for output without a manifest: walk curated_output and read each _mapping.json."""
+    projects = []
+    # Best-of ranking scores written by the curator (if any), keyed by source path
+    scores = {}
+    best_of = []
     try:
-        data = json.loads(mapping_file.read_text(encoding="utf-8"))
+        scored = json.loads(BEST_OF_SCORES.read_text(encoding="utf-8"))
+        scores = {k.replace("\\", "/"): v for k, v in scored.get("scores", {}).items()}
+        for row in scored.get("picks", []):
+            url = public_url(row.get("source", ""))
+            if url:
+                best_of.append({"label": f"{row.get('project')} {row.get('label')}", "url": url, "score": row.get("score")})
     except Exception:
-        continue
-    items = []
-    for row in data:
-        label = row.get("label")
-        source = row.get("source", "").replace("\\", "/")
-        if not source.startswith("public/"):
-            # Not web-served, skip
+        pass
+    if best_of:
+        projects.append({"name": "Portfolio Best-of", "items": best_of})
+
+    for proj_dir in sorted(CURATED.iterdir() if CURATED.exists() else []):
+        if not proj_dir.is_dir():
+            continue
+        if proj_dir.name.startswith("_"):
+            # skip Best Of
+            continue
+        mapping_file = proj_dir / "_mapping.json"
+        if not mapping_file.exists():
             continue
-        url = "/" + source[len("public/"):]
-        items.append({"label": label, "url": url})
-    if items:
-        PROJECTS.append({"name": proj_dir.name, "items": items})
+        try:
+            data = json.loads(mapping_file.read_text(encoding="utf-8"))
+        except Exception:
+            continue
+        items = []
+        for row in data:
+            label = row.get("label")
+            source = row.get("source", "").replace("\\", "/")
+            url = public_url(source)
+            if not url:
+                continue
+            items.append({"label": label, "url": url, "score": scores.get(source)})
+        if items:
+            projects.append({"name": proj_dir.name, "items": items})
+    return projects
 
-PUBLIC_REVIEW.mkdir(parents=True, exist_ok=True)
+def attach_thumbnails(items, store):
+    """Give each item a small copy from the shared thumbnail store, linked into the review folder; returns the names used."""
+    thumbs = store.paths([ROOT / "public" / item["url"].lstrip("/") for item in items])
+    THUMBS.mkdir(parents=True, exist_ok=True)
+    linked = set()
+    for item, thumb in zip(items, thumbs):
+        if thumb is None:
+            continue
+        target = THUMBS / thumb.name
+        if target.name not in linked and not target.exists():
+            # Content-addressed: an existing file of that name is already the right thumbnail
+            try:
+                os.link(thumb, target)
+            except OSError:
+                shutil.copy2(thumb, target)
+        linked.add(target.name)
+        item["thumb"] = "/curation-review/thumbs/" + thumb.name
+    return linked
 
 def html_escape(s: str) -> str:
     return (
@@ -45,9 +124,106 @@ def html_escape(s: str) -> str:
         .replace("'", "&#39;")
     )
 
-data_json = json.dumps(PROJECTS)
+def slugify(name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_-]+", "-", name).strip("-") or "project"
+
+def project_key(proj) -> str:
+    """Hash of a project's picks and each source's size/mtime: changes whenever its pages or thumbnails would."""
+    digest = hashlib.sha1(str(PAGE_SIZE).encode("ascii"))
+    for item in proj["items"]:
+        try:
+            st = (ROOT / "public" / item["url"].lstrip("/")).stat()
+            stamp = [st.st_size, st.st_mtime_ns]
+        except OSError:
+            stamp = None
+        digest.update(json.dumps([item["label"], item["url"], item["score"], stamp]).encode("utf-8"))
+    return digest.hexdigest()[:12]
+
+def load_state():
+    """What the previous run wrote, by project name."""
+    try:
+        data = json.loads(STATE.read_text(encoding="utf-8"))
+        if data.get("version") == STATE_VERSION:
+            return {entry["name"]: entry for entry in data["projects"]}
+    except Exception:
+        pass
+    return {}
+
+def write_json(path: Path, data) -> None:
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(data, separators=(",", ":")), encoding="utf-8")
+    os.replace(tmp, path)
+
+def up_to_date(entry, key) -> bool:
+    return (entry is not None and entry.get("key") == key
+            and all((DATA / page).exists() for page in entry["pages"])
+            and all((THUMBS / name).exists() for name in entry["thumbs"]))
+
+def write_pages(proj, key, store):
+    """Split a project into PAGE_SIZE-item JSON pages; the key in the file names keeps browsers from serving stale ones."""
+    items = proj["items"]
+    thumbs = attach_thumbnails(items, store)
+    slug = slugify(proj["name"])
+    pages = []
+    for start in range(0, len(items), PAGE_SIZE):
+        page = f"{slug}-{key}-{len(pages) + 1}.json"
+        write_json(DATA / page, items[start:start + PAGE_SIZE])
+        pages.append(page)
+    return {"name": proj["name"], "key": key, "count": len(items), "pages": pages, "thumbs": sorted(thumbs)}
+
+def prune(entries) -> None:
+    """Delete pages and thumbnails no current project refers to."""
+    pages = {page for entry in entries for page in entry["pages"]}
+    thumbs = {name for entry in entries for name in entry["thumbs"]}
+    for stale in DATA.glob("*.json"):
+        if stale not in (DATA_INDEX, STATE) and stale.name not in pages:
+            stale.unlink()
+    for stale in THUMBS.glob("*.jpg"):
+        if stale.name not in thumbs:
+            stale.unlink()
+
+def main():
+    if MANIFEST.exists():
+        try:
+            projects = load_from_manifest()
+        except sqlite3.Error as e:
+            print(f"Could not read {MANIFEST} ({e}); walking {CURATED} instead")
+            projects = load_from_folders()
+    else:
+        projects = load_from_folders()
+
+    DATA.mkdir(parents=True, exist_ok=True)
+    THUMBS.mkdir(parents=True, exist_ok=True)
+    previous = load_state()
+    entries = []
+    rebuilt = 0
+    store = None
+    for proj in projects:
+        key = project_key(proj)
+        entry = previous.get(proj["name"])
+        if not up_to_date(entry, key):
+            # Only projects whose picks changed touch the thumbnail store or rewrite pages
+            if store is None:
+                store = ThumbnailStore(root=ROOT / THUMBNAIL_ROOT)
+            entry = write_pages(proj, key, store)
+            rebuilt += 1
+        entries.append(entry)
+    if store is not None:
+        store.close()
 
-html = f"""<!doctype html>
+    write_json(DATA_INDEX, {
+        "pageSize": PAGE_SIZE,
+        "projects": [{"name": e["name"], "count": e["count"], "pages": e["pages"]} for e in entries],
+    })
+    write_json(STATE, {"version": STATE_VERSION, "projects": entries})
+    prune(entries)
+    html = render_html()
+    if not OUT_HTML.exists() or OUT_HTML.read_text(encoding="utf-8") != html:
+        OUT_HTML.write_text(html, encoding="utf-8")
+    print(f"Wrote review gallery to {OUT_HTML} ({rebuilt} of {len(entries)} projects rebuilt)")
+
+def render_html() -> str:
+    return f"""<!doctype html>
 <html lang=\"en\">
 <head>
   <meta charset=\"utf-8\" />
@@ -63,8 +239,10 @@ html = f"""<!doctype html>
     img {{ width: 100%; height: 180px; object-fit: cover; border-radius: 4px; background: #eee; }}
     .controls {{ position: sticky; top: 0; background: #fff; padding: 8px 0; border-bottom: 1px solid #eee; margin-bottom: 16px; }}
     .badge {{ display: inline-block; background: #eef; border: 1px solid #99c; padding: 2px 6px; border-radius: 999px; font-size: 12px; margin-left: 8px; }}
+    .count {{ font-weight: normal; font-size: 14px; color: #666; }}
     .wrong {{ outline: 3px solid #e55; }}
     .btn {{ display: inline-block; padding: 8px 12px; border: 1px solid #999; border-radius: 6px; background: #f7f7f7; cursor: pointer; margin-right: 8px; }}
+    #more {{ padding: 24px 0; color: #666; text-align: center; }}
   </style>
 </head>
 <body>
@@ -74,95 +252,141 @@ html = f"""<!doctype html>
     <button class=\"btn\" id=\"reset\">Reset checks</button>
   </div>
   <div id=\"app\"></div>
+  <div id=\"more\">Loading…</div>
   <script>
-    const DATA = {data_json};
     const app = document.getElementById('app');
     const summary = document.getElementById('summary');
+    const more = document.getElementById('more');
+    // Marks live here rather than in the checkboxes: most pages are not loaded yet
+    const wrong = new Map();
+    let projects = [];
+    let proj = -1, page = 0, grid = null, loading = false;
+
+    function updateSummary() {{
+      summary.textContent = wrong.size + ' marked wrong';
+    }}
+
+    function figure(name, item) {{
+      const id = name + '::' + item.label;
+      const fig = document.createElement('figure');
+      const img = document.createElement('img');
+      img.loading = 'lazy';
+      img.src = item.thumb || item.url;
+      img.alt = item.label + ' - ' + item.url;
+      const full = document.createElement('a');
+      full.href = item.url;
+      full.target = '_blank';
+      full.appendChild(img);
+
+      const cap = document.createElement('figcaption');
+      const cb = document.createElement('input');
+      cb.type = 'checkbox';
+      cb.id = id;
+      cb.checked = wrong.has(id);
+      fig.classList.toggle('wrong', cb.checked);
+      cb.addEventListener('change', () => {{
+        if (cb.checked) wrong.set(id, {{ project: name, label: item.label, url: item.url }});
+        else wrong.delete(id);
+        fig.classList.toggle('wrong', cb.checked);
+        updateSummary();
+      }});
+      const lab = document.createElement('label');
+      lab.htmlFor = cb.id;
+      lab.textContent = item.label;
+      if (item.score !== null && item.score !== undefined) lab.textContent += ' (score ' + item.score.toFixed(2) + ')';
+
+      cap.appendChild(cb);
+      cap.appendChild(document.createTextNode(' '));
+      cap.appendChild(lab);
+      cap.appendChild(document.createElement('br'));
+      const small = document.createElement('small');
+      small.textContent = item.url;
+      cap.appendChild(small);
 
-    function render() {{
-      app.innerHTML = '';
-      let wrongCount = 0;
-      for (const proj of DATA) {{
-        const section = document.createElement('section');
-        section.className = 'project';
-        const h2 = document.createElement('h2');
-        h2.textContent = proj.name;
-        section.appendChild(h2);
-        const grid = document.createElement('div');
-        grid.className = 'grid';
-        for (const item of proj.items) {{
-          const fig = document.createElement('figure');
-          const img = document.createElement('img');
-          img.loading = 'lazy';
-          img.src = item.url;
-          img.alt = item.label + ' - ' + item.url;
-
-          const cap = document.createElement('figcaption');
-          const cb = document.createElement('input');
-          cb.type = 'checkbox';
-          cb.id = proj.name + '::' + item.label;
-          cb.addEventListener('change', () => {{
-            if (cb.checked) {{ fig.classList.add('wrong'); wrongCount++; }}
-            else {{ fig.classList.remove('wrong'); wrongCount = Math.max(0, wrongCount - 1); }}
-            summary.textContent = wrongCount + ' marked wrong';
-          }});
-          const lab = document.createElement('label');
-          lab.htmlFor = cb.id;
-          lab.textContent = item.label;
-
-          cap.appendChild(cb);
-          cap.appendChild(document.createTextNode(' '));
-          cap.appendChild(lab);
-          cap.appendChild(document.createElement('br'));
-          const small = document.createElement('small');
-          small.textContent = item.url;
-          cap.appendChild(small);
-
-          fig.appendChild(img);
-          fig.appendChild(cap);
-          grid.appendChild(fig);
+      fig.appendChild(full);
+      fig.appendChild(cap);
+      return fig;
+    }}
+
+    function startProject() {{
+      const p = projects[proj];
+      const section = document.createElement('section');
+      section.className = 'project';
+      const h2 = document.createElement('h2');
+      h2.textContent = p.name + ' ';
+      const count = document.createElement('span');
+      count.className = 'count';
+      count.textContent = '(' + p.count + ')';
+      h2.appendChild(count);
+      section.appendChild(h2);
+      grid = document.createElement('div');
+      grid.className = 'grid';
+      section.appendChild(grid);
+      app.appendChild(section);
+    }}
+
+    // Fetch the next page (of the current project, or the first of the next one)
+    function loadMore() {{
+      if (loading) return;
+      if (proj < 0 || page >= projects[proj].pages.length) {{
+        if (proj + 1 >= projects.length) {{
+          observer.disconnect();
+          more.textContent = projects.length ? '' : 'Nothing to review.';
+          return;
         }}
-        section.appendChild(grid);
-        app.appendChild(section);
+        proj++;
+        page = 0;
+        startProject();
       }}
-      summary.textContent = wrongCount + ' marked wrong';
+      const p = projects[proj];
+      loading = true;
+      fetch('data/' + encodeURIComponent(p.pages[page])).then(r => {{
+        if (!r.ok) throw new Error(r.status);
+        return r.json();
+      }}).then(items => {{
+        for (const item of items) grid.appendChild(figure(p.name, item));
+        page++;
+        loading = false;
+        // Observing again reports the sentinel at once if it is still on screen
+        observer.unobserve(more);
+        observer.observe(more);
+      }}).catch(() => {{
+        loading = false;
+        more.textContent = 'Could not load ' + p.pages[page] + '; scroll to retry.';
+      }});
     }}
 
-    render();
+    const observer = new IntersectionObserver(entries => {{
+      if (entries.some(e => e.isIntersecting)) loadMore();
+    }}, {{ rootMargin: '800px 0px' }});
+
+    fetch('data/index.json', {{ cache: 'no-cache' }}).then(r => r.json()).then(index => {{
+      projects = index.projects;
+      updateSummary();
+      observer.observe(more);
+    }}).catch(() => {{
+      more.textContent = 'Could not load data/index.json.';
+    }});
 
     document.getElementById('copy').addEventListener('click', () => {{
-      const wrong = [];
-      for (const proj of DATA) {{
-        for (const item of proj.items) {{
-          const id = proj.name + '::' + item.label;
-          const cb = document.getElementById(id);
-          if (cb && cb.checked) {{
-            wrong.push({{ project: proj.name, label: item.label, url: item.url }});
-          }}
-        }}
-      }}
-      const text = JSON.stringify(wrong, null, 2);
+      const text = JSON.stringify(Array.from(wrong.values()), null, 2);
       navigator.clipboard.writeText(text).then(() => {{
-        alert('Copied ' + wrong.length + ' entries to clipboard.');
+        alert('Copied ' + wrong.size + ' entries to clipboard.');
       }}).catch(() => {{
         prompt('Copy the JSON below:', text);
       }});
     }});
 
     document.getElementById('reset').addEventListener('click', () => {{
-      for (const proj of DATA) {{
-        for (const item of proj.items) {{
-          const id = proj.name + '::' + item.label;
-          const cb = document.getElementById(id);
-          if (cb) cb.checked = false;
-        }}
-      }}
-      render();
+      wrong.clear();
+      for (const cb of app.querySelectorAll('input[type=checkbox]')) cb.checked = false;
+      for (const fig of app.querySelectorAll('figure.wrong')) fig.classList.remove('wrong');
+      updateSummary();
     }});
   </script>
 </body>
 </html>
 """
 
-OUT_HTML.write_text(html, encoding="utf-8")
-print(f"Wrote review gallery to {OUT_HTML}")
+if __name__ == "__main__":
+    main()